@@ -1,19 +1,50 @@
 import { NextRequest, NextResponse } from "next/server";
 
-// This endpoint triggers the scraper (calls Python backend or runs inline)
-// For MVP, this is a placeholder that will connect to the Python scraper
+// This endpoint triggers the scraper via the Python job runner
+// (lib/scrapers/job_runner.py) when SCRAPER_API_URL is configured,
+// and falls back to manual instructions otherwise
+
+const SCRAPER_API_URL = process.env.SCRAPER_API_URL;
+
+// Older clients send type "sec"; the job runner names sources explicitly
+// (a Map, so names like "constructor" or "__proto__" don't resolve to Object.prototype)
+const SOURCE_ALIASES = new Map<string, string>([
+  ["sec", "sec_adv"],
+  ["sec_adv", "sec_adv"],
+  ["sec_13f", "sec_13f"],
+]);
+
+async function callJobRunner(path: string, init?: RequestInit) {
+  const response = await fetch(`${SCRAPER_API_URL}${path}`, {
+    ...init,
+    headers: { "Content-Type": "application/json", ...init?.headers },
+    cache: "no-store",
+  });
+  const body = await response.json();
+  return NextResponse.json(body, { status: response.status });
+}
 
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json();
-    const { type = "sec", limit = 100 } = body;
+    const { type = "sec", source, limit = 100, priority = 0 } = body;
 
-    // In production, this would:
-    // 1. Trigger a background job (e.g., via Vercel Cron or external service)
-    // 2. Call a Python microservice running the SEC scraper
-    // 3. Queue the scraping job and return a job ID
+    if (SCRAPER_API_URL) {
+      const resolvedSource = SOURCE_ALIASES.get(source ?? type);
+      if (!resolvedSource) {
+        return NextResponse.json(
+          { error: `Unknown source: ${source ?? type}` },
+          { status: 400 }
+        );
+      }
 
-    // For now, return a placeholder response
+      return await callJobRunner("/jobs", {
+        method: "POST",
+        body: JSON.stringify({ source: resolvedSource, limit, priority }),
+      });
+    }
+
+    // No job runner configured: return a placeholder response
     return NextResponse.json({
       success: true,
       message: `Scraping job queued for ${type} with limit ${limit}`,
@@ -23,11 +54,11 @@ export async function POST(request: NextRequest) {
       instructions: {
         note: "The scraper runs as a separate Python service",
         setup: [
-          "1. Set up a Railway or Render deployment for the Python scraper",
-          "2. Configure SCRAPER_API_URL environment variable",
-          "3. The scraper will POST results to /api/investors/bulk",
+          "1. Run the job runner: python lib/scrapers/job_runner.py --port 8765",
+          "2. Configure SCRAPER_API_URL environment variable (e.g. http://127.0.0.1:8765)",
+          "3. Poll GET /api/scrape?job_id=<id> for progress",
         ],
-        manual: "Run: python scripts/sec_scraper.py --limit 100",
+        manual: "Run: python lib/scrapers/sec_scraper.py --limit 100",
       },
     });
   } catch (error) {
@@ -39,7 +70,31 @@ export async function POST(request: NextRequest) {
   }
 }
 
-export async function GET() {
+export async function GET(request: NextRequest) {
+  const jobId = request.nextUrl.searchParams.get("job_id");
+
+  if (jobId) {
+    if (!SCRAPER_API_URL) {
+      return NextResponse.json(
+        { error: "Job status requires SCRAPER_API_URL" },
+        { status: 503 }
+      );
+    }
+
+    try {
+      const path = request.nextUrl.searchParams.get("results")
+        ? `/jobs/${encodeURIComponent(jobId)}/results`
+        : `/jobs/${encodeURIComponent(jobId)}`;
+      return await callJobRunner(path);
+    } catch (error) {
+      console.error("Scrape status error:", error);
+      return NextResponse.json(
+        { error: "Failed to reach the scrape job runner" },
+        { status: 502 }
+      );
+    }
+  }
+
   // Return scraping status/history
   return NextResponse.json({
     available_sources: [
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Benchmarks for the scraper's investor classification helpers"""
+
+import pandas as pd
+
+from fixtures import synthetic_csv
+from harness import benchmark
+
+
+def _load_columns(size: int):
+    df = pd.read_csv(synthetic_csv(size), usecols=['name', 'address'])
+    return df['name'].fillna('').tolist(), df['address'].fillna('').tolist()
+
+
+@benchmark()
+def classify_investor_type(size):
+    from sec_scraper import SECFormADVScraper
+
+    scraper = SECFormADVScraper()
+    names, _ = _load_columns(size)
+
+    def run():
+        for name in names:
+            scraper.classify_investor_type(name, 'Investment Advice')
+    return run
+
+
+@benchmark()
+def extract_state(size):
+    from sec_scraper import SECFormADVScraper
+
+    scraper = SECFormADVScraper()
+    _, addresses = _load_columns(size)
+
+    def run():
+        for address in addresses:
+            scraper.extract_state(address)
+    return run
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for VCDatabase loading and queries
+
+Run directly to check upsert and query behaviour on a small database:
+python bench_database.py
+"""
+
+import os
+import sys
+import tempfile
+
+from fixtures import loaded_database, synthetic_csv
+from harness import benchmark
+
+
+@benchmark(repeat=3)
+def load_from_csv(size):
+    from vc_db_manager import VCDatabase
+
+    csv_path = synthetic_csv(size)
+    db_path = os.path.join(tempfile.mkdtemp(prefix='vc_bench_'), 'load.db')
+    db = VCDatabase(db_path)
+
+    def run():
+        db.load_from_csv(csv_path)
+    return run
+
+
+@benchmark()
+def search_investors_type_state(size):
+    db = loaded_database(size)
+    return lambda: db.search_investors(investor_type='Venture Capital', state='CA')
+
+
+@benchmark()
+def search_investors_sectors(size):
+    db = loaded_database(size)
+    return lambda: db.search_investors(sectors=['fintech', 'climate'], limit=100)
+
+
+@benchmark()
+def search_investors_ai_focus(size):
+    db = loaded_database(size)
+    return lambda: db.search_investors(has_ai_focus=True, limit=1000)
+
+
+@benchmark()
+def get_stats(size):
+    db = loaded_database(size)
+    return db.get_stats
+
+
+# Within 50 miles of downtown Austin
+AUSTIN = (30.2711, -97.7437)
+FIFTY_MILES_KM = 80.47
+
+
+@benchmark()
+def search_near_radius(size):
+    db = loaded_database(size)
+    return lambda: db.search_investors(near=AUSTIN, radius_km=FIFTY_MILES_KM, limit=1000)
+
+
+@benchmark()
+def search_near_radius_type(size):
+    db = loaded_database(size)
+    return lambda: db.search_investors(investor_type='Family Office', near=AUSTIN,
+                                       radius_km=FIFTY_MILES_KM, limit=1000)
+
+
+@benchmark()
+def search_near_full_scan(size):
+    """Baseline: haversine over every row, no R*Tree probe"""
+    db = loaded_database(size)
+    sql = ("SELECT *, haversine_km(?, ?, latitude, longitude) AS distance_km FROM investors "
+           "WHERE distance_km <= ? ORDER BY distance_km LIMIT 1000")
+    return lambda: db.conn.execute(sql, (*AUSTIN, FIFTY_MILES_KM)).fetchall()
+
+
+@benchmark()
+def search_faceted(size):
+    db = loaded_database(size)
+    return lambda: db.search_investors(investor_type='Venture Capital', has_ai_focus=True, facets=True)
+
+
+@benchmark()
+def search_facets_n_plus_one(size):
+    """Baseline: the search plus a separate GROUP BY per facet"""
+    from vc_db_manager import AUM_BUCKET_SQL
+
+    db = loaded_database(size)
+    where = "WHERE type = 'Venture Capital' AND has_ai_focus = 1"
+
+    def run():
+        db.search_investors(investor_type='Venture Capital', has_ai_focus=True)
+        db.conn.execute(f"SELECT type, COUNT(*) FROM investors {where} GROUP BY type").fetchall()
+        db.conn.execute(f"SELECT state, COUNT(*) FROM investors {where} GROUP BY state").fetchall()
+        for flag in ('has_ai_focus', 'has_music_focus', 'has_fintech_focus'):
+            db.conn.execute(f"SELECT COUNT(*) FROM investors {where} AND {flag} = 1").fetchall()
+        db.conn.execute(f"SELECT {AUM_BUCKET_SQL} AS b, COUNT(*) FROM investors {where} GROUP BY b").fetchall()
+    return run
+
+
+def _report_queries(db):
+    """State x type x focus filter combos, as the report generator issues them"""
+    types = [row[0] for row in db.conn.execute("SELECT DISTINCT type FROM investors WHERE type IS NOT NULL")]
+    focus = [{}, {'has_ai_focus': True}, {'has_music_focus': True}, {'has_fintech_focus': True}]
+    queries = [{'state': state, 'investor_type': investor_type, **flags}
+               for state in ('CA', 'NY', 'TX', 'MA', 'FL')
+               for investor_type in sorted(types)
+               for flags in focus]
+    # Reports repeat some sections
+    return queries + queries[:10]
+
+
+@benchmark()
+def search_many_report(size):
+    db = loaded_database(size)
+    queries = _report_queries(db)
+    return lambda: db.search_investors_many(queries)
+
+
+@benchmark()
+def search_loop_report(size):
+    """Baseline: one search_investors call per report query"""
+    db = loaded_database(size)
+    queries = _report_queries(db)
+    return lambda: [db.search_investors(**query) for query in queries]
+
+
+@benchmark(repeat=3)
+def quality_scoring(size):
+    import pandas as pd
+    from data_quality import score_investors
+
+    df = pd.read_csv(synthetic_csv(size))
+    return lambda: score_investors(df)
+
+
+@benchmark()
+def search_quality_ordered(size):
+    db = loaded_database(size)
+    return lambda: db.search_investors(order_by='quality', limit=100)
+
+
+@benchmark()
+def search_quality_ordered_type(size):
+    db = loaded_database(size)
+    return lambda: db.search_investors(investor_type='Venture Capital', order_by='quality', limit=100)
+
+
+@benchmark()
+def search_quality_filesort(size):
+    """Baseline: the same ordering with the score index disabled (+ 0), so every match is sorted"""
+    db = loaded_database(size)
+    sql = ("SELECT * FROM investors WHERE type = 'Venture Capital' "
+           "ORDER BY data_quality_score + 0 DESC, rowid DESC LIMIT 100")
+    return lambda: db.conn.execute(sql).fetchall()
+
+
+def check_cik_upsert(db) -> bool:
+    """Upserting the same filer with and without CIK zero-padding keeps one row"""
+    db.upsert_investors([{'cik': '1234567', 'name': 'Padding Check Capital'}])
+    db.upsert_investors([{'cik': '0001234567', 'name': 'Padding Check Capital LP'}])
+    rows = db.conn.execute("SELECT cik, name FROM investors WHERE name LIKE 'Padding Check%'").fetchall()
+    ok = [tuple(row) for row in rows] == [('0001234567', 'Padding Check Capital LP')]
+    print(f"   {'✅' if ok else '❌'} padded and unpadded CIK upserts: {[tuple(row) for row in rows]}")
+    return ok
+
+
+# aum_estimate -> expected aum_bucket facet value
+AUM_BUCKET_CASES = {
+    '150M+': '100M-1B',
+    '$7T': '100B+',
+    '2.5B': '1B-10B',
+    '1,200M': '1B-10B',
+    '$25,000M': '10B-100B',
+    '500K': '<100M',
+    '250,000K': '100M-1B',
+    '40 m': '<100M',
+    'Not disclosed': 'Unknown',
+}
+
+
+def check_aum_buckets(db) -> bool:
+    """Each AUM_BUCKET_CASES estimate lands in its expected aum_bucket facet"""
+    db.upsert_investors([{'cik': str(9_000_000 + i), 'name': f'AUM Check {i}', 'type': f'AUM Check {i}',
+                          'aum_estimate': aum} for i, aum in enumerate(AUM_BUCKET_CASES)])
+    ok = True
+    for i, (aum, expected) in enumerate(AUM_BUCKET_CASES.items()):
+        buckets = db.search_investors(investor_type=f'AUM Check {i}', facets=['aum_bucket'])['facets']['aum_bucket']
+        if buckets != {expected: 1}:
+            print(f"   ❌ aum_bucket for {aum!r}: got {buckets}, expected {expected!r}")
+            ok = False
+    if ok:
+        print(f"   ✅ aum_bucket facet for {len(AUM_BUCKET_CASES)} AUM formats")
+    return ok
+
+
+def main():
+    from vc_db_manager import VCDatabase
+
+    print("=" * 70)
+    print("🗄️  DATABASE CHECKS")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = VCDatabase(os.path.join(tmp, 'checks.db'))
+        db.setup_database()
+        checks = [check_cik_upsert(db), check_aum_buckets(db)]
+        db.conn.close()
+
+    if not all(checks):
+        print("\n❌ Database checks failed")
+        sys.exit(1)
+    print("\n✅ All database checks passed")
+
+
+if __name__ == "__main__":
+    main()
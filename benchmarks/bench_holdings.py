@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for 13F holdings ingestion and issuer lookups
+
+Run directly to check parsing and lookups against the sample filing, and
+that ingestion memory stays flat as filings grow:
+python bench_holdings.py
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import List
+
+from fixtures import DATA_DIR, SAMPLE_13F_XML, synthetic_13f_xml
+from harness import benchmark
+
+# Filings per synthetic holdings database, each `size` rows long
+FILINGS = 20
+
+
+def _holdings_db(size: int):
+    from holdings_13f import HoldingsStore
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    db_path = os.path.join(DATA_DIR, f"holdings_{size}.db")
+    if not os.path.exists(db_path):
+        xml_path = synthetic_13f_xml(size)
+        tmp_path = f"{db_path}.tmp"
+        store = HoldingsStore(tmp_path)
+        for i in range(FILINGS):
+            store.ingest(xml_path, str(1_000_000 + i), f"0000000000-24-{i:06d}", '2024-12-31')
+        store.close()
+        os.replace(tmp_path, db_path)
+    return HoldingsStore(db_path)
+
+
+@benchmark(repeat=3)
+def holdings_ingest(size):
+    from holdings_13f import HoldingsStore
+
+    xml_path = synthetic_13f_xml(size)
+    store = HoldingsStore(os.path.join(tempfile.mkdtemp(prefix='vc_bench_'), 'holdings.db'))
+    return lambda: store.ingest(xml_path, '1067983', '0000950123-24-000001', '2024-12-31')
+
+
+@benchmark()
+def holdings_investors_holding_issuer(size):
+    store = _holdings_db(size)
+    return lambda: store.investors_holding(issuer='APPLE')
+
+
+@benchmark()
+def holdings_investors_holding_cusip(size):
+    store = _holdings_db(size)
+    return lambda: store.investors_holding(cusip='037833100')
+
+
+def ingest_peak_bytes(rows: int) -> int:
+    """tracemalloc peak while ingesting a `rows`-holding filing"""
+    from holdings_13f import HoldingsStore
+
+    xml_path = synthetic_13f_xml(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HoldingsStore(os.path.join(tmp, 'holdings.db'))
+        tracemalloc.start()
+        store.ingest(xml_path, '1067983', '0000950123-24-000001', '2024-12-31')
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        store.close()
+    return peak
+
+
+def check_sample_filing() -> List[str]:
+    """Parsing, value scaling and lookups against SAMPLE_13F_XML; returns failures"""
+    from holdings_13f import HoldingsStore, iter_information_table
+
+    failures = []
+
+    def expect(label, actual, expected):
+        if actual != expected:
+            failures.append(f"{label}: got {actual!r}, expected {expected!r}")
+
+    sample = {h['issuer_name']: h for h in iter_information_table(SAMPLE_13F_XML)}
+    print(f"   Sample fixture: {len(sample)} holdings")
+
+    # CUSIPs: whitespace stripped, uppercased, dropped leading zeros restored
+    expect('ABBVIE cusip', sample['ABBVIE INC']['cusip'], '00287Y109')
+    expect('AMAZON cusip', sample['AMAZON COM INC']['cusip'], '023135106')
+    expect('SPDR cusip', sample['SPDR S&P 500 ETF TR']['cusip'], '78462F103')
+    # Comma-formatted numbers
+    expect('ABBVIE value', sample['ABBVIE INC']['value_usd'], 1_250_000)
+    expect('ABBVIE shares', sample['ABBVIE INC']['shares'], 7_500)
+    expect('MICROSTRATEGY principal', sample['MICROSTRATEGY INC']['shares'], 5_000_000)
+    # Shares vs principal amount, options
+    expect('MICROSTRATEGY share type', sample['MICROSTRATEGY INC']['share_type'], 'PRN')
+    expect('APPLE share type', sample['APPLE INC']['share_type'], 'SH')
+    expect('SPDR put/call', sample['SPDR S&P 500 ETF TR']['put_call'], 'Put')
+    expect('AMAZON put/call', sample['AMAZON COM INC']['put_call'], 'Call')
+    expect('APPLE put/call', sample['APPLE INC']['put_call'], None)
+
+    # Values in thousands before 2023-01-03 filings, by period when undated
+    expect('multiplier filed 2022-11-14', HoldingsStore.value_multiplier('2022-09-30', '2022-11-14'), 1000)
+    expect('multiplier filed 2023-01-03', HoldingsStore.value_multiplier('2022-09-30', '2023-01-03'), 1)
+    expect('multiplier filed 2023-02-14', HoldingsStore.value_multiplier('2022-12-31', '2023-02-14'), 1)
+    expect('multiplier period 2022-09-30', HoldingsStore.value_multiplier('2022-09-30'), 1000)
+    expect('multiplier period 2022-12-31', HoldingsStore.value_multiplier('2022-12-31'), 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HoldingsStore(os.path.join(tmp, 'holdings.db'))
+        store.ingest(SAMPLE_13F_XML, '0001067983', '0000950123-22-000001', '2022-09-30', '2022-11-14')
+        store.ingest(SAMPLE_13F_XML, '102909', '0000102909-23-000001', '2022-12-31', '2023-02-14')
+
+        # The thousands filing is scaled up, so it ranks first
+        expected = [('1067983', 84_248_084_220_000), ('102909', 84_248_084_220)]
+        by_issuer = [(r['investor_cik'], r['value_usd']) for r in store.investors_holding(issuer='apple')]
+        expect("investors_holding(issuer='apple')", by_issuer, expected)
+        by_cusip = [(r['investor_cik'], r['value_usd']) for r in store.investors_holding(cusip='37833100')]
+        expect("investors_holding(cusip='37833100')", by_cusip, expected)
+        # Prefix on the normalized name: punctuation and case don't matter
+        by_prefix = [r['investor_cik'] for r in store.investors_holding(issuer='Bank of America')]
+        expect("investors_holding(issuer='Bank of America')", by_prefix, ['1067983', '102909'])
+        expect("investors_holding(issuer='APPLES')", store.investors_holding(issuer='APPLES'), [])
+        store.close()
+
+    return failures
+
+
+def main():
+    print("=" * 70)
+    print("📄 13F INGESTION CHECK")
+    print("=" * 70)
+
+    failures = check_sample_filing()
+    for failure in failures:
+        print(f"   ❌ {failure}")
+    if failures:
+        print("\n❌ Sample filing parsed incorrectly")
+        sys.exit(1)
+    print("   ✅ Sample filing parsed and queried correctly")
+
+    small, large = ingest_peak_bytes(10_000), ingest_peak_bytes(100_000)
+    print(f"   Peak memory: {small / 1e6:.2f}MB for 10k rows, {large / 1e6:.2f}MB for 100k rows")
+
+    # Batching bounds memory; 10x the rows must not mean anywhere near 10x the memory
+    if large > small * 2:
+        print("\n❌ Ingestion memory grows with filing size")
+        sys.exit(1)
+    print("\n✅ Ingestion memory is flat")
+
+
+if __name__ == "__main__":
+    main()
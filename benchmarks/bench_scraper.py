@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Benchmarks for the SEC scraper against a local stub server"""
+
+from fixtures import StubSECServer
+from harness import benchmark
+
+_servers = {}
+
+
+def _stub_scraper(companies: int):
+    from sec_scraper import SECFormADVScraper
+
+    if companies not in _servers:
+        _servers[companies] = StubSECServer(companies=companies).start()
+    url = _servers[companies].url
+    return SECFormADVScraper(base_url=url, data_url=url)
+
+
+@benchmark(repeat=3)
+def scraper_get_investment_advisers(size):
+    scraper = _stub_scraper(size)
+    return lambda: scraper.get_investment_advisers(limit=size)
+
+
+@benchmark(sized=False)
+def scraper_get_recent_13f_filers():
+    scraper = _stub_scraper(100)
+    return lambda: scraper.get_recent_13f_filers(limit=100)
+
+
+@benchmark(sized=False, repeat=3)
+def scraper_get_adviser_details_50():
+    scraper = _stub_scraper(100)
+    ciks = [str(1_000_000 + i) for i in range(50)]
+
+    def run():
+        for cik in ciks:
+            scraper.get_adviser_details(cik)
+    return run
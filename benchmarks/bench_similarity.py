@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Benchmarks for the "similar investors" vector index"""
+
+import os
+import shutil
+import tempfile
+
+from fixtures import loaded_database
+from harness import benchmark
+
+
+def _indexed_database(size):
+    db = loaded_database(size)
+    if not db._vector_index_exists():
+        db.build_vector_index()
+    return db
+
+
+@benchmark(repeat=1)
+def build_vector_index(size):
+    from vc_db_manager import VCDatabase
+
+    source = loaded_database(size)
+    vector_path = os.path.join(tempfile.mkdtemp(prefix='vc_bench_'), 'vectors')
+    db = VCDatabase(source.db_path, vector_path=vector_path)
+
+    def run():
+        db.build_vector_index()
+    return run
+
+
+@benchmark()
+def similar_investors_top10(size):
+    db = _indexed_database(size)
+    cik = db.conn.execute("SELECT cik FROM investors LIMIT 1 OFFSET ?", (size // 2,)).fetchone()[0]
+    return lambda: db.similar_investors(cik, k=10)
+
+
+@benchmark()
+def similar_investors_batch_100(size):
+    """100 queries scored in one pass with batched matrix products"""
+    db = _indexed_database(size)
+    index = db._vector_index()
+    queries = index.matrix[:100]
+    return lambda: index.top_k(queries, k=10)
+
+
+@benchmark(repeat=3)
+def vector_index_update_100(size):
+    """Re-embed 100 changed investors in place"""
+    from vc_db_manager import VCDatabase
+
+    source = _indexed_database(size)
+    work_dir = tempfile.mkdtemp(prefix='vc_bench_')
+    db_path = os.path.join(work_dir, 'vc.db')
+    shutil.copy(source.db_path, db_path)
+    for suffix in ('.f32', '.meta.npz'):
+        shutil.copy(f"{source.vector_path}{suffix}", f"{db_path}.vectors{suffix}")
+    db = VCDatabase(db_path)
+    investors = [dict(row) for row in db.conn.execute("SELECT * FROM investors LIMIT 100")]
+    for investor in investors:
+        investor['sectors'] = f"{investor.get('sectors') or ''}, Robotics"
+        investor.pop('id', None)
+
+    return lambda: db.upsert_investors(investors)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for snapshot reloads
+
+Run directly to measure what a concurrent reader sees while data is
+reloaded in place (load_from_csv) versus through a snapshot swap:
+python bench_snapshots.py [SIZE]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from fixtures import synthetic_csv
+from harness import benchmark, format_seconds
+
+READER_QUERY = {'investor_type': 'Venture Capital', 'state': 'CA', 'limit': 100}
+
+
+@benchmark(repeat=3)
+def load_snapshot(size):
+    from vc_db_manager import VCDatabase
+
+    csv_path = synthetic_csv(size)
+    db = VCDatabase(os.path.join(tempfile.mkdtemp(prefix='vc_bench_'), 'live.db'))
+
+    def run():
+        db.load_snapshot(csv_path, keep=2)
+    return run
+
+
+def _reader(db_path: str, stop, results):
+    """Query continuously until `stop` is set; report latencies and errors"""
+    from vc_db_manager import VCDatabase
+
+    db = VCDatabase(db_path, read_only=True)
+    latencies = []
+    errors = 0
+    empty = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            if not db.search_investors(**READER_QUERY):
+                empty += 1
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    results.put((latencies, errors, empty))
+
+
+def reader_latency_during(reload, db_path: str) -> dict:
+    """Reader latency percentiles while `reload()` runs in this process"""
+    stop = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    reader = multiprocessing.Process(target=_reader, args=(db_path, stop, results))
+    reader.start()
+    time.sleep(0.5)
+    reload()
+    time.sleep(0.5)
+    stop.set()
+    latencies, errors, empty = results.get()
+    reader.join()
+
+    latencies.sort()
+    return {
+        'queries': len(latencies),
+        'p50': latencies[len(latencies) // 2],
+        'p99': latencies[int(len(latencies) * 0.99)],
+        'max': latencies[-1],
+        'errors': errors,
+        'empty': empty,
+    }
+
+
+def main():
+    from vc_db_manager import VCDatabase
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    csv_path = synthetic_csv(size)
+
+    print("=" * 70)
+    print(f"📸 READER LATENCY DURING RELOAD ({size:,} investors)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        in_place = VCDatabase(os.path.join(tmp, 'in_place.db'))
+        in_place.load_from_csv(csv_path)
+        in_place_stats = reader_latency_during(lambda: in_place.load_from_csv(csv_path), in_place.db_path)
+
+        swapped = VCDatabase(os.path.join(tmp, 'snapshot.db'))
+        swapped.load_snapshot(csv_path)
+        snapshot_stats = reader_latency_during(lambda: swapped.load_snapshot(csv_path), swapped.db_path)
+
+    for label, stats in (('load_from_csv (in place)', in_place_stats), ('load_snapshot', snapshot_stats)):
+        print(f"   {label}: {stats['queries']} queries, p50 {format_seconds(stats['p50'])}, "
+              f"p99 {format_seconds(stats['p99'])}, max {format_seconds(stats['max'])}, "
+              f"{stats['errors']} errors, {stats['empty']} empty results")
+
+    if snapshot_stats['errors'] or snapshot_stats['empty']:
+        print("\n❌ Readers saw a missing or partial table during a snapshot reload")
+        sys.exit(1)
+    print("\n✅ Readers were unaffected by the snapshot reload")
+
+
+if __name__ == "__main__":
+    main()
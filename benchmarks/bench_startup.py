@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Startup benchmarks
+Import time of the CLI modules, and a guard that query-only code paths
+never pull in heavy dependencies
+
+Run directly to check the guard: python bench_startup.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+from typing import Dict
+
+from fixtures import REPO_ROOT
+from harness import benchmark
+
+SCRAPERS_DIR = os.path.join(REPO_ROOT, 'lib', 'scrapers')
+SCRIPTS_DIR = os.path.join(REPO_ROOT, 'scripts')
+
+# Snippet run in a fresh interpreter -> modules it must not import
+STARTUP_GUARDS = {
+    'import vc_db_manager': ('pandas', 'numpy', 'requests'),
+    'import sec_scraper': ('pandas', 'numpy', 'requests'),
+    'import upload_to_supabase': ('pandas', 'supabase', 'dotenv'),
+    (
+        "from vc_db_manager import VCDatabase\n"
+        "VCDatabase(sys.argv[1]).close()\n"
+        "db = VCDatabase(sys.argv[1], read_only=True)\n"
+        "db.search_investors(state='CA')\n"
+        "db.get_stats()\n"
+        "db.close()"
+    ): ('pandas', 'numpy'),
+}
+
+_IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def _run(snippet: str, *args: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    """Run `snippet` in a fresh interpreter with the scraper/script dirs importable"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SCRAPERS_DIR, SCRIPTS_DIR]))
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ['-X', 'importtime']
+    cmd += ['-c', f"import sys\n{snippet}", *args]
+    return subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+
+
+def import_time_us(module: str) -> int:
+    """Cumulative `python -X importtime` microseconds for importing `module`"""
+    stderr = _run(f"import {module}", importtime=True).stderr
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and match.group(4) == module and match.group(3) == ' ':
+            return int(match.group(2))
+    raise RuntimeError(f"No importtime entry for {module}")
+
+
+def loaded_modules(snippet: str, *args: str) -> set:
+    """Top-level module names imported after running `snippet`"""
+    out = _run(f"{snippet}\nprint(','.join(sys.modules))", *args).stdout
+    return {name.split('.')[0] for name in out.strip().splitlines()[-1].split(',')}
+
+
+def check_startup_guards(db_path: str) -> Dict[str, list]:
+    """Return {snippet: [forbidden modules it imported]} for every failing guard"""
+    failures = {}
+    for snippet, forbidden in STARTUP_GUARDS.items():
+        loaded = loaded_modules(snippet, db_path)
+        leaked = sorted(m for m in forbidden if m in loaded)
+        if leaked:
+            failures[snippet] = leaked
+    return failures
+
+
+def _import_benchmark(module: str):
+    # Each sample is a fresh interpreter, so this measures cold import time
+    return lambda: _run(f"import {module}")
+
+
+for _module in ('vc_db_manager', 'sec_scraper', 'upload_to_supabase'):
+    benchmark(name=f"startup_import_{_module}", sized=False)(
+        lambda module=_module: _import_benchmark(module)
+    )
+
+
+def main():
+    import tempfile
+
+    print("=" * 70)
+    print("🚀 STARTUP GUARD")
+    print("=" * 70)
+
+    for module in ('vc_db_manager', 'sec_scraper', 'upload_to_supabase'):
+        print(f"   {module}: {import_time_us(module) / 1000:.1f}ms cumulative import time")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        failures = check_startup_guards(os.path.join(tmp, 'guard.db'))
+
+    if failures:
+        for snippet, leaked in failures.items():
+            print(f"\n❌ {snippet.splitlines()[0]}... imported {', '.join(leaked)}")
+        sys.exit(1)
+
+    print("\n✅ Query-only paths import no heavy dependencies")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""Benchmarks for the Supabase uploader's record building"""
+
+import pandas as pd
+
+from fixtures import synthetic_csv
+from harness import SkipBenchmark, benchmark
+
+
+@benchmark(repeat=3)
+def uploader_build_records(size):
+    try:
+        from upload_to_supabase import build_records
+    except ImportError as e:
+        raise SkipBenchmark(f"uploader dependencies missing: {e}")
+
+    df = pd.read_csv(synthetic_csv(size))
+    return lambda: build_records(df)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Benchmark fixtures
+Cached synthetic datasets and a local stub of the SEC endpoints
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BENCH_DIR, '.data')
+
+# Make the scrapers and scripts importable the same way their CLIs see them
+for _path in (os.path.join(REPO_ROOT, 'lib', 'scrapers'), os.path.join(REPO_ROOT, 'scripts')):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+DATASET_SEED = 42
+# Bump when VCDatabase's schema or derived columns change, so cached databases are rebuilt
+DATABASE_VERSION = 5
+
+
+def synthetic_csv(size: int, seed: int = DATASET_SEED) -> str:
+    """Path to a synthetic CSV of `size` investors, generated on first use"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"synthetic_{size}_{seed}.csv")
+    if not os.path.exists(path):
+        from generate_sample_data import write_synthetic_investors
+        tmp_path = f"{path}.tmp"
+        write_synthetic_investors(size, tmp_path, fmt='csv', seed=seed,
+                                  workers=min(os.cpu_count() or 1, 4))
+        os.replace(tmp_path, path)
+    return path
+
+
+def loaded_database(size: int, seed: int = DATASET_SEED):
+    """A VCDatabase holding `size` synthetic investors, built on first use"""
+    from vc_db_manager import VCDatabase
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    db_path = os.path.join(DATA_DIR, f"vc_bench_v{DATABASE_VERSION}_{size}_{seed}.db")
+    if not os.path.exists(db_path):
+        csv_path = synthetic_csv(size, seed)
+        tmp_path = f"{db_path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        db = VCDatabase(tmp_path)
+        db.load_from_csv(csv_path)
+        db.close()
+        os.replace(tmp_path, db_path)
+
+    return VCDatabase(db_path)
+
+
+SAMPLE_13F_XML = os.path.join(BENCH_DIR, 'data', '13f_information_table.xml')
+
+_13F_ISSUERS = [
+    ('APPLE INC', '037833100'), ('MICROSOFT CORP', '594918104'), ('AMAZON COM INC', '023135106'),
+    ('NVIDIA CORPORATION', '67066G104'), ('ALPHABET INC', '02079K305'), ('TESLA INC', '88160R101'),
+    ('JPMORGAN CHASE & CO', '46625H100'), ('VISA INC', '92826C839'), ('COCA COLA CO', '191216100'),
+    ('BANK AMER CORP', '060505104'),
+]
+
+
+def synthetic_13f_xml(rows: int, seed: int = DATASET_SEED) -> str:
+    """Path to a 13F information table with `rows` holdings, generated on first use"""
+    import random
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"13f_{rows}_{seed}.xml")
+    if os.path.exists(path):
+        return path
+
+    rng = random.Random(seed)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<informationTable xmlns="http://www.sec.gov/edgar/document/thirteenf/informationtable">\n')
+        for i in range(rows):
+            if i < len(_13F_ISSUERS) * 10:
+                name, cusip = _13F_ISSUERS[i % len(_13F_ISSUERS)]
+            else:
+                name, cusip = f"ISSUER {i} CORP", f"{i:08d}{i % 10}"[-9:]
+            shares = rng.randint(100, 10_000_000)
+            f.write(
+                f"<infoTable><nameOfIssuer>{name.replace('&', '&amp;')}</nameOfIssuer>"
+                f"<titleOfClass>COM</titleOfClass><cusip>{cusip}</cusip>"
+                f"<value>{shares * rng.randint(5, 500)}</value>"
+                f"<shrsOrPrnAmt><sshPrnamt>{shares}</sshPrnamt><sshPrnamtType>SH</sshPrnamtType></shrsOrPrnAmt>"
+                f"<investmentDiscretion>SOLE</investmentDiscretion>"
+                f"<votingAuthority><Sole>{shares}</Sole><Shared>0</Shared><None>0</None></votingAuthority>"
+                f"</infoTable>\n"
+            )
+        f.write('</informationTable>\n')
+    os.replace(tmp_path, path)
+    return path
+
+
+class _StubSECHandler(BaseHTTPRequestHandler):
+    """Serves canned responses shaped like the SEC endpoints the scraper uses"""
+
+    companies = 1000
+
+    def do_GET(self):
+        if self.path.startswith('/files/company_tickers.json'):
+            suffixes = ['Capital Partners', 'Ventures', 'Industries', 'Family Office', 'Holdings Inc']
+            body = {
+                str(i): {
+                    'cik_str': 1_000_000 + i,
+                    'ticker': f"T{i}",
+                    'title': f"Company {i} {suffixes[i % len(suffixes)]}",
+                }
+                for i in range(self.companies)
+            }
+            self._send_json(body)
+            return
+
+        match = re.match(r'/submissions/CIK(\d{10})\.json', self.path)
+        if match:
+            self._send_json({
+                'cik': match.group(1),
+                'sic': '6282',
+                'sicDescription': 'Investment Advice',
+                'phone': '212-555-0100',
+                'addresses': {
+                    'business': {
+                        'street1': '1 Main Street',
+                        'street2': '',
+                        'city': 'New York',
+                        'stateOrCountry': 'NY',
+                        'zipCode': '10020',
+                    }
+                },
+            })
+            return
+
+        if self.path.startswith('/cgi-bin/browse-edgar'):
+            entries = ''.join(
+                f"<entry><title>13F-HR - Filer {i} Capital (000{1_000_000 + i})</title>"
+                f"<link href=\"/cgi-bin/browse-edgar?action=getcompany&amp;CIK={1_000_000 + i}\"/></entry>"
+                for i in range(100)
+            )
+            self._send(f"<feed>{entries}</feed>".encode(), 'application/atom+xml')
+            return
+
+        self._send(b'not found', 'text/plain', status=404)
+
+    def _send_json(self, body):
+        self._send(json.dumps(body).encode(), 'application/json')
+
+    def _send(self, payload: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubSECServer:
+    """Local HTTP server standing in for www.sec.gov and data.sec.gov"""
+
+    def __init__(self, companies: int = 1000):
+        handler = type('StubSECHandler', (_StubSECHandler,), {'companies': companies})
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StubSECServer':
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness
+Registers benchmarks, times them and stores/compares JSON results
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Registered benchmarks, in definition order
+BENCHMARKS: List[Dict] = []
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark setup when it cannot run in this environment"""
+
+
+def benchmark(name: Optional[str] = None, sized: bool = True, repeat: int = 5, number: int = 1):
+    """
+    Register a benchmark
+
+    The decorated function is the (untimed) setup: it receives the dataset
+    size when `sized` is True and returns the zero-argument callable to time.
+
+    Args:
+        name: Benchmark name, defaults to the function name
+        sized: Run once per dataset size
+        repeat: Number of timed samples
+        number: Calls per sample
+    """
+    def decorator(setup: Callable) -> Callable:
+        BENCHMARKS.append({
+            'name': name or setup.__name__,
+            'setup': setup,
+            'sized': sized,
+            'repeat': repeat,
+            'number': number,
+        })
+        return setup
+    return decorator
+
+
+def time_callable(func: Callable, repeat: int, number: int) -> Dict:
+    """Time `func`, returning per-call statistics in seconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'repeat': repeat,
+        'number': number,
+    }
+
+
+def run_benchmarks(sizes: List[int], name_filter: Optional[str] = None,
+                   repeat: Optional[int] = None) -> Dict:
+    """Run every registered benchmark and return a results document"""
+    results = {}
+
+    for bench in BENCHMARKS:
+        if name_filter and name_filter not in bench['name']:
+            continue
+
+        for size in (sizes if bench['sized'] else [None]):
+            key = bench['name'] if size is None else f"{bench['name']}[{size}]"
+
+            try:
+                func = bench['setup'](size) if bench['sized'] else bench['setup']()
+            except SkipBenchmark as e:
+                print(f"   ⏭️  {key}: skipped ({e})")
+                results[key] = {'skipped': str(e)}
+                continue
+
+            stats = time_callable(func, repeat or bench['repeat'], bench['number'])
+            results[key] = stats
+            print(f"   ⏱️  {key}: median {format_seconds(stats['median'])} "
+                  f"(min {format_seconds(stats['min'])})")
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': sizes,
+        'results': results,
+    }
+
+
+def save_results(document: Dict, results_dir: str) -> str:
+    """Write a results document as JSON and return its path"""
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = document['timestamp'].replace(':', '').replace('-', '').split('.')[0]
+    path = os.path.join(results_dir, f"{stamp}_{document['commit'] or 'nocommit'}.json")
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    return path
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Compare two results documents by median time
+
+    Returns:
+        One entry per benchmark present in both runs, with `regression`
+        set when the current median is slower than baseline by more
+        than `threshold` (a fraction, 0.10 = 10%)
+    """
+    rows = []
+    for key, new in current['results'].items():
+        old = baseline['results'].get(key)
+        if not old or 'median' not in old or 'median' not in new:
+            continue
+
+        change = (new['median'] - old['median']) / old['median'] if old['median'] else 0.0
+        rows.append({
+            'name': key,
+            'baseline': old['median'],
+            'current': new['median'],
+            'change': change,
+            'regression': change > threshold,
+        })
+    return rows
+
+
+def format_seconds(seconds: float) -> str:
+    """Human-readable duration"""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
+
+
+def _git_commit() -> Optional[str]:
+    """Short hash of the checked-out commit, if this is a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
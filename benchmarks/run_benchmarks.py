@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner
+Run the benchmark suite on synthetic datasets and flag regressions
+
+Run: python run_benchmarks.py --sizes 1000,10000 --compare results/<baseline>.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+
+from harness import DEFAULT_SIZES, compare_results, format_seconds, run_benchmarks, save_results
+
+# Importing the modules registers their benchmarks
+BENCHMARK_MODULES = [
+    'bench_classifiers',
+    'bench_database',
+    'bench_uploader',
+    'bench_scraper',
+    'bench_startup',
+    'bench_holdings',
+    'bench_similarity',
+    'bench_snapshots',
+]
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the VC intelligence benchmark suite")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated synthetic dataset sizes")
+    parser.add_argument('--filter', help="Only run benchmarks whose name contains this")
+    parser.add_argument('--repeat', type=int, help="Override the per-benchmark repeat count")
+    parser.add_argument('--results-dir', default=RESULTS_DIR)
+    parser.add_argument('--compare', metavar='BASELINE_JSON',
+                        help="Compare against a previous results file")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Slowdown fraction that counts as a regression (default 0.10)")
+    parser.add_argument('--verbose', action='store_true',
+                        help="Show output printed by the code under test")
+    args = parser.parse_args()
+
+    for module in BENCHMARK_MODULES:
+        __import__(module)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+
+    print("=" * 70)
+    print("⏱️  VC INTELLIGENCE BENCHMARKS")
+    print("=" * 70)
+    print(f"Sizes: {', '.join(f'{s:,}' for s in sizes)}")
+    print()
+
+    if args.verbose:
+        document = run_benchmarks(sizes, args.filter, args.repeat)
+    else:
+        # The code under test prints progress lines; keep the report readable
+        document = _run_quietly(sizes, args.filter, args.repeat)
+
+    path = save_results(document, args.results_dir)
+    print(f"\n💾 Results saved to: {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        rows = compare_results(baseline, document, args.threshold)
+        print("\n" + "=" * 70)
+        print(f"📈 COMPARISON vs {os.path.basename(args.compare)} (threshold {args.threshold:.0%})")
+        print("=" * 70)
+        for row in rows:
+            flag = "❌ REGRESSION" if row['regression'] else "✅"
+            print(f"{flag} {row['name']}: {format_seconds(row['baseline'])} → "
+                  f"{format_seconds(row['current'])} ({row['change']:+.1%})")
+
+        regressions = [row for row in rows if row['regression']]
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark(s) regressed")
+            sys.exit(1)
+
+
+def _run_quietly(sizes, name_filter, repeat):
+    """Run benchmarks, letting only the harness's own lines through to stdout"""
+    real_stdout = sys.stdout
+
+    class _HarnessOnly(io.TextIOBase):
+        def write(self, text):
+            if text.lstrip().startswith(('⏱️', '⏭️')):
+                real_stdout.write(text + ('' if text.endswith('\n') else '\n'))
+            return len(text)
+
+    with contextlib.redirect_stdout(_HarnessOnly()):
+        return run_benchmarks(sizes, name_filter, repeat)
+
+
+if __name__ == "__main__":
+    main()
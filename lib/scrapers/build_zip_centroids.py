@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+ZIP Centroid Table Builder
+Regenerate data/zip_centroids.csv, the offline table geo.ZipGeocoder loads
+
+Sources:
+    zipcodes    The `zipcodes` package's embedded USPS ZIP dataset (default):
+                every civilian ZIP, including PO Box and unique ZIPs, with city
+                and state. Install with: pip install zipcodes
+    gazetteer   A Census ZCTA Gazetteer file (path or URL, .txt or .zip), e.g.
+                https://www2.census.gov/geo/docs/maps-data/data/gazetteer/2023_Gazetteer/2023_Gaz_zcta_national.zip
+                ZCTAs carry no city or state; those are filled in from the
+                zipcodes package when it is installed.
+
+Run:
+    python build_zip_centroids.py
+    python build_zip_centroids.py --gazetteer 2023_Gaz_zcta_national.zip
+"""
+
+import argparse
+import csv
+import io
+import os
+import zipfile
+from typing import Dict, List
+
+from geo import DEFAULT_ZIP_CENTROIDS
+
+FIELDS = ['zip', 'city', 'state', 'latitude', 'longitude']
+
+# APO/FPO ZIPs have no meaningful location
+EXCLUDED_ZIP_TYPES = {'MILITARY'}
+
+
+def _zipcodes_dataset() -> List[Dict]:
+    try:
+        import zipcodes
+    except ImportError:
+        raise SystemExit("❌ The zipcodes package is required: pip install zipcodes")
+    return zipcodes.list_all()
+
+
+def rows_from_zipcodes() -> List[Dict]:
+    """Centroid rows for every civilian ZIP in the zipcodes dataset"""
+    rows = []
+    for entry in _zipcodes_dataset():
+        if entry.get('zip_code_type') in EXCLUDED_ZIP_TYPES or not entry.get('lat') or not entry.get('long'):
+            continue
+        rows.append({
+            'zip': entry['zip_code'],
+            'city': entry.get('city', ''),
+            'state': entry.get('state', ''),
+            'latitude': float(entry['lat']),
+            'longitude': float(entry['long']),
+        })
+    return rows
+
+
+def _read_gazetteer_text(source: str) -> str:
+    if source.startswith(('http://', 'https://')):
+        import requests
+
+        response = requests.get(source, timeout=60)
+        response.raise_for_status()
+        data = response.content
+    else:
+        with open(source, 'rb') as f:
+            data = f.read()
+
+    if data[:2] == b'PK':
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            name = next(n for n in archive.namelist() if n.endswith('.txt'))
+            data = archive.read(name)
+    return data.decode('utf-8-sig')
+
+
+def rows_from_gazetteer(source: str) -> List[Dict]:
+    """Centroid rows from a Census ZCTA Gazetteer file (tab-separated GEOID, INTPTLAT, INTPTLONG)"""
+    try:
+        places = {entry['zip_code']: entry for entry in _zipcodes_dataset()}
+    except SystemExit:
+        print("⚠️  zipcodes not installed; city fallback will be unavailable")
+        places = {}
+
+    rows = []
+    reader = csv.DictReader(io.StringIO(_read_gazetteer_text(source)), delimiter='\t')
+    reader.fieldnames = [name.strip() for name in reader.fieldnames]
+    for record in reader:
+        zip_code = record['GEOID'].strip().zfill(5)
+        place = places.get(zip_code, {})
+        rows.append({
+            'zip': zip_code,
+            'city': place.get('city', ''),
+            'state': place.get('state', ''),
+            'latitude': float(record['INTPTLAT']),
+            'longitude': float(record['INTPTLONG']),
+        })
+    return rows
+
+
+def write_centroids(rows: List[Dict], path: str = DEFAULT_ZIP_CENTROIDS) -> int:
+    """Write rows sorted by ZIP, replacing `path` atomically"""
+    rows = sorted({row['zip']: row for row in rows}.values(), key=lambda row: row['zip'])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, 'latitude': f"{row['latitude']:.4f}", 'longitude': f"{row['longitude']:.4f}"})
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline ZIP centroid table used for geocoding")
+    parser.add_argument('--gazetteer', metavar='PATH_OR_URL',
+                        help="Census ZCTA Gazetteer file instead of the zipcodes dataset")
+    parser.add_argument('--output', default=DEFAULT_ZIP_CENTROIDS, help="CSV to write")
+    args = parser.parse_args()
+
+    rows = rows_from_gazetteer(args.gazetteer) if args.gazetteer else rows_from_zipcodes()
+    count = write_centroids(rows, args.output)
+    print(f"✅ Wrote {count:,} ZIP centroids to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Data Quality Scoring
+Vectorized completeness, freshness and consistency scores for investor
+records, combined into the 0-100 data_quality_score column
+"""
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Field -> weight in the completeness score
+COMPLETENESS_WEIGHTS = {
+    'address': 3,
+    'website': 2,
+    'contact_email': 2,
+    'aum_estimate': 2,
+    'sectors': 2,
+    'sic': 1,
+    'type': 1,
+    'stage_preference': 1,
+    'investment_focus': 1,
+    'decision_makers': 1,
+    'notable_investments': 1,
+}
+
+# Records scraped within FRESH_DAYS are fully fresh; freshness reaches 0 at STALE_DAYS
+FRESH_DAYS = 30
+STALE_DAYS = 365
+
+# Component weights in the final score
+SCORE_WEIGHTS = {'completeness': 0.5, 'freshness': 0.3, 'consistency': 0.2}
+
+_STATE_ZIP = r'\b[A-Z]{2}\s+\d{5}(?:-\d{4})?\b'
+_WEBSITE = r'^(?:https?://)?(?:[a-z0-9-]+\.)+[a-z]{2,}(?:[/?#].*)?$'
+_AUM = r'^\$?\d+(?:\.\d+)?\s*[KMBT]\+?$'
+_CIK = r'^\d{1,10}$'
+# Registrable part (last two labels) of an email address or website host
+_EMAIL_DOMAIN = r'@(?:[^@.]+\.)*([^@.]+\.[^@.]+)$'
+_WEBSITE_DOMAIN = r'^(?:[a-z]+://)?(?:[^/?#:]+\.)?([^./?#:]+\.[^./?#:]+)(?:[/?#:].*)?$'
+
+
+def _present(df: 'pd.DataFrame', column: str) -> 'pd.Series':
+    """True where a column has a non-empty value"""
+    import pandas as pd
+
+    if column not in df.columns:
+        return pd.Series(False, index=df.index)
+    return df[column].notna() & (df[column] != '')
+
+
+def _text(df: 'pd.DataFrame', column: str) -> 'pd.Series':
+    """Column as stripped strings, '' where missing"""
+    import pandas as pd
+
+    if column not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[column].fillna('').astype(str).str.strip()
+
+
+def quality_components(df: 'pd.DataFrame', reference_time: Optional[datetime] = None) -> 'pd.DataFrame':
+    """
+    Per-record quality components, each in [0, 1], plus the combined score
+
+    Args:
+        df: Investor records
+        reference_time: "Now" for freshness, defaults to the current time
+
+    Returns:
+        DataFrame with completeness, freshness, consistency and
+        data_quality_score (0-100 integer) columns, aligned with df
+    """
+    import numpy as np
+    import pandas as pd
+
+    # Completeness: weighted share of populated fields
+    present = {column: _present(df, column) for column in COMPLETENESS_WEIGHTS}
+    completeness = sum(present[c].to_numpy() * w for c, w in COMPLETENESS_WEIGHTS.items())
+    completeness = completeness / sum(COMPLETENESS_WEIGHTS.values())
+
+    # Freshness: linear decay between FRESH_DAYS and STALE_DAYS since scraped_at
+    reference = pd.Timestamp(reference_time or datetime.now(timezone.utc))
+    if reference.tzinfo is None:
+        reference = reference.tz_localize('UTC')
+    scraped_at = (pd.to_datetime(df['scraped_at'], errors='coerce', utc=True, format='ISO8601')
+                  if 'scraped_at' in df.columns else pd.Series(pd.NaT, index=df.index))
+    age_days = ((reference - scraped_at).dt.total_seconds() / 86400).to_numpy()
+    freshness = np.clip((STALE_DAYS - age_days) / (STALE_DAYS - FRESH_DAYS), 0.0, 1.0)
+    freshness = np.nan_to_num(freshness, nan=0.0)
+
+    # Consistency: share of applicable checks that pass
+    address = _text(df, 'address')
+    website = _text(df, 'website')
+    email = _text(df, 'contact_email')
+    aum = _text(df, 'aum_estimate')
+    cik = _text(df, 'cik')
+
+    # Domains are only compared where both email and website are present
+    both = present['contact_email'] & present['website']
+    email_domain = email[both].str.lower().str.extract(_EMAIL_DOMAIN, expand=False)
+    website_domain = website[both].str.lower().str.extract(_WEBSITE_DOMAIN, expand=False)
+    same_domain = (email_domain == website_domain).reindex(df.index, fill_value=False)
+    checks = [
+        (present['address'], address.str.contains(_STATE_ZIP, regex=True)),
+        (present['website'], website.str.lower().str.match(_WEBSITE)),
+        (present['aum_estimate'], aum.str.upper().str.match(_AUM)),
+        (cik != '', cik.str.match(_CIK)),
+        (both, same_domain),
+    ]
+    applicable = sum(a.to_numpy(dtype=np.int64) for a, _ in checks)
+    passed = sum((a & p.fillna(False)).to_numpy(dtype=np.int64) for a, p in checks)
+    consistency = np.divide(passed, applicable, out=np.zeros(len(df)), where=applicable > 0)
+
+    score = 100 * (SCORE_WEIGHTS['completeness'] * completeness
+                   + SCORE_WEIGHTS['freshness'] * freshness
+                   + SCORE_WEIGHTS['consistency'] * consistency)
+
+    return pd.DataFrame({
+        'completeness': completeness,
+        'freshness': freshness,
+        'consistency': consistency,
+        'data_quality_score': np.rint(score).astype(np.int64),
+    }, index=df.index)
+
+
+def score_investors(df: 'pd.DataFrame', reference_time: Optional[datetime] = None) -> 'pd.Series':
+    """0-100 data_quality_score for every record in df"""
+    return quality_components(df, reference_time)['data_quality_score']
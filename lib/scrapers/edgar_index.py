@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+EDGAR Index Discovery
+Incrementally discover 13F-HR, ADV and Form D filers from EDGAR
+form.idx/master.idx files, processing only index files newer than the
+last run
+
+Run:
+    python edgar_index.py --db vc_intelligence.db --index-dir ./edgar_index
+    python edgar_index.py --db vc_intelligence.db --fetch 2026 4
+"""
+
+import argparse
+import gzip
+import itertools
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from metrics import get_metrics
+
+# Form types worth tracking: institutional managers, advisers and private fund raises
+DISCOVERY_FORMS = ('13F-HR', '13F-HR/A', 'D', 'D/A')
+DISCOVERY_FORM_PREFIXES = ('ADV',)
+
+# Daily files: master.20240315.idx / form.20240315.idx (optionally .gz)
+_DAILY_FILE = re.compile(r'^(master|form)\.(\d{8})\.idx(\.gz)?$')
+# Quarterly files live in full-index/<year>/QTR<n>/
+_QUARTER_DIR = re.compile(r'(\d{4})[/\\]QTR([1-4])')
+# form.idx rows are fixed-width-ish: columns separated by runs of 2+ spaces
+_FORM_ROW = re.compile(r'^(?P<form>\S.*?)\s{2,}(?P<name>.+?)\s{2,}(?P<cik>\d+)\s+'
+                       r'(?P<date>\d{4}-?\d{2}-?\d{2})\s+(?P<file>\S+)\s*$')
+
+_SET_HIGH_WATER_MARK = (
+    "INSERT INTO discovery_state (kind, high_water_mark, updated_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(kind) DO UPDATE SET high_water_mark = excluded.high_water_mark, "
+    "updated_at = excluded.updated_at"
+)
+
+# Matching index entries are recorded, and their new filers merged, in batches of this many
+INDEX_BATCH_SIZE = 500
+
+
+def is_discovery_form(form_type: str) -> bool:
+    form_type = form_type.strip().upper()
+    return form_type in DISCOVERY_FORMS or form_type.startswith(DISCOVERY_FORM_PREFIXES)
+
+
+def index_file_key(path: str) -> Optional[Tuple[str, str]]:
+    """
+    Ordering key for an index file: ('daily', 'YYYYMMDD') or
+    ('quarterly', 'YYYYQn'); None for files that aren't EDGAR indexes
+    """
+    name = os.path.basename(path)
+    match = _DAILY_FILE.match(name)
+    if match:
+        return 'daily', match.group(2)
+
+    if re.match(r'^(master|form)\.idx(\.gz)?$', name):
+        quarter = _QUARTER_DIR.search(path)
+        if quarter:
+            return 'quarterly', f"{quarter.group(1)}Q{quarter.group(2)}"
+    return None
+
+
+def _normalize_date(value: str) -> str:
+    value = value.replace('-', '')
+    return f"{value[:4]}-{value[4:6]}-{value[6:8]}"
+
+
+def iter_index_entries(path: str) -> Iterator[Dict]:
+    """
+    Stream filings out of a master.idx or form.idx file (plain or gzipped)
+
+    Yields:
+        Dicts with cik, company_name, form_type, date_filed, filename
+        and accession_number
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    is_master = os.path.basename(path).startswith('master')
+
+    with opener(path, 'rt', encoding='latin-1') as f:
+        # Skip the header block, which ends with a line of dashes
+        for line in f:
+            if line.startswith('-----'):
+                break
+
+        for line in f:
+            line = line.rstrip('\n')
+            if not line.strip():
+                continue
+
+            if is_master:
+                parts = line.split('|')
+                if len(parts) != 5:
+                    continue
+                cik, name, form_type, date_filed, filename = parts
+            else:
+                match = _FORM_ROW.match(line)
+                if not match:
+                    continue
+                form_type, name, cik, date_filed, filename = match.group('form', 'name', 'cik', 'date', 'file')
+
+            yield {
+                'cik': cik.strip(),
+                'company_name': name.strip(),
+                'form_type': form_type.strip(),
+                'date_filed': _normalize_date(date_filed.strip()),
+                'filename': filename.strip(),
+                'accession_number': os.path.splitext(os.path.basename(filename.strip()))[0],
+            }
+
+
+class EdgarIndexDiscovery:
+    """Incremental discovery with a per-kind high-water mark stored in SQLite"""
+
+    def __init__(self, db_path: str, metrics=None):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.metrics = metrics or get_metrics()
+        self.setup_database()
+
+    def setup_database(self):
+        """Create discovery tables"""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS discovery_state (
+                kind TEXT PRIMARY KEY,
+                high_water_mark TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS discovered_filings (
+                accession_number TEXT NOT NULL,
+                cik TEXT NOT NULL,
+                company_name TEXT,
+                form_type TEXT NOT NULL,
+                date_filed TEXT,
+                filename TEXT,
+                index_file TEXT,
+                PRIMARY KEY (accession_number, form_type)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_discovered_cik ON discovered_filings(cik, form_type)
+        ''')
+        self.conn.commit()
+
+    def get_high_water_mark(self, kind: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT high_water_mark FROM discovery_state WHERE kind = ?", (kind,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_high_water_mark(self, kind: str, key: str):
+        with self.conn:
+            self.conn.execute(_SET_HIGH_WATER_MARK, (kind, key, datetime.now().isoformat()))
+
+    def pending_index_files(self, index_dir: str) -> List[str]:
+        """
+        Index files under `index_dir` newer than the high-water mark, oldest first
+
+        When a day has both master and form files, only master is used.
+        """
+        found: Dict[Tuple[str, str], str] = {}
+        for dirpath, _, filenames in os.walk(index_dir):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                key = index_file_key(path)
+                if key is None:
+                    continue
+                if key not in found or name.startswith('master'):
+                    found[key] = path
+
+        pending = []
+        marks = {}
+        for (kind, key), path in found.items():
+            if kind not in marks:
+                marks[kind] = self.get_high_water_mark(kind)
+            if marks[kind] is None or key > marks[kind]:
+                pending.append((kind, key, path))
+
+        return [path for _, _, path in sorted(pending)]
+
+    def process_index_file(self, path: str, vc_db=None) -> Dict:
+        """
+        Record matching filings from one index file and advance its high-water mark
+
+        The file is streamed in INDEX_BATCH_SIZE batches. Each batch upserts
+        its new filers into `vc_db`, then commits its filings; the mark is
+        set only after the last batch, so a crash part way through means the
+        file is processed again, skipping filers and filings already stored.
+
+        Args:
+            path: Index file
+            vc_db: Optional VCDatabase; filers not yet in it are added as investors
+
+        Returns:
+            {'filings': matched filings, 'new_filings': newly recorded,
+             'new_investors': investors added}
+        """
+        kind, key = index_file_key(path)
+        start = time.perf_counter()
+        entries = (entry for entry in iter_index_entries(path) if is_discovery_form(entry['form_type']))
+
+        insert = ("INSERT OR IGNORE INTO discovered_filings "
+                  "(accession_number, cik, company_name, form_type, date_filed, filename, index_file) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?)")
+        filings = new_filings = new_investors = 0
+        while True:
+            batch = list(itertools.islice(entries, INDEX_BATCH_SIZE))
+            if not batch:
+                break
+            filings += len(batch)
+
+            # Investors first: only filers vc_db doesn't have yet, so existing
+            # records are never touched by these name-only rows
+            if vc_db is not None:
+                filers = {}
+                for entry in batch:
+                    filers.setdefault(entry['cik'], entry)
+                known = vc_db.known_ciks(list(filers))
+                investors = [
+                    {
+                        'cik': cik,
+                        'name': entry['company_name'],
+                        'sec_url': f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={cik}",
+                        'scraped_at': datetime.now().isoformat(),
+                    }
+                    for cik, entry in filers.items() if cik not in known
+                ]
+                if investors:
+                    new_investors += vc_db.upsert_investors(investors)
+
+            with self.conn:
+                for entry in batch:
+                    cursor = self.conn.execute(insert, (
+                        entry['accession_number'], entry['cik'], entry['company_name'],
+                        entry['form_type'], entry['date_filed'], entry['filename'], os.path.basename(path),
+                    ))
+                    new_filings += cursor.rowcount
+
+        # After every batch's investors and filings are committed, so a crash never skips a file
+        with self.conn:
+            self.conn.execute(_SET_HIGH_WATER_MARK, (kind, key, datetime.now().isoformat()))
+
+        self.metrics.observe('discovery_index_file_seconds', time.perf_counter() - start, kind=kind)
+        self.metrics.inc('discovery_filings_total', new_filings)
+        return {'filings': filings, 'new_filings': new_filings, 'new_investors': new_investors}
+
+    def run(self, index_dir: str, vc_db=None) -> Dict:
+        """Process every pending index file under `index_dir`"""
+        totals = {'files': 0, 'filings': 0, 'new_filings': 0, 'new_investors': 0}
+        for path in self.pending_index_files(index_dir):
+            result = self.process_index_file(path, vc_db)
+            totals['files'] += 1
+            for field, value in result.items():
+                totals[field] += value
+            print(f"   {os.path.basename(path)}: {result['filings']} matching filings, "
+                  f"{result['new_investors']} new investors")
+        return totals
+
+    def close(self):
+        self.conn.close()
+
+
+def sync_daily_index(scraper, cache_dir: str, year: int, quarter: int,
+                     after: Optional[str] = None) -> List[str]:
+    """
+    Download daily master index files for one quarter into `cache_dir`
+
+    Files already in the cache, or not newer than `after` (YYYYMMDD), are skipped.
+
+    Returns:
+        Paths of newly downloaded files
+    """
+    listing_url = f"{scraper.base_url}/Archives/edgar/daily-index/{year}/QTR{quarter}/index.json"
+    response = scraper._get('daily_index_listing', listing_url, timeout=30)
+    if response.status_code != 200:
+        return []
+
+    target_dir = os.path.join(cache_dir, 'daily-index', str(year), f"QTR{quarter}")
+    os.makedirs(target_dir, exist_ok=True)
+
+    downloaded = []
+    for item in response.json().get('directory', {}).get('item', []):
+        name = item.get('name', '')
+        match = _DAILY_FILE.match(name)
+        if not match or match.group(1) != 'master' or (after and match.group(2) <= after):
+            continue
+
+        path = os.path.join(target_dir, name)
+        if os.path.exists(path):
+            scraper.metrics.inc('sec_cache_hits_total', endpoint='daily_index')
+            continue
+
+        file_response = scraper._get('daily_index', f"{listing_url.rsplit('/', 1)[0]}/{name}", timeout=60)
+        if file_response.status_code != 200:
+            continue
+        with open(f"{path}.part", 'wb') as f:
+            f.write(file_response.content)
+        os.replace(f"{path}.part", path)
+        downloaded.append(path)
+
+    return downloaded
+
+
+def main():
+    """Discover new filers from EDGAR index files"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description="Incremental filer discovery from EDGAR index files")
+    parser.add_argument('--db', required=True, help="SQLite database (investors and discovery state)")
+    parser.add_argument('--index-dir', default=os.path.join(script_dir, 'edgar_index'),
+                        help="Local directory or cache of form.idx/master.idx files")
+    parser.add_argument('--fetch', nargs=2, type=int, metavar=('YEAR', 'QUARTER'),
+                        help="First download new daily master index files for this quarter")
+    parser.add_argument('--no-investors', action='store_true',
+                        help="Only record filings; don't add new filers to the investors table")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🗂️  EDGAR INDEX DISCOVERY")
+    print("=" * 60)
+
+    discovery = EdgarIndexDiscovery(args.db)
+
+    if args.fetch:
+        from sec_scraper import SECFormADVScraper
+
+        downloaded = sync_daily_index(SECFormADVScraper(), args.index_dir, *args.fetch,
+                                      after=discovery.get_high_water_mark('daily'))
+        print(f"📡 Downloaded {len(downloaded)} new daily index files")
+
+    vc_db = None
+    if not args.no_investors:
+        from vc_db_manager import VCDatabase
+
+        vc_db = VCDatabase(args.db)
+
+    totals = discovery.run(args.index_dir, vc_db)
+    print(f"\n✅ {totals['files']} index files, {totals['filings']} matching filings "
+          f"({totals['new_filings']} new), {totals['new_investors']} new investors")
+    print(f"High-water marks: daily={discovery.get_high_water_mark('daily')}, "
+          f"quarterly={discovery.get_high_water_mark('quarterly')}")
+
+    discovery.close()
+    if vc_db is not None:
+        vc_db.close()
+
+
+if __name__ == "__main__":
+    main()
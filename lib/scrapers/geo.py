@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Geo Helpers
+Offline ZIP geocoding and great-circle distances for proximity search
+
+The bundled data/zip_centroids.csv covers every civilian US ZIP code and is
+regenerated with build_zip_centroids.py (from the zipcodes dataset or the
+Census ZCTA Gazetteer). Any CSV with zip, latitude and longitude columns
+(and optionally city and state) can be used instead.
+"""
+
+import csv
+import math
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+DEFAULT_ZIP_CENTROIDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'zip_centroids.csv')
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+KM_PER_MILE = 1.609344
+
+_ZIP = re.compile(r'\b([A-Z]{2})\s+(\d{5})(?:-\d{4})?\b')
+_CITY_STATE = re.compile(r'([^,]+),\s*([A-Z]{2})\b[^,]*$')
+
+LatLon = Tuple[float, float]
+
+
+class ZipGeocoder:
+    """Maps ZIP codes (or, failing that, city + state) to lat/lon centroids"""
+
+    def __init__(self, path: str = DEFAULT_ZIP_CENTROIDS):
+        self.path = path
+        self.zips: Dict[str, LatLon] = {}
+        self.cities: Dict[Tuple[str, str], LatLon] = {}
+
+        city_points: Dict[Tuple[str, str], list] = {}
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                point = (float(row['latitude']), float(row['longitude']))
+                self.zips[row['zip'].strip().zfill(5)] = point
+                if row.get('city') and row.get('state'):
+                    key = (row['city'].strip().lower(), row['state'].strip().upper())
+                    city_points.setdefault(key, []).append(point)
+
+        # A city's centroid is the mean of its ZIP centroids
+        for key, points in city_points.items():
+            self.cities[key] = (sum(p[0] for p in points) / len(points),
+                                sum(p[1] for p in points) / len(points))
+
+    def geocode_zip(self, zip_code: str) -> Optional[LatLon]:
+        return self.zips.get(str(zip_code).strip()[:5].zfill(5))
+
+    def geocode_address(self, address: Optional[str]) -> Optional[LatLon]:
+        """Geocode "..., City, ST 12345" or "City, ST" addresses"""
+        if not address or not isinstance(address, str):
+            return None
+
+        match = _ZIP.search(address)
+        if match:
+            point = self.geocode_zip(match.group(2))
+            if point:
+                return point
+
+        match = _CITY_STATE.search(address)
+        if match:
+            return self.cities.get((match.group(1).strip().lower(), match.group(2)))
+        return None
+
+
+_geocoder = None
+
+
+def get_geocoder() -> ZipGeocoder:
+    """Shared geocoder over the bundled ZIP centroid table"""
+    global _geocoder
+
+    if _geocoder is None:
+        _geocoder = ZipGeocoder()
+    return _geocoder
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> Optional[float]:
+    """Great-circle distance in kilometres"""
+    if lat2 is None or lon2 is None:
+        return None
+
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Lat/lon box containing every point within `radius_km`
+
+    Returns:
+        (min_lat, max_lat, min_lon, max_lon); near the poles or the
+        antimeridian the longitude range widens to the whole globe
+    """
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    min_lat = max(-90.0, lat - dlat)
+    max_lat = min(90.0, lat + dlat)
+
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat < 1e-6:
+        return min_lat, max_lat, -180.0, 180.0
+
+    dlon = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    if dlon >= 180.0 or lon - dlon < -180.0 or lon + dlon > 180.0:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, lon - dlon, lon + dlon
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+13F Holdings Ingester
+Stream 13F-HR information tables into a SQLite holdings table and answer
+"which investors hold issuer X"
+
+Run:
+    python holdings_13f.py fetch --db vc_intelligence.db --cik 1067983 --accession 0000950123-24-005482
+    python holdings_13f.py ingest --db vc_intelligence.db --cik 1067983 --accession ... infotable.xml
+    python holdings_13f.py holders --db vc_intelligence.db --issuer "APPLE"
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+import xml.etree.ElementTree as ET
+from datetime import date
+from typing import Dict, Iterator, List, Optional
+
+from metrics import get_metrics
+
+# Rows per executemany() call while bulk loading
+INSERT_BATCH_SIZE = 5000
+
+# 13F filings made on or after this date report values in whole dollars,
+# earlier ones in thousands
+VALUE_IN_DOLLARS_SINCE = date(2023, 1, 3)
+# Without a filing date: the last period whose reports were all filed before the
+# switch (Q4-2022 reports were filed in 2023, in dollars)
+LAST_PERIOD_IN_THOUSANDS = date(2022, 9, 30)
+
+HOLDING_COLUMNS = [
+    'investor_cik', 'accession_number', 'period_of_report', 'cusip', 'issuer_name',
+    'title_of_class', 'value_usd', 'shares', 'share_type', 'put_call',
+    'investment_discretion', 'voting_sole', 'voting_shared', 'voting_none',
+]
+
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def normalize_cusip(cusip: Optional[str]) -> Optional[str]:
+    """Uppercase 9-character CUSIP, or None if it isn't one"""
+    if not cusip:
+        return None
+    cleaned = re.sub(r'[^0-9A-Za-z]', '', cusip).upper()
+    # Some filers drop leading zeros
+    if 6 <= len(cleaned) < 9 and cleaned.isdigit():
+        cleaned = cleaned.zfill(9)
+    return cleaned if len(cleaned) == 9 else None
+
+
+def normalize_issuer(name: Optional[str]) -> str:
+    """Uppercase issuer name with collapsed whitespace"""
+    return ' '.join((name or '').upper().replace('.', ' ').replace(',', ' ').split())
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    cleaned = value.strip().replace(',', '')
+    if not cleaned:
+        return None
+    try:
+        return int(float(cleaned))
+    except ValueError:
+        return None
+
+
+def iter_information_table(source, value_multiplier: int = 1) -> Iterator[Dict]:
+    """
+    Stream holdings out of a 13F information table XML document
+
+    Elements are cleared as soon as each <infoTable> is read, so memory
+    stays flat however many rows the filing has.
+
+    Args:
+        source: File path or binary file object
+        value_multiplier: 1000 for filings that report values in thousands
+
+    Yields:
+        Normalized holding dicts (without investor/accession fields)
+    """
+    context = ET.iterparse(source, events=('start', 'end'))
+    root = None
+
+    for event, elem in context:
+        if root is None:
+            root = elem
+        if event != 'end' or _local(elem.tag) != 'infoTable':
+            continue
+
+        fields = {}
+        for child in elem.iter():
+            tag = _local(child.tag)
+            if child is not elem and child.text and child.text.strip():
+                fields[tag] = child.text.strip()
+
+        value = _to_int(fields.get('value'))
+        yield {
+            'cusip': normalize_cusip(fields.get('cusip')),
+            'issuer_name': normalize_issuer(fields.get('nameOfIssuer')),
+            'title_of_class': fields.get('titleOfClass'),
+            'value_usd': value * value_multiplier if value is not None else None,
+            'shares': _to_int(fields.get('sshPrnamt')),
+            'share_type': fields.get('sshPrnamtType'),
+            'put_call': fields.get('putCall'),
+            'investment_discretion': fields.get('investmentDiscretion'),
+            'voting_sole': _to_int(fields.get('Sole')),
+            'voting_shared': _to_int(fields.get('Shared')),
+            'voting_none': _to_int(fields.get('None')),
+        }
+
+        # Drop parsed rows so the tree never grows
+        elem.clear()
+        root.clear()
+
+
+class HoldingsStore:
+    """SQLite holdings table with investor and issuer indexes"""
+
+    def __init__(self, db_path: str, metrics=None):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.metrics = metrics or get_metrics()
+        self.setup_database()
+
+    def setup_database(self):
+        """Create the holdings table and indexes"""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS holdings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                investor_cik TEXT NOT NULL,
+                accession_number TEXT NOT NULL,
+                period_of_report TEXT,
+                cusip TEXT,
+                issuer_name TEXT,
+                title_of_class TEXT,
+                value_usd INTEGER,
+                shares INTEGER,
+                share_type TEXT,
+                put_call TEXT,
+                investment_discretion TEXT,
+                voting_sole INTEGER,
+                voting_shared INTEGER,
+                voting_none INTEGER
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_holdings_investor ON holdings(investor_cik, period_of_report)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_holdings_cusip ON holdings(cusip, investor_cik)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_holdings_issuer ON holdings(issuer_name, investor_cik)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_holdings_accession ON holdings(accession_number)
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def value_multiplier(period_of_report: Optional[str] = None, filing_date: Optional[str] = None) -> int:
+        """1000 for filings that reported values in thousands, else 1"""
+        if filing_date:
+            return 1000 if date.fromisoformat(filing_date[:10]) < VALUE_IN_DOLLARS_SINCE else 1
+        if period_of_report and date.fromisoformat(period_of_report) <= LAST_PERIOD_IN_THOUSANDS:
+            return 1000
+        return 1
+
+    def ingest(self, source, investor_cik: str, accession_number: str,
+               period_of_report: Optional[str] = None, filing_date: Optional[str] = None,
+               replace: bool = True) -> int:
+        """
+        Bulk-load one filing's information table, replacing any earlier load
+        of the same accession number
+
+        Args:
+            source: Information table XML path or binary file object
+            investor_cik: Filer CIK
+            accession_number: Filing accession number, e.g. 0000950123-24-005482
+            period_of_report: YYYY-MM-DD
+            filing_date: YYYY-MM-DD; filings before 2023-01-03 have their values
+                converted from thousands to dollars. Without it, reports for
+                periods up to 2022-09-30 are converted.
+            replace: False to append to rows already loaded for the accession,
+                for filings whose information table spans several files
+
+        Returns:
+            Number of holdings loaded
+        """
+        multiplier = self.value_multiplier(period_of_report, filing_date)
+
+        investor_cik = str(int(investor_cik))
+        start = time.perf_counter()
+        count = 0
+        batch = []
+
+        with self.conn:
+            if replace:
+                self.conn.execute("DELETE FROM holdings WHERE accession_number = ?", (accession_number,))
+
+            insert = (f"INSERT INTO holdings ({', '.join(HOLDING_COLUMNS)}) "
+                      f"VALUES ({', '.join('?' for _ in HOLDING_COLUMNS)})")
+            for holding in iter_information_table(source, multiplier):
+                holding['investor_cik'] = investor_cik
+                holding['accession_number'] = accession_number
+                holding['period_of_report'] = period_of_report
+                batch.append([holding[c] for c in HOLDING_COLUMNS])
+
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    self.conn.executemany(insert, batch)
+                    count += len(batch)
+                    batch = []
+
+            if batch:
+                self.conn.executemany(insert, batch)
+                count += len(batch)
+
+        self.metrics.observe('holdings_ingest_seconds', time.perf_counter() - start)
+        self.metrics.inc('holdings_rows_total', count)
+        return count
+
+    def investors_holding(self, issuer: Optional[str] = None, cusip: Optional[str] = None,
+                          period_of_report: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """
+        Investors holding an issuer, largest position first
+
+        Args:
+            issuer: Issuer name prefix, e.g. 'APPLE' (case-insensitive)
+            cusip: Exact CUSIP; takes precedence over issuer
+            period_of_report: Restrict to one reporting period
+            limit: Maximum investors to return
+
+        Returns:
+            Dicts with investor_cik, investor name (when the investors table
+            is in the same database), total value_usd and shares
+        """
+        params: List = []
+        if cusip:
+            where = "h.cusip = ?"
+            params.append(normalize_cusip(cusip))
+        elif issuer:
+            # Range scan on the normalized name keeps the prefix match on the index
+            prefix = normalize_issuer(issuer)
+            where = "h.issuer_name >= ? AND h.issuer_name < ?"
+            params.extend([prefix, prefix + '\uffff'])
+        else:
+            raise ValueError("Provide issuer or cusip")
+
+        if period_of_report:
+            where += " AND h.period_of_report = ?"
+            params.append(period_of_report)
+
+        query = f'''
+            SELECT h.investor_cik, SUM(h.value_usd) AS value_usd, SUM(h.shares) AS shares,
+                   MAX(h.period_of_report) AS period_of_report
+            FROM holdings h
+            WHERE {where}
+            GROUP BY h.investor_cik
+            ORDER BY value_usd DESC
+            LIMIT ?
+        '''
+
+        has_investors = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'investors'"
+        ).fetchone()
+        if has_investors:
+            # Names are looked up only for the top rows; investors.cik may be zero-padded
+            query = f'''
+                SELECT t.*, (
+                    SELECT i.name FROM investors i
+                    WHERE i.cik IN (t.investor_cik, printf('%010d', CAST(t.investor_cik AS INTEGER)))
+                    LIMIT 1
+                ) AS investor_name
+                FROM ({query}) t
+            '''
+        else:
+            query = f"SELECT t.*, NULL AS investor_name FROM ({query}) t"
+        params.append(limit)
+
+        with self.metrics.timer('holdings_query_seconds', query='investors_holding'):
+            rows = self.conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def holdings_for_investor(self, investor_cik: str, limit: int = 100) -> List[Dict]:
+        """An investor's largest positions in their latest filing"""
+        investor_cik = str(int(investor_cik))
+        rows = self.conn.execute('''
+            SELECT cusip, issuer_name, title_of_class, value_usd, shares, put_call, period_of_report
+            FROM holdings
+            WHERE investor_cik = ?
+              AND period_of_report IS (
+                  SELECT MAX(period_of_report) FROM holdings WHERE investor_cik = ?
+              )
+            ORDER BY value_usd DESC
+            LIMIT ?
+        ''', (investor_cik, investor_cik, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    """Ingest 13F information tables and query holders"""
+    parser = argparse.ArgumentParser(description="13F-HR holdings ingestion")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest = sub.add_parser('ingest', help="Load information table XML files")
+    ingest.add_argument('--db', required=True)
+    ingest.add_argument('--cik', required=True)
+    ingest.add_argument('--accession', required=True)
+    ingest.add_argument('--period', help="Period of report, YYYY-MM-DD")
+    ingest.add_argument('--filed', help="Filing date, YYYY-MM-DD (decides thousands vs dollars)")
+    ingest.add_argument('files', nargs='+', help="Information table files of one filing")
+
+    fetch = sub.add_parser('fetch', help="Download a filing's information table from EDGAR and load it")
+    fetch.add_argument('--db', required=True)
+    fetch.add_argument('--cik', required=True)
+    fetch.add_argument('--accession', required=True)
+    fetch.add_argument('--period', help="Period of report, YYYY-MM-DD")
+    fetch.add_argument('--filed', help="Filing date, YYYY-MM-DD (decides thousands vs dollars)")
+    fetch.add_argument('--cache-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '13f_cache'))
+
+    holders = sub.add_parser('holders', help="Which investors hold an issuer")
+    holders.add_argument('--db', required=True)
+    holders.add_argument('--issuer', help="Issuer name prefix")
+    holders.add_argument('--cusip')
+    holders.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args()
+    store = HoldingsStore(args.db)
+
+    if args.command == 'ingest':
+        # Files are parts of the same filing: replace its earlier load once, then append
+        for i, path in enumerate(args.files):
+            count = store.ingest(path, args.cik, args.accession, args.period, args.filed, replace=i == 0)
+            print(f"✅ Loaded {count:,} holdings from {path}")
+
+    elif args.command == 'fetch':
+        from sec_scraper import SECFormADVScraper
+
+        os.makedirs(args.cache_dir, exist_ok=True)
+        path = SECFormADVScraper().download_13f_information_table(args.cik, args.accession, args.cache_dir)
+        if path is None:
+            print(f"❌ No information table found for {args.accession}")
+        else:
+            count = store.ingest(path, args.cik, args.accession, args.period, args.filed)
+            print(f"✅ Loaded {count:,} holdings from {path}")
+
+    else:
+        start = time.perf_counter()
+        results = store.investors_holding(issuer=args.issuer, cusip=args.cusip, limit=args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"🔍 {len(results)} investors ({elapsed:.1f}ms)")
+        for row in results:
+            print(f"• {row['investor_name'] or row['investor_cik']}: "
+                  f"${(row['value_usd'] or 0):,} ({(row['shares'] or 0):,} shares)")
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
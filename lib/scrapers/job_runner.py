@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Scrape Job Runner
+Queue SEC scrape jobs, run them on a bounded worker pool and serve their
+progress over a small local HTTP API (polled by app/api/scrape)
+
+Run: python job_runner.py --port 8765 --workers 4
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from metrics import get_metrics
+from rate_limit import EDGAR_REQUESTS_PER_SECOND, RateLimiter
+
+JOB_SOURCES = ('sec_adv', 'sec_13f')
+MAX_JOB_LIMIT = 10_000
+
+# Default number of jobs per source allowed to run at once
+DEFAULT_SOURCE_LIMITS = {'sec_adv': 2, 'sec_13f': 1}
+
+# Results are written to SQLite in batches of this many investors
+RESULT_BATCH_SIZE = 25
+
+# How long shutdown waits for workers to reach a stopping point
+STOP_TIMEOUT_SECONDS = 30
+
+
+class JobStore:
+    """SQLite persistence for scrape jobs, their progress and results"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.setup_database()
+
+    def setup_database(self):
+        """Create job tables"""
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS scrape_jobs (
+                    id TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    job_limit INTEGER NOT NULL,
+                    priority INTEGER DEFAULT 0,
+                    status TEXT NOT NULL,
+                    progress INTEGER DEFAULT 0,
+                    total INTEGER,
+                    message TEXT,
+                    error TEXT,
+                    cancel_requested INTEGER DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+            ''')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS scrape_job_results (
+                    job_id TEXT NOT NULL REFERENCES scrape_jobs(id) ON DELETE CASCADE,
+                    seq INTEGER NOT NULL,
+                    cik TEXT,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                )
+            ''')
+            self.conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status ON scrape_jobs(status, priority)
+            ''')
+            self.conn.commit()
+
+    def create_job(self, source: str, limit: int, priority: int = 0) -> Dict:
+        job_id = f"job_{uuid.uuid4().hex[:16]}"
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO scrape_jobs (id, source, job_limit, priority, status, created_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, source, limit, priority, datetime.now().isoformat())
+            )
+            self.conn.commit()
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM scrape_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job_dict(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        query = "SELECT * FROM scrape_jobs"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [self._job_dict(row) for row in rows]
+
+    def update_job(self, job_id: str, **fields):
+        if not fields:
+            return
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        with self._lock:
+            self.conn.execute(f"UPDATE scrape_jobs SET {assignments} WHERE id = ?",
+                              [*fields.values(), job_id])
+            self.conn.commit()
+
+    def request_cancel(self, job_id: str) -> bool:
+        """Flag a queued or running job for cancellation; False if already finished"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE scrape_jobs SET cancel_requested = 1 "
+                "WHERE id = ? AND status IN ('queued', 'running')",
+                (job_id,)
+            )
+            # Queued jobs never start, so they are cancelled right away
+            self.conn.execute(
+                "UPDATE scrape_jobs SET status = 'cancelled', message = 'Cancelled', finished_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (datetime.now().isoformat(), job_id)
+            )
+            self.conn.commit()
+        return cursor.rowcount > 0
+
+    def add_results(self, job_id: str, start_seq: int, investors: List[Dict]):
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO scrape_job_results (job_id, seq, cik, data) VALUES (?, ?, ?, ?)",
+                [
+                    (job_id, start_seq + i, investor.get('cik'), json.dumps(investor, default=str))
+                    for i, investor in enumerate(investors)
+                ]
+            )
+            self.conn.commit()
+
+    def get_results(self, job_id: str, offset: int = 0, limit: int = 100) -> List[Dict]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT data FROM scrape_job_results WHERE job_id = ? ORDER BY seq LIMIT ? OFFSET ?",
+                (job_id, limit, offset)
+            ).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def pending_jobs(self) -> List[Dict]:
+        """
+        Jobs to put back on the queue at startup - queued jobs, plus jobs
+        left 'running' by a runner that exited mid-job
+        """
+        with self._lock:
+            self.conn.execute(
+                "UPDATE scrape_jobs SET status = 'queued', message = 'Requeued after restart' "
+                "WHERE status = 'running'"
+            )
+            self.conn.commit()
+        return self.list_jobs(status='queued', limit=MAX_JOB_LIMIT)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    @staticmethod
+    def _job_dict(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job['limit'] = job.pop('job_limit')
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        return job
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job when cancellation was requested"""
+
+
+class RunnerStopping(Exception):
+    """Raised inside a running job when the runner is shutting down"""
+
+
+class JobRunner:
+    """
+    Bounded worker pool over a priority queue of scrape jobs
+
+    Higher priority runs first (FIFO within a priority). A job only starts
+    when its source is under its concurrency limit, and every scraper shares
+    one RateLimiter so concurrent jobs stay inside a single EDGAR budget.
+    """
+
+    def __init__(self, store: JobStore, workers: int = 4,
+                 source_limits: Optional[Dict[str, int]] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 scraper_factory: Optional[Callable] = None):
+        self.store = store
+        self.workers = workers
+        self.source_limits = {**DEFAULT_SOURCE_LIMITS, **(source_limits or {})}
+        self.rate_limiter = rate_limiter or RateLimiter(EDGAR_REQUESTS_PER_SECOND)
+        self.scraper_factory = scraper_factory or self._default_scraper
+        self.metrics = get_metrics()
+
+        self._queue: List = []
+        self._seq = itertools.count()
+        self._running: Dict[str, int] = {source: 0 for source in JOB_SOURCES}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+
+    def _default_scraper(self):
+        from sec_scraper import SECFormADVScraper
+
+        return SECFormADVScraper(rate_limiter=self.rate_limiter)
+
+    def start(self) -> 'JobRunner':
+        for job in reversed(self.store.pending_jobs()):
+            self._enqueue(job)
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"scrape-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop taking new jobs and wait for workers to exit
+
+        Running jobs stop at their next investor and stay 'running', so the
+        next start() requeues them. `timeout` bounds the wait per worker,
+        e.g. for a job still in its discovery request.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def submit(self, source: str, limit: int, priority: int = 0) -> Dict:
+        """Validate and queue a job, returning its initial state"""
+        if source not in JOB_SOURCES:
+            raise ValueError(f"Unknown source {source!r}, expected one of {', '.join(JOB_SOURCES)}")
+        # bool is an int subclass; JSON true/false must not pass as 1/0
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 0 < limit <= MAX_JOB_LIMIT:
+            raise ValueError(f"limit must be an integer between 1 and {MAX_JOB_LIMIT}")
+        if isinstance(priority, bool) or not isinstance(priority, int):
+            raise ValueError("priority must be an integer")
+
+        job = self.store.create_job(source, limit, priority)
+        self._enqueue(job)
+        self.metrics.inc('scrape_jobs_total', source=source, status='queued')
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        cancelled = self.store.request_cancel(job_id)
+        with self._cond:
+            self._cond.notify_all()
+        return cancelled
+
+    def _enqueue(self, job: Dict):
+        with self._cond:
+            heapq.heappush(self._queue, (-job['priority'], next(self._seq), job['id'], job['source']))
+            self._cond.notify()
+
+    def _next_job(self) -> Optional[str]:
+        """Pop the best job whose source has a free slot (caller holds the lock)"""
+        deferred = []
+        chosen = None
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            source = entry[3]
+            if self._running[source] < self.source_limits.get(source, 1):
+                chosen = entry
+                break
+            deferred.append(entry)
+        for entry in deferred:
+            heapq.heappush(self._queue, entry)
+
+        if chosen is None:
+            return None
+        self._running[chosen[3]] += 1
+        return chosen[2]
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job_id = None
+                while not self._stopping:
+                    job_id = self._next_job()
+                    if job_id:
+                        break
+                    self._cond.wait()
+                if self._stopping and job_id is None:
+                    return
+
+            job = self.store.get_job(job_id)
+            try:
+                self._run_job(job)
+            finally:
+                with self._cond:
+                    self._running[job['source']] -= 1
+                    self._cond.notify_all()
+
+    def _run_job(self, job: Dict):
+        job_id = job['id']
+        if job['cancel_requested']:
+            self.store.update_job(job_id, status='cancelled', finished_at=datetime.now().isoformat())
+            return
+
+        self.store.update_job(job_id, status='running', started_at=datetime.now().isoformat(),
+                              progress=0, message='Discovering investors')
+        start = time.perf_counter()
+        status = 'failed'
+
+        try:
+            scraper = self.scraper_factory()
+            if job['source'] == 'sec_adv':
+                investors = scraper.get_investment_advisers(limit=job['limit'])
+            else:
+                investors = scraper.get_recent_13f_filers(limit=job['limit'])
+
+            self.store.update_job(job_id, total=len(investors), message='Enriching investor data')
+
+            batch = []
+            for i, investor in enumerate(investors):
+                if self._stopping:
+                    raise RunnerStopping()
+                if self.store.get_job(job_id)['cancel_requested']:
+                    raise JobCancelled()
+
+                batch.append(scraper.enrich_investor(investor))
+                if len(batch) >= RESULT_BATCH_SIZE or i == len(investors) - 1:
+                    self.store.add_results(job_id, i + 1 - len(batch), batch)
+                    self.store.update_job(job_id, progress=i + 1)
+                    batch = []
+
+            status = 'succeeded'
+            self.store.update_job(job_id, status=status, message=f"Scraped {len(investors)} investors",
+                                  finished_at=datetime.now().isoformat())
+        except RunnerStopping:
+            # Left 'running' on purpose: pending_jobs() requeues it on restart
+            status = 'interrupted'
+            self.store.update_job(job_id, message='Interrupted by shutdown')
+        except JobCancelled:
+            status = 'cancelled'
+            self.store.update_job(job_id, status=status, message='Cancelled',
+                                  finished_at=datetime.now().isoformat())
+        except Exception as e:
+            self.store.update_job(job_id, status=status, error=str(e),
+                                  finished_at=datetime.now().isoformat())
+        finally:
+            self.metrics.observe('scrape_job_seconds', time.perf_counter() - start,
+                                 source=job['source'], status=status)
+            self.metrics.inc('scrape_jobs_total', source=job['source'], status=status)
+
+
+class JobAPIHandler(BaseHTTPRequestHandler):
+    """
+    Local HTTP API
+
+        POST /jobs                      {"source": "sec_adv", "limit": 100, "priority": 0}
+        GET  /jobs                      recent jobs (?status=running)
+        GET  /jobs/<id>                 status and progress
+        GET  /jobs/<id>/results         scraped investors (?offset=0&limit=100)
+        POST /jobs/<id>/cancel
+        GET  /sources
+    """
+
+    runner: JobRunner = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [p for p in url.path.split('/') if p]
+
+        if parts == ['sources']:
+            self._send({'sources': list(JOB_SOURCES), 'limits': self.runner.source_limits})
+        elif parts == ['jobs']:
+            status = query.get('status', [None])[0]
+            self._send({'jobs': self.runner.store.list_jobs(status=status)})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self.runner.store.get_job(parts[1])
+            if job:
+                self._send(job)
+            else:
+                self._send({'error': 'Job not found'}, 404)
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'results':
+            if not self.runner.store.get_job(parts[1]):
+                self._send({'error': 'Job not found'}, 404)
+                return
+            try:
+                offset = int(query.get('offset', ['0'])[0])
+                limit = min(int(query.get('limit', ['100'])[0]), 1000)
+            except ValueError:
+                self._send({'error': 'offset and limit must be integers'}, 400)
+                return
+            results = self.runner.store.get_results(parts[1], offset, limit)
+            self._send({'job_id': parts[1], 'offset': offset, 'results': results})
+        else:
+            self._send({'error': 'Not found'}, 404)
+
+    def do_POST(self):
+        parts = [p for p in urlparse(self.path).path.split('/') if p]
+
+        if parts == ['jobs']:
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                job = self.runner.submit(
+                    body.get('source', 'sec_adv'),
+                    body.get('limit', 100),
+                    body.get('priority', 0),
+                )
+            except (ValueError, AttributeError) as e:
+                self._send({'error': str(e)}, 400)
+                return
+            self._send(job, 202)
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+            if self.runner.cancel(parts[1]):
+                self._send(self.runner.store.get_job(parts[1]))
+            else:
+                self._send({'error': 'Job not found or already finished'}, 409)
+        else:
+            self._send({'error': 'Not found'}, 404)
+
+    def _send(self, body: Dict, status: int = 200):
+        payload = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(runner: JobRunner, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """HTTP server bound to `runner`"""
+    handler = type('BoundJobAPIHandler', (JobAPIHandler,), {'runner': runner})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def _parse_source_limits(value: str) -> Dict[str, int]:
+    limits = {}
+    for part in value.split(','):
+        source, _, limit = part.partition('=')
+        if source.strip() not in JOB_SOURCES:
+            raise argparse.ArgumentTypeError(f"Unknown source {source!r}")
+        limits[source.strip()] = int(limit)
+    return limits
+
+
+def main():
+    """Run the job runner service"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description="Run SEC scrape jobs behind a local HTTP API")
+    parser.add_argument('--db', default=os.path.join(script_dir, 'scrape_jobs.db'),
+                        help="SQLite file for job state and results")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=EDGAR_REQUESTS_PER_SECOND,
+                        help="EDGAR requests per second shared by all jobs")
+    parser.add_argument('--source-limits', type=_parse_source_limits,
+                        help="Concurrent jobs per source, e.g. 'sec_adv=2,sec_13f=1'")
+    args = parser.parse_args()
+
+    store = JobStore(args.db)
+    runner = JobRunner(store, workers=args.workers, source_limits=args.source_limits,
+                       rate_limiter=RateLimiter(args.rate)).start()
+    server = make_server(runner, args.host, args.port)
+
+    print("=" * 60)
+    print("🛠️  SCRAPE JOB RUNNER")
+    print("=" * 60)
+    print(f"Listening on http://{args.host}:{args.port}")
+    print(f"Workers: {args.workers}, EDGAR budget: {args.rate}/s, per-source: {runner.source_limits}")
+    print(f"Job store: {args.db}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Shutting down...")
+    finally:
+        server.server_close()
+        runner.stop(timeout=STOP_TIMEOUT_SECONDS)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Metrics
+Counters, timers and latency histograms with pluggable sinks
+
+Disabled by default. Enable with the VC_METRICS environment variable:
+    VC_METRICS=prometheus:/var/lib/node_exporter/vc.prom
+    VC_METRICS=json:/tmp/vc_metrics.json
+    VC_METRICS=log
+or in code with configure_metrics().
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Histogram:
+    """Cumulative-bucket histogram, Prometheus style"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class Metrics:
+    """In-process metrics registry that flushes to a sink"""
+
+    enabled = True
+
+    def __init__(self, sink: 'MetricsSink', buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.sink = sink
+        self.buckets = buckets
+        self.counters: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a counter"""
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record a duration in a histogram"""
+        key = _key(name, labels)
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = _Histogram(self.buckets)
+            hist.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Time the enclosed block into a histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict:
+        """Plain-dict copy of every metric"""
+        with self._lock:
+            return {
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                'histograms': [
+                    {
+                        'name': name,
+                        'labels': dict(labels),
+                        'buckets': dict(zip(hist.buckets, hist.counts)),
+                        'sum': hist.sum,
+                        'count': hist.count,
+                    }
+                    for (name, labels), hist in sorted(self.histograms.items())
+                ],
+            }
+
+    def flush(self):
+        """Write the current values to the sink"""
+        self.sink.write(self.snapshot())
+
+
+class NullMetrics:
+    """Drop-in Metrics that records nothing"""
+
+    enabled = False
+
+    def inc(self, name: str, value: float = 1, **labels):
+        pass
+
+    def observe(self, name: str, seconds: float, **labels):
+        pass
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        yield
+
+    def snapshot(self) -> Dict:
+        return {'counters': [], 'histograms': []}
+
+    def flush(self):
+        pass
+
+
+class MetricsSink:
+    """Destination for metric snapshots"""
+
+    def write(self, snapshot: Dict):
+        raise NotImplementedError
+
+
+class PrometheusTextFileSink(MetricsSink):
+    """Writes the Prometheus text format, e.g. for node_exporter's textfile collector"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, snapshot: Dict):
+        lines: List[str] = []
+        typed = set()
+
+        for counter in snapshot['counters']:
+            if counter['name'] not in typed:
+                lines.append(f"# TYPE {counter['name']} counter")
+                typed.add(counter['name'])
+            lines.append(f"{counter['name']}{_labels(counter['labels'])} {counter['value']}")
+
+        for hist in snapshot['histograms']:
+            name = hist['name']
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            for bound, count in hist['buckets'].items():
+                lines.append(f"{name}_bucket{_labels(hist['labels'], le=bound)} {count}")
+            lines.append(f"{name}_bucket{_labels(hist['labels'], le='+Inf')} {hist['count']}")
+            lines.append(f"{name}_sum{_labels(hist['labels'])} {hist['sum']}")
+            lines.append(f"{name}_count{_labels(hist['labels'])} {hist['count']}")
+
+        _atomic_write(self.path, '\n'.join(lines) + '\n')
+
+
+class JSONSink(MetricsSink):
+    """Writes the snapshot as a JSON document"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, snapshot: Dict):
+        import json
+
+        _atomic_write(self.path, json.dumps(snapshot, indent=2, default=str))
+
+
+class LoggingSink(MetricsSink):
+    """Logs one line per metric"""
+
+    def __init__(self, log: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.log = log or logger
+        self.level = level
+
+    def write(self, snapshot: Dict):
+        for counter in snapshot['counters']:
+            self.log.log(self.level, "metric %s%s = %s",
+                         counter['name'], _labels(counter['labels']), counter['value'])
+        for hist in snapshot['histograms']:
+            avg = hist['sum'] / hist['count'] if hist['count'] else 0.0
+            self.log.log(self.level, "metric %s%s count=%d sum=%.4fs avg=%.4fs",
+                         hist['name'], _labels(hist['labels']), hist['count'], hist['sum'], avg)
+
+
+def _labels(labels: Dict, **extra) -> str:
+    items = {**labels, **{k: str(v) for k, v in extra.items()}}
+    if not items:
+        return ''
+    body = ','.join(f'{k}="{str(v)}"' for k, v in items.items())
+    return '{' + body + '}'
+
+
+def _atomic_write(path: str, text: str):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def sink_from_spec(spec: str) -> MetricsSink:
+    """Build a sink from 'prometheus:PATH', 'json:PATH' or 'log'"""
+    kind, _, target = spec.partition(':')
+    kind = kind.strip().lower()
+
+    if kind in ('prometheus', 'prom'):
+        if not target:
+            raise ValueError("prometheus metrics sink needs a file path")
+        return PrometheusTextFileSink(target)
+    if kind == 'json':
+        if not target:
+            raise ValueError("json metrics sink needs a file path")
+        return JSONSink(target)
+    if kind in ('log', 'logging'):
+        return LoggingSink()
+
+    raise ValueError(f"Unknown metrics sink: {spec!r}")
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def configure_metrics(sink=None):
+    """
+    Set the process-wide metrics registry
+
+    Args:
+        sink: A MetricsSink, a spec string accepted by sink_from_spec,
+            or None to disable metrics
+
+    Returns:
+        The new Metrics (or NullMetrics) instance
+    """
+    global _metrics
+
+    if isinstance(sink, str):
+        sink = sink_from_spec(sink)
+
+    with _metrics_lock:
+        _metrics = Metrics(sink) if sink is not None else NullMetrics()
+    return _metrics
+
+
+def get_metrics():
+    """Process-wide metrics registry, configured from VC_METRICS on first use"""
+    global _metrics
+
+    if _metrics is None:
+        spec = os.environ.get('VC_METRICS')
+        metrics = configure_metrics(spec or None)
+        if metrics.enabled:
+            atexit.register(metrics.flush)
+    return _metrics
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Profiling
+CPU profiles, per-phase peak memory and SQLite query plans for the CLI
+entry points (--profile)
+"""
+
+import io
+import os
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class Profiler:
+    """
+    Collects a cProfile run, optional stack samples, tracemalloc peaks per
+    phase and EXPLAIN QUERY PLAN output, then writes one report
+    """
+
+    enabled = True
+
+    def __init__(self, report_path: str, sample_interval: Optional[float] = None,
+                 top_n: int = 30):
+        """
+        Args:
+            report_path: Text report destination; the raw cProfile stats are
+                written next to it with a .prof extension
+            sample_interval: Seconds between stack samples, None to disable
+                the sampling profiler
+            top_n: Number of functions/stacks listed in each report section
+        """
+        self.report_path = report_path
+        self.sample_interval = sample_interval
+        self.top_n = top_n
+
+        self.phases: List[Dict] = []
+        self.query_plans: Dict[str, List[str]] = {}
+        self.samples: Counter = Counter()
+
+        # Imported here so entry points only load the profilers under --profile
+        import cProfile
+
+        self._profile = cProfile.Profile()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+        self._started_at = None
+        self._elapsed = 0.0
+
+    def start(self) -> 'Profiler':
+        self._started_at = time.perf_counter()
+        tracemalloc.start()
+        if self.sample_interval:
+            target = threading.get_ident()
+            self._sampler = threading.Thread(target=self._sample, args=(target,), daemon=True)
+            self._sampler.start()
+        self._profile.enable()
+        return self
+
+    def stop(self):
+        self._profile.disable()
+        self._elapsed = time.perf_counter() - self._started_at
+        if self._sampler:
+            self._stop_sampling.set()
+            self._sampler.join()
+        tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Record wall time and peak traced memory of the enclosed block"""
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.phases.append({
+                'name': name,
+                'seconds': time.perf_counter() - start,
+                'peak_bytes': peak,
+                'delta_bytes': current - before,
+            })
+
+    def explain(self, conn: sqlite3.Connection, sql: str, params=()):
+        """Capture EXPLAIN QUERY PLAN the first time a distinct SQL string is seen"""
+        if sql in self.query_plans:
+            return
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            self.query_plans[sql] = [row[-1] for row in rows]
+        except sqlite3.Error as e:
+            self.query_plans[sql] = [f"(could not explain: {e})"]
+
+    def _sample(self, thread_id: int):
+        """Sampling profiler: count the target thread's stacks at a fixed interval"""
+        while not self._stop_sampling.wait(self.sample_interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None and len(stack) < 8:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[' <- '.join(stack)] += 1
+
+    def write_report(self) -> str:
+        """Write the consolidated report and return its path"""
+        import pstats
+
+        prof_path = os.path.splitext(self.report_path)[0] + '.prof'
+        self._profile.dump_stats(prof_path)
+
+        out = io.StringIO()
+        out.write("=" * 70 + "\n")
+        out.write(f"PROFILE REPORT - {datetime.now().isoformat()}\n")
+        out.write(f"Command: {' '.join(sys.argv)}\n")
+        out.write(f"Total wall time: {self._elapsed:.3f}s\n")
+        out.write(f"cProfile data: {prof_path}\n")
+        out.write("=" * 70 + "\n")
+
+        out.write("\nPHASES\n" + "-" * 70 + "\n")
+        out.write(f"{'phase':<30}{'seconds':>12}{'peak MB':>14}{'retained MB':>14}\n")
+        for phase in self.phases:
+            out.write(f"{phase['name']:<30}{phase['seconds']:>12.3f}"
+                      f"{phase['peak_bytes'] / 1e6:>14.2f}{phase['delta_bytes'] / 1e6:>14.2f}\n")
+
+        out.write(f"\nCPU PROFILE (top {self.top_n} by cumulative time)\n" + "-" * 70 + "\n")
+        stats = pstats.Stats(self._profile, stream=out)
+        stats.sort_stats('cumulative').print_stats(self.top_n)
+
+        if self.sample_interval:
+            total = sum(self.samples.values())
+            out.write(f"\nSAMPLED STACKS ({total} samples every {self.sample_interval * 1000:.0f}ms)\n")
+            out.write("-" * 70 + "\n")
+            for stack, count in self.samples.most_common(self.top_n):
+                out.write(f"{count / total:>7.1%}  {stack}\n")
+
+        out.write("\nSQLITE QUERY PLANS\n" + "-" * 70 + "\n")
+        if not self.query_plans:
+            out.write("(no queries captured)\n")
+        for sql, plan in self.query_plans.items():
+            out.write(f"\n{' '.join(sql.split())}\n")
+            for line in plan:
+                out.write(f"    {line}\n")
+
+        with open(self.report_path, 'w') as f:
+            f.write(out.getvalue())
+        return self.report_path
+
+
+class NullProfiler:
+    """Drop-in Profiler that does nothing"""
+
+    enabled = False
+
+    def start(self) -> 'NullProfiler':
+        return self
+
+    def stop(self):
+        pass
+
+    @contextmanager
+    def phase(self, name: str):
+        yield
+
+    def explain(self, conn: sqlite3.Connection, sql: str, params=()):
+        pass
+
+    def write_report(self) -> Optional[str]:
+        return None
+
+
+def add_profile_arguments(parser):
+    """Add --profile/--profile-sample options to an argparse parser"""
+    parser.add_argument('--profile', nargs='?', const='', metavar='REPORT',
+                        help="Profile this run and write a report (default: <script>_profile.txt)")
+    parser.add_argument('--profile-sample', type=float, metavar='SECONDS',
+                        help="Also run the sampling profiler at this interval, e.g. 0.005")
+
+
+def profiler_from_args(args, script_path: str):
+    """Build a started Profiler from parsed arguments, or a NullProfiler"""
+    if args.profile is None:
+        return NullProfiler()
+
+    report_path = args.profile or os.path.join(
+        os.getcwd(),
+        f"{os.path.splitext(os.path.basename(script_path))[0]}_profile.txt"
+    )
+    return Profiler(report_path, sample_interval=args.profile_sample).start()
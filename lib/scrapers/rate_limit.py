@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting
+Shared request budget for SEC EDGAR (fair access policy: max 10 requests/second)
+"""
+
+import threading
+import time
+
+# Stay under EDGAR's published 10 requests/second ceiling
+EDGAR_REQUESTS_PER_SECOND = 8.0
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every scraper in a process"""
+
+    def __init__(self, rate: float = EDGAR_REQUESTS_PER_SECOND, burst: float = 1.0):
+        """
+        Args:
+            rate: Requests allowed per second
+            burst: Requests that may be made back to back before throttling
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request may be made; returns seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class SQLiteRateLimiter:
+    """
+    Token bucket stored in a SQLite file, shared by every process (or host,
+    on a shared filesystem with working locks) that opens the same file
+    """
+
+    def __init__(self, db_path: str, rate: float = EDGAR_REQUESTS_PER_SECOND,
+                 burst: float = 1.0, name: str = 'edgar'):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        import sqlite3
+
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.name = name
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                name TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        ''')
+        self.conn.execute(
+            "INSERT OR IGNORE INTO rate_limits (name, tokens, updated) VALUES (?, ?, ?)",
+            (name, self.capacity, time.time())
+        )
+
+    def acquire(self) -> float:
+        """Block until a request may be made; returns seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                # BEGIN IMMEDIATE takes the write lock up front, serialising
+                # the read-modify-write across processes
+                self.conn.execute("BEGIN IMMEDIATE")
+                try:
+                    tokens, updated = self.conn.execute(
+                        "SELECT tokens, updated FROM rate_limits WHERE name = ?", (self.name,)
+                    ).fetchone()
+                    # Wall-clock time, since monotonic clocks differ between processes
+                    now = time.time()
+                    tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+                    if tokens >= 1:
+                        tokens -= 1
+                        delay = 0.0
+                    else:
+                        delay = (1 - tokens) / self.rate
+                    self.conn.execute(
+                        "UPDATE rate_limits SET tokens = ?, updated = ? WHERE name = ?",
+                        (tokens, now, self.name)
+                    )
+                    self.conn.execute("COMMIT")
+                except Exception:
+                    self.conn.execute("ROLLBACK")
+                    raise
+
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def close(self):
+        self.conn.close()
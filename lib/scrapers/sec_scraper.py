@@ -4,37 +4,137 @@ SEC EDGAR Form ADV Scraper - Updated for 2026 API
 Extracts family office and VC firm data from SEC filings
 """
 
-import requests
+import argparse
 import json
+import logging
 import time
 import re
 import os
-from typing import Dict, List, Optional
-from datetime import datetime
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, List, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from data_quality import score_investors
+from metrics import get_metrics
+from profiling import add_profile_arguments, profiler_from_args
+
+# requests and pandas are imported where they are used, so classification
+# helpers and --help don't pay for them at startup
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+# Company names containing these look like investment firms
+INVESTMENT_KEYWORDS = [
+    'capital', 'venture', 'partners', 'investment', 'fund',
+    'equity', 'management', 'advisors', 'advisory', 'holdings',
+    'asset', 'wealth', 'family office', 'trust'
+]
+
+# Statuses worth retrying: EDGAR rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Upper bound on a server-requested Retry-After wait
+MAX_RETRY_AFTER_SECONDS = 120
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header, in either delay-seconds or
+    HTTP-date form; None when missing or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
 
 class SECFormADVScraper:
     """Scrape investment adviser data from SEC EDGAR"""
 
-    def __init__(self):
-        self.base_url = "https://www.sec.gov"
+    def __init__(self, base_url: str = "https://www.sec.gov",
+                 data_url: str = "https://data.sec.gov",
+                 max_retries: int = 2,
+                 metrics=None,
+                 rate_limiter=None):
+        """
+        Args:
+            base_url: www.sec.gov root (overridable for tests/benchmarks)
+            data_url: data.sec.gov root
+            max_retries: Retries for rate-limited or 5xx responses
+            metrics: Metrics registry, defaults to the process-wide one
+            rate_limiter: Shared RateLimiter; every request acquires from it
+                when set, so several scrapers can split one EDGAR budget
+        """
+        self.base_url = base_url.rstrip('/')
+        self.data_url = data_url.rstrip('/')
+        self.max_retries = max_retries
+        self.metrics = metrics or get_metrics()
+        self.rate_limiter = rate_limiter
         self.headers = {
             'User-Agent': 'VC Intelligence Research yoshi@example.com',
             'Accept': 'application/json, text/html, application/xml',
             'Accept-Encoding': 'gzip, deflate',
         }
+        import requests
+
         self.session = requests.Session()
         self.session.headers.update(self.headers)
 
+    def _get(self, endpoint: str, url: str, **kwargs) -> 'requests.Response':
+        """
+        GET with retries on rate limiting/server errors, recording latency
+        and status per endpoint
+        """
+        import requests
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire()
+                if waited:
+                    self.metrics.observe('sec_rate_limit_wait_seconds', waited, endpoint=endpoint)
+
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, **kwargs)
+            except requests.RequestException:
+                self.metrics.observe('sec_http_request_seconds', time.perf_counter() - start,
+                                     endpoint=endpoint, status='error')
+                self.metrics.inc('sec_http_requests_total', endpoint=endpoint, status='error')
+                raise
+
+            self.metrics.observe('sec_http_request_seconds', time.perf_counter() - start,
+                                 endpoint=endpoint, status=response.status_code)
+            self.metrics.inc('sec_http_requests_total', endpoint=endpoint, status=response.status_code)
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+
+            self.metrics.inc('sec_http_retries_total', endpoint=endpoint)
+            # Fall back to exponential backoff when the server gives no usable delay
+            delay = retry_after_seconds(response.headers.get('Retry-After'))
+            time.sleep(delay if delay else 0.5 * (2 ** attempt))
+
+        return response
+
     def get_company_tickers(self) -> List[Dict]:
         """Get list of all companies from SEC company tickers JSON"""
         print("📡 Fetching company list from SEC...")
 
         # SEC provides a JSON file with all company tickers
-        url = "https://www.sec.gov/files/company_tickers.json"
+        url = f"{self.base_url}/files/company_tickers.json"
 
         try:
-            response = self.session.get(url, timeout=30)
+            response = self._get('company_tickers', url, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -50,6 +150,7 @@ class SECFormADVScraper:
             return companies
 
         except Exception as e:
+            self.metrics.inc('sec_errors_total', endpoint='company_tickers')
             print(f"❌ Error fetching company list: {e}")
             return []
 
@@ -61,20 +162,11 @@ class SECFormADVScraper:
 
         companies = self.get_company_tickers()
 
-        # Keywords that indicate investment firms
-        investment_keywords = [
-            'capital', 'venture', 'partners', 'investment', 'fund',
-            'equity', 'management', 'advisors', 'advisory', 'holdings',
-            'asset', 'wealth', 'family office', 'trust'
-        ]
-
         advisers = []
 
         for company in companies:
-            name_lower = company['name'].lower()
-
             # Check if company name contains investment-related keywords
-            if any(kw in name_lower for kw in investment_keywords):
+            if self.is_investment_name(company['name']):
                 adviser = {
                     'cik': company['cik'],
                     'name': company['name'],
@@ -90,6 +182,12 @@ class SECFormADVScraper:
         print(f"✅ Found {len(advisers)} potential investment advisers")
         return advisers
 
+    @staticmethod
+    def is_investment_name(name: str) -> bool:
+        """True if a company name contains investment-firm keywords"""
+        name_lower = name.lower()
+        return any(kw in name_lower for kw in INVESTMENT_KEYWORDS)
+
     def get_recent_13f_filers(self, limit: int = 100) -> List[Dict]:
         """
         Get recent 13F filers (institutional investors with $100M+ AUM)
@@ -123,7 +221,7 @@ class SECFormADVScraper:
                 'output': 'atom'
             }
 
-            response = self.session.get(search_url, params=params, timeout=30)
+            response = self._get('browse_edgar_13f', search_url, params=params, timeout=30)
 
             if response.status_code == 200:
                 content = response.text
@@ -137,6 +235,9 @@ class SECFormADVScraper:
                     name_match = re.search(r'<title[^>]*>([^<]+)</title>', entry)
                     cik_match = re.search(r'CIK=(\d+)', entry)
 
+                    accession_match = re.search(r'accession-number=([\d-]+)', entry)
+                    updated_match = re.search(r'<updated>(\d{4}-\d{2}-\d{2})', entry)
+
                     if name_match and cik_match:
                         name = name_match.group(1).strip()
                         cik = cik_match.group(1)
@@ -149,6 +250,8 @@ class SECFormADVScraper:
                             'cik': cik,
                             'name': name.strip(),
                             'filing_type': '13F-HR',
+                            'accession_number': accession_match.group(1) if accession_match else None,
+                            'filing_date': updated_match.group(1) if updated_match else None,
                             'sec_url': f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={cik}&type=13F-HR",
                             'scraped_at': datetime.now().isoformat()
                         })
@@ -156,19 +259,61 @@ class SECFormADVScraper:
             print(f"✅ Found {len(holders)} 13F filers")
 
         except Exception as e:
+            self.metrics.inc('sec_errors_total', endpoint='browse_edgar_13f')
             print(f"❌ Error searching 13F holders: {e}")
 
         return holders
 
+    def download_13f_information_table(self, cik: str, accession_number: str,
+                                       dest_dir: str) -> Optional[str]:
+        """
+        Stream a 13F-HR filing's information table XML to disk
+
+        Large filings are written in chunks rather than held in memory.
+        Returns the local path, or None if the filing has no information table.
+        """
+        accession_path = accession_number.replace('-', '')
+        filing_url = f"{self.base_url}/Archives/edgar/data/{int(cik)}/{accession_path}"
+        dest_path = os.path.join(dest_dir, f"{accession_number}.xml")
+        if os.path.exists(dest_path):
+            self.metrics.inc('sec_cache_hits_total', endpoint='13f_information_table')
+            return dest_path
+
+        response = self._get('filing_index', f"{filing_url}/index.json", timeout=30)
+        if response.status_code != 200:
+            return None
+
+        items = response.json().get('directory', {}).get('item', [])
+        # The information table is the XML document that isn't the cover page
+        candidates = [
+            item['name'] for item in items
+            if item.get('name', '').lower().endswith('.xml')
+            and item['name'].lower() != 'primary_doc.xml'
+        ]
+        if not candidates:
+            return None
+
+        response = self._get('13f_information_table', f"{filing_url}/{candidates[0]}",
+                             timeout=120, stream=True)
+        if response.status_code != 200:
+            return None
+
+        tmp_path = f"{dest_path}.part"
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+        os.replace(tmp_path, dest_path)
+        return dest_path
+
     def get_adviser_details(self, cik: str) -> Optional[Dict]:
         """Get detailed company information from SEC"""
 
         # Use SEC's company facts API
         cik_padded = cik.zfill(10)
-        url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
+        url = f"{self.data_url}/submissions/CIK{cik_padded}.json"
 
         try:
-            response = self.session.get(url, timeout=15)
+            response = self._get('submissions', url, timeout=15)
 
             if response.status_code == 200:
                 data = response.json()
@@ -186,10 +331,29 @@ class SECFormADVScraper:
                 }
 
         except Exception as e:
-            pass
+            self.metrics.inc('sec_errors_total', endpoint='submissions')
+            logger.warning("Failed to fetch details for CIK %s: %s", cik, e)
 
         return None
 
+    def enrich_investor(self, investor: Dict) -> Dict:
+        """Add SEC details, investor type and state to a discovered investor in place"""
+        details = self.get_adviser_details(investor['cik'])
+        if details:
+            investor.update(details)
+
+        # Classify investor type
+        investor['type'] = self.classify_investor_type(
+            investor['name'],
+            investor.get('sic_description', '')
+        )
+
+        # Extract state
+        if not investor.get('state'):
+            investor['state'] = self.extract_state(investor.get('address', ''))
+
+        return investor
+
     def classify_investor_type(self, name: str, sic_desc: str = '') -> str:
         """Classify investor based on name and SIC patterns"""
         name_lower = name.lower()
@@ -242,12 +406,22 @@ class SECFormADVScraper:
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Scrape investment adviser data from SEC EDGAR")
+    parser.add_argument('--limit', type=int, default=150, help="Maximum advisers from the company registry")
+    parser.add_argument('--13f-limit', dest='limit_13f', type=int, default=100,
+                        help="Maximum recent 13F filers")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profiler = profiler_from_args(args, __file__)
+
     print("=" * 60)
     print("🚀 SEC EDGAR INVESTMENT INTELLIGENCE SCRAPER")
     print("=" * 60)
     print()
 
     scraper = SECFormADVScraper()
+    metrics = scraper.metrics
 
     # Collect data
     all_investors = []
@@ -256,7 +430,8 @@ def main():
     # Get investment advisers from company list
     print("\n📊 Phase 1: Investment Advisers from Company Registry")
     print("-" * 60)
-    advisers = scraper.get_investment_advisers(limit=150)
+    with metrics.timer('scrape_phase_seconds', phase='advisers'), profiler.phase('advisers'):
+        advisers = scraper.get_investment_advisers(limit=args.limit)
 
     for adviser in advisers:
         if adviser['cik'] not in seen_ciks:
@@ -266,7 +441,8 @@ def main():
     # Get 13F holders (institutional investors)
     print("\n📊 Phase 2: 13F Institutional Holders")
     print("-" * 60)
-    holders = scraper.get_recent_13f_filers(limit=100)
+    with metrics.timer('scrape_phase_seconds', phase='13f_filers'), profiler.phase('13f_filers'):
+        holders = scraper.get_recent_13f_filers(limit=args.limit_13f)
 
     for holder in holders:
         if holder['cik'] not in seen_ciks:
@@ -277,27 +453,20 @@ def main():
     print("\n📊 Phase 3: Enriching investor data...")
     print("-" * 60)
 
-    for i, investor in enumerate(all_investors):
-        if i % 20 == 0:
-            print(f"   Processing {i+1}/{len(all_investors)}...")
-            time.sleep(0.2)  # Rate limiting
-
-        details = scraper.get_adviser_details(investor['cik'])
-        if details:
-            investor.update(details)
+    with metrics.timer('scrape_phase_seconds', phase='enrich'), profiler.phase('enrich'):
+        for i, investor in enumerate(all_investors):
+            if i % 20 == 0:
+                print(f"   Processing {i+1}/{len(all_investors)}...")
+                time.sleep(0.2)  # Rate limiting
 
-        # Classify investor type
-        investor['type'] = scraper.classify_investor_type(
-            investor['name'],
-            investor.get('sic_description', '')
-        )
-
-        # Extract state
-        if not investor.get('state'):
-            investor['state'] = scraper.extract_state(investor.get('address', ''))
+            scraper.enrich_investor(investor)
 
     # Create DataFrame
+    import pandas as pd
+
     df = pd.DataFrame(all_investors)
+    if len(df) > 0:
+        df['data_quality_score'] = score_investors(df)
 
     # Summary statistics
     print("\n" + "=" * 60)
@@ -311,7 +480,8 @@ def main():
     # Save to CSV
     script_dir = os.path.dirname(os.path.abspath(__file__))
     output_file = os.path.join(script_dir, 'vc_database.csv')
-    df.to_csv(output_file, index=False)
+    with metrics.timer('scrape_phase_seconds', phase='save'), profiler.phase('save'):
+        df.to_csv(output_file, index=False)
     print(f"\n💾 Data saved to: {output_file}")
 
     # Show sample records
@@ -320,6 +490,13 @@ def main():
         print("-" * 60)
         print(df[['name', 'type', 'state']].head(10).to_string(index=False))
 
+    metrics.inc('scrape_investors_total', len(df))
+    metrics.flush()
+
+    if profiler.enabled:
+        profiler.stop()
+        print(f"\n🔬 Profile report: {profiler.write_report()}")
+
     return df
 
 if __name__ == "__main__":
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Shard Coordinator
+Split the SEC company universe into shards that any number of scraper
+workers (processes or hosts) claim through a SQLite lease table
+
+Run:
+    python shard_coordinator.py init --coord coord.db --shard-size 500
+    python shard_coordinator.py work --coord coord.db --store vc_intelligence.db --processes 4
+    python shard_coordinator.py status --coord coord.db
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from metrics import get_metrics
+from rate_limit import EDGAR_REQUESTS_PER_SECOND, SQLiteRateLimiter
+
+DEFAULT_SHARD_SIZE = 500
+DEFAULT_LEASE_SECONDS = 300
+# Claims per shard before it is marked failed instead of retried
+MAX_SHARD_ATTEMPTS = 3
+
+# Investors are merged into the store in batches of this many
+MERGE_BATCH_SIZE = 50
+
+
+class ShardCoordinator:
+    """Lease table over CIK shards, stored in a shared SQLite file"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # Autocommit mode, so each claim can run its own BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.setup_database()
+
+    def setup_database(self):
+        """Create the shard lease table"""
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS scrape_shards (
+                shard_id INTEGER PRIMARY KEY,
+                companies TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                lease_owner TEXT,
+                lease_expires REAL,
+                attempts INTEGER DEFAULT 0,
+                investors_written INTEGER DEFAULT 0,
+                completed_at TEXT
+            )
+        ''')
+        self.conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_scrape_shards_status ON scrape_shards(status, lease_expires)
+        ''')
+
+    def create_shards(self, companies: List[Dict], shard_size: int = DEFAULT_SHARD_SIZE,
+                      reset: bool = False) -> int:
+        """
+        Partition companies into shards ordered by CIK
+
+        Does nothing if shards already exist, unless `reset` is set.
+
+        Returns:
+            Number of shards in the table
+        """
+        existing = self.conn.execute("SELECT COUNT(*) FROM scrape_shards").fetchone()[0]
+        if existing and not reset:
+            return existing
+
+        ordered = sorted(companies, key=lambda c: int(c['cik']))
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM scrape_shards")
+            self.conn.executemany(
+                "INSERT INTO scrape_shards (shard_id, companies) VALUES (?, ?)",
+                [
+                    (i // shard_size, json.dumps(ordered[i:i + shard_size]))
+                    for i in range(0, len(ordered), shard_size)
+                ]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        return (len(ordered) + shard_size - 1) // shard_size
+
+    def claim_shard(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                    max_attempts: int = MAX_SHARD_ATTEMPTS) -> Optional[Dict]:
+        """
+        Lease the next pending shard, or one whose lease has expired
+
+        Expired shards that already used up `max_attempts` (their workers
+        keep dying) are marked failed rather than handed out again.
+
+        Returns:
+            {'shard_id', 'companies', 'attempts'} or None when nothing is left
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "UPDATE scrape_shards SET status = 'failed', lease_owner = NULL, lease_expires = NULL "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, max_attempts)
+            )
+            row = self.conn.execute(
+                "SELECT shard_id, companies, attempts FROM scrape_shards "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY shard_id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+
+            self.conn.execute(
+                "UPDATE scrape_shards SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE shard_id = ?",
+                (worker_id, now + lease_seconds, row['shard_id'])
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        return {
+            'shard_id': row['shard_id'],
+            'companies': json.loads(row['companies']),
+            'attempts': row['attempts'] + 1,
+        }
+
+    def heartbeat(self, shard_id: int, worker_id: str,
+                  lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a lease; False if the worker no longer owns the shard"""
+        cursor = self.conn.execute(
+            "UPDATE scrape_shards SET lease_expires = ? "
+            "WHERE shard_id = ? AND lease_owner = ? AND status = 'leased'",
+            (time.time() + lease_seconds, shard_id, worker_id)
+        )
+        return cursor.rowcount > 0
+
+    def complete_shard(self, shard_id: int, worker_id: str, investors_written: int) -> bool:
+        cursor = self.conn.execute(
+            "UPDATE scrape_shards SET status = 'done', lease_expires = NULL, investors_written = ?, "
+            "completed_at = ? WHERE shard_id = ? AND lease_owner = ? AND status = 'leased'",
+            (investors_written, datetime.now().isoformat(), shard_id, worker_id)
+        )
+        return cursor.rowcount > 0
+
+    def release_shard(self, shard_id: int, worker_id: str, max_attempts: int = MAX_SHARD_ATTEMPTS) -> str:
+        """
+        Give a shard back so another worker can retry it, or mark it failed
+        once it has been attempted `max_attempts` times
+
+        Returns:
+            The shard's new status, 'pending' or 'failed'
+        """
+        cursor = self.conn.execute(
+            "UPDATE scrape_shards SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_owner = NULL, lease_expires = NULL "
+            "WHERE shard_id = ? AND lease_owner = ? AND status = 'leased' RETURNING status",
+            (max_attempts, shard_id, worker_id)
+        )
+        row = cursor.fetchone()
+        return row[0] if row else 'pending'
+
+    def get_status(self) -> Dict:
+        now = time.time()
+        stats = {'pending': 0, 'leased': 0, 'expired': 0, 'done': 0, 'failed': 0}
+        for row in self.conn.execute(
+            "SELECT status, lease_expires < ? AS expired, COUNT(*) FROM scrape_shards GROUP BY 1, 2",
+            (now,)
+        ):
+            key = 'expired' if row[0] == 'leased' and row[1] else row[0]
+            stats[key] = stats.get(key, 0) + row[2]
+        stats['investors_written'] = self.conn.execute(
+            "SELECT COALESCE(SUM(investors_written), 0) FROM scrape_shards"
+        ).fetchone()[0]
+        stats['workers'] = [
+            row[0] for row in self.conn.execute(
+                "SELECT DISTINCT lease_owner FROM scrape_shards WHERE status = 'leased' AND lease_expires >= ?",
+                (now,)
+            )
+        ]
+        return stats
+
+    def close(self):
+        self.conn.close()
+
+
+class LeaseLost(Exception):
+    """Raised when a worker's lease was reclaimed by another worker"""
+
+
+class ShardWorker:
+    """Claims shards, enriches their companies and merges results by CIK"""
+
+    def __init__(self, coord_path: str, store_path: str, worker_id: Optional[str] = None,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 rate: float = EDGAR_REQUESTS_PER_SECOND, scraper_kwargs: Optional[Dict] = None,
+                 max_attempts: int = MAX_SHARD_ATTEMPTS):
+        from sec_scraper import SECFormADVScraper
+        from vc_db_manager import VCDatabase
+
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.coordinator = ShardCoordinator(coord_path)
+        self.store = VCDatabase(store_path)
+        # The bucket lives in the coordination file, so the limit is global
+        self.rate_limiter = SQLiteRateLimiter(coord_path, rate=rate)
+        self.scraper = SECFormADVScraper(rate_limiter=self.rate_limiter, **(scraper_kwargs or {}))
+        self.metrics = get_metrics()
+
+    def run(self, max_shards: Optional[int] = None) -> int:
+        """Process shards until none are left; returns the number completed"""
+        completed = 0
+        while max_shards is None or completed < max_shards:
+            shard = self.coordinator.claim_shard(self.worker_id, self.lease_seconds, self.max_attempts)
+            if shard is None:
+                break
+
+            print(f"   [{self.worker_id}] shard {shard['shard_id']}: "
+                  f"{len(shard['companies'])} companies (attempt {shard['attempts']})")
+            try:
+                with self.metrics.timer('shard_seconds', worker=self.worker_id):
+                    written = self.process_shard(shard)
+            except LeaseLost:
+                self.metrics.inc('shard_leases_lost_total')
+                print(f"   [{self.worker_id}] lost lease on shard {shard['shard_id']}")
+                continue
+            except Exception as e:
+                self.metrics.inc('shard_failures_total')
+                status = self.coordinator.release_shard(shard['shard_id'], self.worker_id, self.max_attempts)
+                if status == 'failed':
+                    print(f"   [{self.worker_id}] shard {shard['shard_id']} failed after "
+                          f"{shard['attempts']} attempts, giving up: {e}")
+                else:
+                    print(f"   [{self.worker_id}] shard {shard['shard_id']} failed: {e}")
+                continue
+
+            if self.coordinator.complete_shard(shard['shard_id'], self.worker_id, written):
+                completed += 1
+                self.metrics.inc('shards_completed_total')
+
+        return completed
+
+    def process_shard(self, shard: Dict) -> int:
+        """Enrich every company in a shard, heartbeating the lease as it goes"""
+        shard_id = shard['shard_id']
+        lost = threading.Event()
+        stop = threading.Event()
+
+        def keep_alive():
+            # Separate connection: sqlite3 connections stay on their own thread
+            coordinator = ShardCoordinator(self.coordinator.db_path)
+            try:
+                while not stop.wait(self.lease_seconds / 3):
+                    if not coordinator.heartbeat(shard_id, self.worker_id, self.lease_seconds):
+                        lost.set()
+                        return
+            finally:
+                coordinator.close()
+
+        heartbeat = threading.Thread(target=keep_alive, daemon=True)
+        heartbeat.start()
+
+        written = 0
+        batch = []
+        try:
+            for company in shard['companies']:
+                if lost.is_set():
+                    raise LeaseLost()
+
+                investor = {
+                    'cik': company['cik'],
+                    'name': company['name'],
+                    'sec_url': f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={company['cik']}",
+                    'scraped_at': datetime.now().isoformat(),
+                }
+                batch.append(self.scraper.enrich_investor(investor))
+
+                if len(batch) >= MERGE_BATCH_SIZE:
+                    written += self.store.upsert_investors(batch)
+                    batch = []
+
+            if lost.is_set():
+                raise LeaseLost()
+            written += self.store.upsert_investors(batch)
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        return written
+
+    def close(self):
+        self.coordinator.close()
+        self.store.close()
+        self.rate_limiter.close()
+
+
+def _work(coord_path: str, store_path: str, lease_seconds: float, rate: float,
+          scraper_kwargs: Optional[Dict] = None, max_attempts: int = MAX_SHARD_ATTEMPTS) -> int:
+    """Process entry point for one worker"""
+    worker = ShardWorker(coord_path, store_path, lease_seconds=lease_seconds, rate=rate,
+                         scraper_kwargs=scraper_kwargs, max_attempts=max_attempts)
+    try:
+        return worker.run()
+    finally:
+        worker.close()
+
+
+def main():
+    """Manage and run sharded scraping"""
+    parser = argparse.ArgumentParser(description="Sharded multi-worker SEC scraping")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    init = sub.add_parser('init', help="Partition the company universe into shards")
+    init.add_argument('--coord', required=True, help="Shared coordination SQLite file")
+    init.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    init.add_argument('--all-companies', action='store_true',
+                      help="Include every company, not just investment-firm names")
+    init.add_argument('--reset', action='store_true', help="Replace existing shards")
+
+    work = sub.add_parser('work', help="Claim and process shards until none are left")
+    work.add_argument('--coord', required=True)
+    work.add_argument('--store', required=True, help="SQLite investors database to merge into")
+    work.add_argument('--processes', type=int, default=1, help="Worker processes on this host")
+    work.add_argument('--lease', type=float, default=DEFAULT_LEASE_SECONDS, help="Lease length in seconds")
+    work.add_argument('--rate', type=float, default=EDGAR_REQUESTS_PER_SECOND,
+                      help="EDGAR requests per second across all workers")
+    work.add_argument('--max-attempts', type=int, default=MAX_SHARD_ATTEMPTS,
+                      help="Attempts per shard before it is marked failed")
+
+    status = sub.add_parser('status', help="Show shard progress")
+    status.add_argument('--coord', required=True)
+
+    args = parser.parse_args()
+
+    if args.command == 'init':
+        from sec_scraper import SECFormADVScraper
+
+        companies = SECFormADVScraper().get_company_tickers()
+        if not args.all_companies:
+            companies = [c for c in companies if SECFormADVScraper.is_investment_name(c['name'])]
+        coordinator = ShardCoordinator(args.coord)
+        count = coordinator.create_shards(companies, args.shard_size, reset=args.reset)
+        coordinator.close()
+        print(f"✅ {count} shards covering {len(companies)} companies in {args.coord}")
+
+    elif args.command == 'work':
+        print(f"🚀 Starting {args.processes} worker(s), {args.rate}/s shared EDGAR budget")
+        if args.processes == 1:
+            completed = _work(args.coord, args.store, args.lease, args.rate, None, args.max_attempts)
+        else:
+            from multiprocessing import Pool
+
+            with Pool(args.processes) as pool:
+                completed = sum(pool.starmap(
+                    _work, [(args.coord, args.store, args.lease, args.rate, None, args.max_attempts)] * args.processes
+                ))
+        print(f"✅ Completed {completed} shard(s)")
+
+    else:
+        coordinator = ShardCoordinator(args.coord)
+        stats = coordinator.get_status()
+        coordinator.close()
+        print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Investor Similarity Index
+Hashed n-gram TF-IDF vectors over investor profile text, projected to a
+small dense embedding (LSA) and stored as a memory-mapped float32 matrix
+for top-k cosine similarity
+
+Files, next to the database by default:
+    <path>.f32        N x dim float32 matrix, rows L2-normalized
+    <path>.meta.npz   investor rowid per matrix row, IDF weights, projection
+"""
+
+import os
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Profile fields and how much each contributes to similarity
+VECTOR_FIELDS = {
+    'sectors': 1.0,
+    'investment_focus': 0.8,
+    'stage_preference': 0.6,
+    'geography': 0.4,
+}
+
+# Hashed TF-IDF width, and the embedding width it is projected down to.
+# Scoring is memory-bound, so the embedding is kept narrow.
+HASH_FEATURES = 512
+DEFAULT_DIM = 32
+# Rows scored per matrix product; keeps the score buffer small for batched queries
+BLOCK_ROWS = 262_144
+BUILD_CHUNK_ROWS = 50_000
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+Row = Tuple[int, Dict[str, Optional[str]]]
+
+
+def _features(field: str, text: Optional[str]) -> List[str]:
+    """Whole comma-separated phrases plus word unigrams and bigrams"""
+    if not text or not isinstance(text, str):
+        return []
+
+    features = []
+    for phrase in text.lower().split(','):
+        words = _WORD.findall(phrase)
+        if not words:
+            continue
+        features.append(f"{field}={' '.join(words)}")
+        features.extend(f"{field}:{word}" for word in words)
+        features.extend(f"{field}:{a}_{b}" for a, b in zip(words, words[1:]))
+    return features
+
+
+class VectorIndex:
+    """Top-k cosine similarity over a memory-mapped investor embedding matrix"""
+
+    def __init__(self, path: str, writable: bool = False):
+        self.path = path
+        self.writable = writable
+        meta = np.load(f"{path}.meta.npz")
+        self.ids = meta['ids']
+        self.idf = meta['idf']
+        self.projection = meta['projection']
+        self.doc_count = int(meta['doc_count'])
+        self.dim = self.projection.shape[1]
+        self.matrix = np.memmap(f"{path}.f32", dtype=np.float32, mode='r+' if writable else 'r',
+                                shape=(len(self.ids), self.dim))
+        self._hash_cache: Dict[str, Tuple[int, float]] = {}
+        self._index_positions()
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(f"{path}.f32") and os.path.exists(f"{path}.meta.npz")
+
+    @staticmethod
+    def remove(path: str):
+        for suffix in ('.f32', '.meta.npz'):
+            if os.path.exists(f"{path}{suffix}"):
+                os.remove(f"{path}{suffix}")
+
+    @classmethod
+    def build(cls, rows_factory, count: int, path: str, dim: int = DEFAULT_DIM) -> 'VectorIndex':
+        """
+        Build the index in two streaming passes over the investors
+
+        The first pass collects document frequencies and the Gram matrix of
+        the hashed term counts; its top eigenvectors, IDF-weighted, become the
+        projection. The second pass writes the projected, normalized vectors.
+
+        Args:
+            rows_factory: Callable returning a fresh iterator of (rowid, fields) rows
+            count: Number of rows the iterator yields
+            path: Index path prefix
+            dim: Embedding width
+        """
+        hasher = _Hasher(HASH_FEATURES)
+
+        doc_freq = np.zeros(HASH_FEATURES, dtype=np.int64)
+        gram = np.zeros((HASH_FEATURES, HASH_FEATURES), dtype=np.float64)
+        for chunk in _chunks(rows_factory(), BUILD_CHUNK_ROWS):
+            counts = hasher.counts(chunk)
+            doc_freq += np.count_nonzero(counts, axis=0)
+            gram += counts.T @ counts
+        idf = (np.log((1 + count) / (1 + doc_freq)) + 1).astype(np.float32)
+
+        # Eigenvectors of D G D for D = diag(idf) are the right singular
+        # vectors of the TF-IDF matrix
+        weighted = gram * np.outer(idf, idf)
+        _, eigenvectors = np.linalg.eigh(weighted)
+        projection = (idf[:, None] * eigenvectors[:, ::-1][:, :dim]).astype(np.float32)
+
+        ids = np.zeros(count, dtype=np.int64)
+        matrix = np.memmap(f"{path}.f32.tmp", dtype=np.float32, mode='w+', shape=(max(count, 1), dim))
+        position = 0
+        for chunk in _chunks(rows_factory(), BUILD_CHUNK_ROWS):
+            matrix[position:position + len(chunk)] = _embed(hasher.counts(chunk), projection)
+            ids[position:position + len(chunk)] = [rowid for rowid, _ in chunk]
+            position += len(chunk)
+        matrix.flush()
+        del matrix
+
+        np.savez(f"{path}.meta.tmp.npz", ids=ids, idf=idf, projection=projection, doc_count=count)
+        os.replace(f"{path}.f32.tmp", f"{path}.f32")
+        os.replace(f"{path}.meta.tmp.npz", f"{path}.meta.npz")
+        return cls(path)
+
+    def _index_positions(self):
+        """
+        Rows are built in rowid order and found by binary search; rows
+        appended by update() after the sorted prefix go in a dict
+        """
+        unsorted = np.flatnonzero(np.diff(self.ids) <= 0)
+        self._sorted_count = int(unsorted[0]) + 1 if len(unsorted) else len(self.ids)
+        self._positions: Dict[int, int] = {
+            int(rowid): i for i, rowid in enumerate(self.ids[self._sorted_count:], start=self._sorted_count)
+        }
+
+    def position(self, rowid: int) -> Optional[int]:
+        """Matrix row for an investor rowid"""
+        position = self._positions.get(int(rowid))
+        if position is not None:
+            return position
+        position = int(np.searchsorted(self.ids[:self._sorted_count], rowid))
+        if position < self._sorted_count and self.ids[position] == rowid:
+            return position
+        return None
+
+    def vector_for(self, rowid: int) -> Optional[np.ndarray]:
+        position = self.position(rowid)
+        return None if position is None else np.array(self.matrix[position])
+
+    def embed(self, fields: Dict[str, Optional[str]]) -> np.ndarray:
+        """Vector for a profile that isn't in the index, using the stored projection"""
+        return self._embed_rows([(0, fields)])[0]
+
+    def _embed_rows(self, rows: Sequence[Row]) -> np.ndarray:
+        return _embed(_Hasher(len(self.idf), self._hash_cache).counts(rows), self.projection)
+
+    def top_k(self, queries: np.ndarray, k: int = 10,
+              exclude: Optional[Sequence[Optional[int]]] = None) -> List[List[Tuple[int, float]]]:
+        """
+        Highest-cosine rows for each query vector
+
+        Args:
+            queries: (dim,) or (n, dim) array of L2-normalized vectors
+            k: Results per query
+            exclude: Per-query rowid to leave out (typically the query investor)
+
+        Returns:
+            Per query, a list of (rowid, similarity), most similar first
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        n_rows = len(self.ids)
+        want = min(k + 1, n_rows)
+        if want == 0:
+            return [[] for _ in queries]
+
+        # Best `want` candidates per block, merged at the end. Scores are
+        # laid out query-major so each partition runs over contiguous memory.
+        cand_scores = []
+        cand_positions = []
+        for start in range(0, n_rows, BLOCK_ROWS):
+            scores = queries @ self.matrix[start:start + BLOCK_ROWS].T
+            width = scores.shape[1]
+            take = min(want, width)
+            # Partition for the largest scores without negating a copy
+            top = np.argpartition(scores, width - take, axis=1)[:, width - take:]
+            cand_scores.append(np.take_along_axis(scores, top, axis=1))
+            cand_positions.append(top + start)
+        cand_scores = np.concatenate(cand_scores, axis=1)
+        cand_positions = np.concatenate(cand_positions, axis=1)
+
+        results = []
+        for q in range(len(queries)):
+            order = np.argsort(-cand_scores[q], kind='stable')
+            skip = exclude[q] if exclude is not None else None
+            hits = []
+            for i in order:
+                rowid = int(self.ids[cand_positions[q, i]])
+                if rowid == skip:
+                    continue
+                hits.append((rowid, float(cand_scores[q, i])))
+                if len(hits) == k:
+                    break
+            results.append(hits)
+        return results
+
+    def update(self, rows: Iterable[Row]):
+        """
+        Re-embed changed investors in place and append new ones
+
+        IDF weights and the projection stay as of the last build; rebuild
+        after large changes.
+        """
+        if not self.writable:
+            raise RuntimeError("VectorIndex was opened read-only")
+
+        rows = list(rows)
+        if not rows:
+            return
+        vectors = self._embed_rows(rows)
+
+        appended_ids = []
+        appended = []
+        for (rowid, _), vector in zip(rows, vectors):
+            position = self.position(rowid)
+            if position is None:
+                appended_ids.append(int(rowid))
+                appended.append(vector)
+            else:
+                self.matrix[position] = vector
+        self.matrix.flush()
+
+        if appended:
+            old_count = len(self.ids)
+            new_count = old_count + len(appended)
+            del self.matrix
+            with open(f"{self.path}.f32", 'r+b') as f:
+                f.truncate(new_count * self.dim * 4)
+            self.matrix = np.memmap(f"{self.path}.f32", dtype=np.float32, mode='r+',
+                                    shape=(new_count, self.dim))
+            self.matrix[old_count:] = np.array(appended)
+            self.matrix.flush()
+
+            self.ids = np.concatenate([self.ids, np.array(appended_ids, dtype=np.int64)])
+            self._index_positions()
+            np.savez(f"{self.path}.meta.tmp.npz", ids=self.ids, idf=self.idf,
+                     projection=self.projection, doc_count=self.doc_count)
+            os.replace(f"{self.path}.meta.tmp.npz", f"{self.path}.meta.npz")
+
+
+class _Hasher:
+    """Signed feature hashing with a per-feature cache"""
+
+    def __init__(self, dim: int, cache: Optional[Dict[str, Tuple[int, float]]] = None):
+        self.dim = dim
+        self.cache = cache if cache is not None else {}
+
+    def _hash(self, feature: str) -> Tuple[int, float]:
+        hashed = self.cache.get(feature)
+        if hashed is None:
+            # crc32 rather than hash(), which is salted per process
+            value = zlib.crc32(feature.encode('utf-8'))
+            hashed = self.cache[feature] = (value % self.dim, 1.0 if value & 0x80000000 else -1.0)
+        return hashed
+
+    def row_features(self, fields: Dict[str, Optional[str]]) -> Iterable[Tuple[int, float, float]]:
+        """(bucket, sign, field weight) for every feature in a row"""
+        for field, weight in VECTOR_FIELDS.items():
+            for feature in _features(field, fields.get(field)):
+                bucket, sign = self._hash(feature)
+                yield bucket, sign, weight
+
+    def counts(self, rows: Sequence[Row]) -> np.ndarray:
+        """Weighted, signed hashed term counts for a chunk of rows"""
+        row_index = []
+        buckets = []
+        values = []
+        for i, (_, fields) in enumerate(rows):
+            for bucket, sign, weight in self.row_features(fields):
+                row_index.append(i)
+                buckets.append(bucket)
+                values.append(sign * weight)
+
+        matrix = np.zeros((len(rows), self.dim), dtype=np.float32)
+        np.add.at(matrix, (np.array(row_index, dtype=np.int64), np.array(buckets, dtype=np.int64)),
+                  np.array(values, dtype=np.float32))
+        return matrix
+
+
+def _embed(counts: np.ndarray, projection: np.ndarray) -> np.ndarray:
+    """Project hashed counts and L2-normalize"""
+    vectors = counts @ projection
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _chunks(rows: Iterable[Row], size: int) -> Iterable[List[Row]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
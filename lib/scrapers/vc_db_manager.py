@@ -4,25 +4,170 @@ VC Database Manager
 Load CSV data into SQLite database and provide query interface
 """
 
+import argparse
+import json
+import os
 import sqlite3
-import pandas as pd
 import re
-from typing import List, Dict, Optional
+import time
+import uuid
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple, Union
 from datetime import datetime
 
+from data_quality import score_investors
+from geo import bounding_box, get_geocoder, haversine_km
+from metrics import get_metrics
+from profiling import NullProfiler, add_profile_arguments, profiler_from_args
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# AUM estimates like '150M+', '10B+', '$7T', '1,200M' bucketed by order of magnitude;
+# text that isn't a number followed by a unit suffix (e.g. 'Not disclosed') is Unknown
+AUM_BUCKETS = ['<100M', '100M-1B', '1B-10B', '10B-100B', '100B+', 'Unknown']
+_AUM_VALUE = "CAST(REPLACE(LTRIM(aum_estimate, '$'), ',', '') AS REAL)"
+# Lower bound of each bucket in $M, largest first
+_AUM_BOUNDS_M = [(100_000, '100B+'), (10_000, '10B-100B'), (1_000, '1B-10B'), (100, '100M-1B')]
+# Unit suffixes -> $M per unit
+_AUM_UNITS = [('Tt', 1_000_000), ('Bb', 1_000), ('Mm', 1), ('Kk', 0.001)]
+
+
+def _aum_unit(units: str) -> str:
+    """aum_estimate has a digit followed by one of `units` (optionally after a space)"""
+    return f"(aum_estimate GLOB '*[0-9][{units}]*' OR aum_estimate GLOB '*[0-9] [{units}]*')"
+
+
+def _aum_bucket_for_unit(millions: float) -> str:
+    """Bucket of _AUM_VALUE for a unit worth `millions` $M"""
+    whens = ' '.join(f"WHEN {_AUM_VALUE} >= {bound / millions:g} THEN '{bucket}'"
+                     for bound, bucket in _AUM_BOUNDS_M)
+    return f"CASE {whens} ELSE '<100M' END"
+
+
+AUM_BUCKET_SQL = "CASE\n    WHEN aum_estimate IS NULL OR NOT (aum_estimate GLOB '[0-9]*' OR aum_estimate GLOB '$[0-9]*') THEN 'Unknown'\n"
+AUM_BUCKET_SQL += ''.join(f"    WHEN {_aum_unit(units)} THEN {_aum_bucket_for_unit(millions)}\n"
+                          for units, millions in _AUM_UNITS)
+AUM_BUCKET_SQL += "    ELSE 'Unknown' END"
+
+FOCUS_TAGS = {'AI/ML': 'has_ai_focus', 'Music': 'has_music_focus', 'Fintech': 'has_fintech_focus'}
+
+# Facet name -> columns it groups by
+FACETS = {
+    'type': ['type'],
+    'state': ['state'],
+    'focus': list(FOCUS_TAGS.values()),
+    'aum_bucket': ['aum_bucket'],
+}
+_FACET_EXPRESSIONS = {'aum_bucket': AUM_BUCKET_SQL}
+
+# Queries per bitmask column in search_investors_many (SQLite integers are 64-bit)
+MASK_BITS = 62
+# Rows fetched per scan round in search_investors_many
+SCAN_ROUND_ROWS = 2000
+
+# Columns upsert_investors derives from the address; a new address that
+# doesn't parse keeps the stored values
+ADDRESS_DERIVED_COLUMNS = ('state', 'city', 'latitude', 'longitude')
+
+# Snapshots retained by load_snapshot for rollback
+SNAPSHOTS_KEPT = 3
+# Similarity index files stored next to a database or snapshot
+VECTOR_SUFFIXES = ('.vectors.f32', '.vectors.meta.npz')
+
+SEARCH_ARGUMENTS = ('investor_type', 'sectors', 'state', 'has_ai_focus', 'has_music_focus',
+                    'has_fintech_focus', 'near', 'radius_km', 'limit', 'facets', 'order_by')
+
+# search_investors order_by choices -> ORDER BY clause
+SEARCH_ORDERS = {'quality': 'data_quality_score DESC, investors.rowid DESC'}
+
+
+def normalize_cik(cik) -> Optional[str]:
+    """Canonical 10-digit zero-padded CIK ('1067983' and 1067983 -> '0001067983')"""
+    if cik is None:
+        return None
+    text = str(cik).strip()
+    return str(int(text)).zfill(10) if text.isdigit() else text
+
+
 class VCDatabase:
     """Manage VC intelligence database"""
     
-    def __init__(self, db_path: str = '/home/claude/vc_intelligence.db'):
-        """Initialize database connection"""
+    def __init__(self, db_path: str = '/home/claude/vc_intelligence.db', metrics=None, profiler=None,
+                 read_only: bool = False, vector_path: Optional[str] = None):
+        """
+        Initialize database connection
+        
+        Args:
+            db_path: SQLite database file
+            metrics: Metrics registry, defaults to the process-wide one
+            profiler: Profiler capturing query plans, if profiling
+            read_only: Query-only fast path - open an existing database
+                read-only and skip schema setup. Loading is not available.
+            vector_path: Similarity index path prefix, defaults to <db_path>.vectors
+                (of the current snapshot, when db_path is snapshot-managed)
+        """
         self.db_path = db_path
         self.conn = None
-        self.setup_database()
+        self.read_only = read_only
+        self._vector_path_arg = vector_path
+        self._vectors = None
+        self._resolve_target()
+        self.metrics = metrics or get_metrics()
+        self.profiler = profiler or NullProfiler()
+        if read_only:
+            self.connect_read_only()
+        else:
+            self.setup_database()
+    
+    def _resolve_target(self):
+        """Record which file db_path points at (snapshots swap the target)"""
+        self._target = os.path.realpath(self.db_path)
+        self.vector_path = self._vector_path_arg or f"{self._target}.vectors"
+    
+    def _reopen_if_swapped(self):
+        """Reconnect when a snapshot load or rollback repointed db_path"""
+        if not os.path.islink(self.db_path) or os.path.realpath(self.db_path) == self._target:
+            return
+        
+        old_conn = self.conn
+        self._vectors = None
+        self._resolve_target()
+        if self.read_only:
+            self.connect_read_only()
+        else:
+            self.setup_database()
+        old_conn.close()
+        self.metrics.inc('vcdb_snapshot_reopens_total')
+    
+    def connect_read_only(self):
+        """Open an existing database for queries only, without touching the schema"""
+        self.conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        self.conn.row_factory = sqlite3.Row
+        self._register_functions()
+    
+    def _register_functions(self):
+        """SQL functions used by queries"""
+        self.conn.create_function('haversine_km', 4, haversine_km, deterministic=True)
+    
+    def _execute(self, cursor: sqlite3.Cursor, query_name: str, sql: str, params=()) -> sqlite3.Cursor:
+        """Execute SQL, recording its timing under `query_name`"""
+        if self.profiler.enabled:
+            self.profiler.explain(self.conn, sql, params)
+        
+        if not self.metrics.enabled:
+            return cursor.execute(sql, params)
+        
+        start = time.perf_counter()
+        try:
+            return cursor.execute(sql, params)
+        finally:
+            self.metrics.observe('vcdb_query_seconds', time.perf_counter() - start, query=query_name)
     
     def setup_database(self):
         """Create database and tables"""
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row  # Return dict-like rows
+        self._register_functions()
         
         # Create tables
         cursor = self.conn.cursor()
@@ -44,6 +189,7 @@ class VCDatabase:
                 sec_url TEXT,
                 notable_investments TEXT,
                 decision_makers TEXT,
+                sic TEXT,
                 scraped_at TEXT,
                 
                 -- Parsed fields for filtering
@@ -51,10 +197,26 @@ class VCDatabase:
                 city TEXT,
                 has_ai_focus INTEGER DEFAULT 0,
                 has_music_focus INTEGER DEFAULT 0,
-                has_fintech_focus INTEGER DEFAULT 0
+                has_fintech_focus INTEGER DEFAULT 0,
+                latitude REAL,
+                longitude REAL,
+                data_quality_score INTEGER DEFAULT 0
+            )
+        ''')
+        
+        self._create_indexes(cursor)
+        
+        # Point R*Tree over investor locations, keyed by investors.rowid
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS investor_geo USING rtree(
+                id, min_lat, max_lat, min_lon, max_lon
             )
         ''')
         
+        self.conn.commit()
+    
+    def _create_indexes(self, cursor: sqlite3.Cursor):
+        """Secondary indexes on investors (to_sql's replace drops them)"""
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_investor_type ON investors(type)
         ''')
@@ -67,38 +229,452 @@ class VCDatabase:
             CREATE INDEX IF NOT EXISTS idx_ai_focus ON investors(has_ai_focus)
         ''')
         
-        self.conn.commit()
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_cik ON investors(cik)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_name ON investors(name COLLATE NOCASE)
+        ''')
+        
+        # Score-ordered indexes, so order_by='quality' reads rows in order
+        # instead of sorting every match
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(investors)")}
+        if 'data_quality_score' in columns:
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_quality ON investors(data_quality_score)
+            ''')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_type_quality ON investors(type, data_quality_score)
+            ''')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_state_quality ON investors(state, data_quality_score)
+            ''')
     
     def load_from_csv(self, csv_path: str):
         """Load investor data from CSV"""
+        if self.read_only:
+            raise RuntimeError("Cannot load data into a read-only VCDatabase")
+        
+        # pandas is only needed for loading; query-only use never imports it
+        import pandas as pd
+        
         print(f"📂 Loading data from {csv_path}...")
         
-        df = pd.read_csv(csv_path)
+        with self.metrics.timer('vcdb_load_phase_seconds', phase='read_csv'):
+            df = pd.read_csv(csv_path)
+        
+        return self.load_frames([df])
+    
+    def load_frames(self, frames: Iterable['pd.DataFrame']) -> int:
+        """
+        Replace the investors table with rows from a stream of DataFrames
+        
+        Each chunk gets the same derived columns as load_from_csv (state,
+        city, location, focus flags, data_quality_score) and is appended as
+        it arrives, so datasets larger than memory can be loaded; indexes
+        are built once at the end.
+        
+        Returns:
+            Number of investors loaded
+        """
+        if self.read_only:
+            raise RuntimeError("Cannot load data into a read-only VCDatabase")
+        
+        # Row ids are about to change, so any similarity index is stale
+        self._drop_vector_index()
+        
+        loaded = 0
+        for df in frames:
+            self._derive_columns(df)
+            
+            # Load into database
+            with self.metrics.timer('vcdb_load_phase_seconds', phase='write'):
+                df.to_sql('investors', self.conn, if_exists='replace' if loaded == 0 else 'append', index=False)
+            loaded += len(df)
+        
+        with self.metrics.timer('vcdb_load_phase_seconds', phase='indexes'):
+            self._create_indexes(self.conn.cursor())
+            self.conn.commit()
+        
+        with self.metrics.timer('vcdb_load_phase_seconds', phase='geo_index'):
+            self._rebuild_geo_index()
+        
+        self.metrics.inc('vcdb_rows_loaded_total', loaded)
+        print(f"✅ Loaded {loaded} investors into database")
         
-        # Parse additional fields
+        return loaded
+    
+    def _derive_columns(self, df: 'pd.DataFrame'):
+        """Add parsed location, focus flag and quality score columns to df in place"""
+        parse_start = time.perf_counter()
+        geocoder = get_geocoder()
         for idx, row in df.iterrows():
             # Extract state from address
             state = self._extract_state(row.get('address', ''))
             city = self._extract_city(row.get('address', ''))
             
-            # Check sector focus
-            sectors = str(row.get('sectors', '')).lower()
-            has_ai = 1 if any(term in sectors for term in ['ai', 'ml', 'machine learning', 'artificial intelligence']) else 0
-            has_music = 1 if 'music' in sectors else 0
-            has_fintech = 1 if 'fintech' in sectors or 'finance' in sectors else 0
-            
             df.at[idx, 'state'] = state
             df.at[idx, 'city'] = city
-            df.at[idx, 'has_ai_focus'] = has_ai
-            df.at[idx, 'has_music_focus'] = has_music
-            df.at[idx, 'has_fintech_focus'] = has_fintech
+            
+            # Geocode from the offline ZIP centroid table
+            location = geocoder.geocode_address(row.get('address', ''))
+            df.at[idx, 'latitude'] = location[0] if location else None
+            df.at[idx, 'longitude'] = location[1] if location else None
+            
+            # Check sector focus
+            for flag, value in self._focus_flags(row.get('sectors', '')).items():
+                df.at[idx, flag] = value
+        self.metrics.observe('vcdb_load_phase_seconds', time.perf_counter() - parse_start, phase='parse')
         
-        # Load into database
-        df.to_sql('investors', self.conn, if_exists='replace', index=False)
+        with self.metrics.timer('vcdb_load_phase_seconds', phase='quality'):
+            df['data_quality_score'] = score_investors(df)
+    
+    def _snapshot_dir(self) -> str:
+        return f"{self.db_path}.snapshots"
+    
+    def load_snapshot(self, csv_path: str, keep: int = SNAPSHOTS_KEPT, build_vectors: bool = False) -> str:
+        """
+        Load a CSV into a new snapshot file and atomically swap it in
         
-        print(f"✅ Loaded {len(df)} investors into database")
+        The snapshot is built side by side (indexed and ANALYZEd), then
+        db_path - a symlink into <db_path>.snapshots/ - is repointed with a
+        single rename. Open readers keep querying the old file and move to
+        the new one on their next query. A regular database file already
+        at db_path is kept as the first snapshot, along with its similarity
+        index.
         
-        return len(df)
+        Args:
+            csv_path: Investor CSV
+            keep: Snapshots to retain for rollback, including the new one
+            build_vectors: Also build the similarity index for the snapshot
+        
+        Returns:
+            Path of the new snapshot
+        """
+        if self.read_only:
+            raise RuntimeError("Cannot load data into a read-only VCDatabase")
+        
+        snapshot_dir = self._snapshot_dir()
+        os.makedirs(snapshot_dir, exist_ok=True)
+        name = f"investors-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.db"
+        snapshot_path = os.path.join(snapshot_dir, name)
+        build_path = f"{snapshot_path}.partial"
+        
+        start = time.perf_counter()
+        try:
+            snapshot = VCDatabase(build_path, metrics=self.metrics, vector_path=f"{snapshot_path}.vectors")
+            snapshot.load_from_csv(csv_path)
+            snapshot.conn.execute("ANALYZE")
+            snapshot.conn.commit()
+            if build_vectors:
+                snapshot.build_vector_index()
+            snapshot.close()
+        except BaseException:
+            for suffix in ('', '-journal', '-wal', '-shm'):
+                if os.path.exists(f"{build_path}{suffix}"):
+                    os.remove(f"{build_path}{suffix}")
+            raise
+        os.replace(build_path, snapshot_path)
+        self.metrics.observe('vcdb_snapshot_build_seconds', time.perf_counter() - start)
+        
+        self._publish(snapshot_path)
+        self._prune_snapshots(keep)
+        print(f"📸 Snapshot {name} is live")
+        return snapshot_path
+    
+    def list_snapshots(self) -> List[Dict]:
+        """Retained snapshots, newest first"""
+        snapshot_dir = self._snapshot_dir()
+        if not os.path.isdir(snapshot_dir):
+            return []
+        
+        current = os.path.realpath(self.db_path)
+        snapshots = []
+        for name in sorted(os.listdir(snapshot_dir), reverse=True):
+            if not name.endswith('.db'):
+                continue
+            path = os.path.join(snapshot_dir, name)
+            snapshots.append({
+                'path': path,
+                'name': name,
+                'current': os.path.realpath(path) == current,
+                'size_bytes': os.path.getsize(path),
+            })
+        return snapshots
+    
+    def rollback(self, snapshot: Optional[str] = None) -> str:
+        """
+        Point db_path back at an older snapshot
+        
+        Args:
+            snapshot: Snapshot name or path; defaults to the one before the current
+        
+        Returns:
+            Path of the snapshot now live
+        """
+        snapshots = self.list_snapshots()
+        if snapshot is None:
+            current = [i for i, s in enumerate(snapshots) if s['current']]
+            older = snapshots[current[0] + 1:] if current else []
+            if not older:
+                raise RuntimeError("No older snapshot to roll back to")
+            target = older[0]['path']
+        else:
+            matches = [s['path'] for s in snapshots if snapshot in (s['name'], s['path'])]
+            if not matches:
+                raise ValueError(f"Unknown snapshot: {snapshot}")
+            target = matches[0]
+        
+        self._publish(target)
+        print(f"⏪ Rolled back to {os.path.basename(target)}")
+        return target
+    
+    def _publish(self, snapshot_path: str):
+        """Atomically repoint db_path at a snapshot"""
+        moved_vectors = []
+        if os.path.exists(self.db_path) and not os.path.islink(self.db_path) \
+                and self.conn.execute("SELECT EXISTS (SELECT 1 FROM investors)").fetchone()[0]:
+            # Keep a pre-snapshot database as the oldest snapshot (a hard link, no copy)
+            legacy_path = os.path.join(self._snapshot_dir(), "investors-00000000T000000000000.db")
+            if not os.path.exists(legacy_path):
+                os.link(self.db_path, legacy_path)
+            # Its default similarity index goes along, as <snapshot>.vectors.*
+            if self._vector_path_arg is None:
+                for suffix in VECTOR_SUFFIXES:
+                    if os.path.exists(f"{self.db_path}{suffix}") and not os.path.exists(f"{legacy_path}{suffix}"):
+                        os.link(f"{self.db_path}{suffix}", f"{legacy_path}{suffix}")
+                        moved_vectors.append(f"{self.db_path}{suffix}")
+        
+        # Unique per call, so concurrent publishers never share a temporary link
+        link_tmp = f"{self.db_path}.{os.getpid()}-{uuid.uuid4().hex}.swap"
+        os.symlink(os.path.relpath(snapshot_path, os.path.dirname(os.path.abspath(self.db_path))), link_tmp)
+        try:
+            os.replace(link_tmp, self.db_path)
+        except BaseException:
+            os.remove(link_tmp)
+            raise
+        # Readers of the legacy file now find its index next to the snapshot
+        for path in moved_vectors:
+            os.remove(path)
+        self._reopen_if_swapped()
+    
+    def _prune_snapshots(self, keep: int):
+        """Delete all but the newest `keep` snapshots (never the live one)"""
+        for snapshot in self.list_snapshots()[max(keep, 1):]:
+            if snapshot['current']:
+                continue
+            for suffix in ('',) + VECTOR_SUFFIXES:
+                if os.path.exists(f"{snapshot['path']}{suffix}"):
+                    os.remove(f"{snapshot['path']}{suffix}")
+    
+    def _rebuild_geo_index(self):
+        """Repopulate the investor_geo R*Tree from investors.latitude/longitude"""
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM investor_geo")
+        cursor.execute(
+            "INSERT INTO investor_geo (id, min_lat, max_lat, min_lon, max_lon) "
+            "SELECT rowid, latitude, latitude, longitude, longitude FROM investors "
+            "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+        )
+        self.conn.commit()
+    
+    def upsert_investors(self, investors: List[Dict]) -> int:
+        """
+        Insert or update investors keyed by CIK
+        
+        Safe to repeat with the same investors, so several scraper workers
+        can merge their results into one database. Only the fields an
+        investor dict carries are written (plus focus flags when it has
+        sectors, and state/location when it has an address), so partial
+        records never blank out stored data.
+        
+        Returns:
+            Number of investors written
+        """
+        if self.read_only:
+            raise RuntimeError("Cannot write to a read-only VCDatabase")
+        if not investors:
+            return 0
+        
+        cursor = self.conn.cursor()
+        self._execute(cursor, 'create_cik_index',
+                      "CREATE UNIQUE INDEX IF NOT EXISTS idx_investors_cik ON investors(cik)")
+        table_columns = [row[1] for row in self.conn.execute("PRAGMA table_info(investors)") if row[1] != 'id']
+        
+        rows = []
+        for investor in investors:
+            # EDGAR sources disagree on zero-padding; one form keeps the upsert keyed by CIK
+            record = {**investor, 'cik': normalize_cik(investor.get('cik'))}
+            if 'sectors' in investor:
+                record.update(self._focus_flags(investor['sectors']))
+            if record.get('address'):
+                if not record.get('state'):
+                    record['state'] = self._extract_state(record['address'])
+                if record.get('latitude') is None:
+                    location = get_geocoder().geocode_address(record['address'])
+                    if location:
+                        record['latitude'], record['longitude'] = location
+            rows.append(record)
+        
+        # Each row writes only its own columns; rows with the same columns share a statement
+        batches = {}
+        for row in rows:
+            batches.setdefault(tuple(c for c in table_columns if c in row), []).append(row)
+        
+        with self.metrics.timer('vcdb_query_seconds', query='upsert_investors'):
+            for columns, batch in batches.items():
+                updates = ', '.join(
+                    f"{c} = COALESCE(excluded.{c}, investors.{c})" if c in ADDRESS_DERIVED_COLUMNS
+                    else f"{c} = excluded.{c}"
+                    for c in columns if c != 'cik')
+                sql = (f"INSERT INTO investors ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+                       f"ON CONFLICT(cik) DO {f'UPDATE SET {updates}' if updates else 'NOTHING'}")
+                cursor.executemany(sql, [[row.get(c) for c in columns] for row in batch])
+            if 'latitude' in table_columns:
+                ciks = [(row.get('cik'),) for row in rows]
+                cursor.executemany(
+                    "DELETE FROM investor_geo WHERE id = (SELECT rowid FROM investors WHERE cik = ?)", ciks)
+                cursor.executemany(
+                    "INSERT INTO investor_geo (id, min_lat, max_lat, min_lon, max_lon) "
+                    "SELECT rowid, latitude, latitude, longitude, longitude FROM investors "
+                    "WHERE cik = ? AND latitude IS NOT NULL AND longitude IS NOT NULL", ciks)
+            if 'data_quality_score' in table_columns:
+                self._rescore(cursor, [row.get('cik') for row in rows])
+            self.conn.commit()
+        
+        if self._vectors is not None or self._vector_index_exists():
+            placeholders = ', '.join('?' for _ in rows)
+            self._vector_index(writable=True).update(
+                self._vector_rows(f"WHERE cik IN ({placeholders})", [row.get('cik') for row in rows]))
+        
+        return len(rows)
+    
+    def known_ciks(self, ciks: List[str]) -> Set[str]:
+        """
+        The subset of `ciks` already stored as investors
+        
+        Matches stored CIKs whether they are kept as integers or as text,
+        zero-padded to 10 digits (normalize_cik, as upsert_investors writes
+        them) or not.
+        """
+        if not ciks:
+            return set()
+        candidates = {str(cik) for cik in ciks} | {normalize_cik(cik) for cik in ciks}
+        rows = self.conn.execute(
+            "SELECT cik FROM investors WHERE cik IN (SELECT value FROM json_each(?))",
+            (json.dumps(sorted(candidates)),))
+        stored = {normalize_cik(row[0]) for row in rows}
+        return {cik for cik in ciks if normalize_cik(cik) in stored}
+    
+    def _rescore(self, cursor: sqlite3.Cursor, ciks: List[str]):
+        """Recompute data_quality_score for investors from their stored rows"""
+        import pandas as pd
+        
+        stored = pd.read_sql_query(
+            "SELECT rowid AS _rowid, * FROM investors WHERE cik IN (SELECT value FROM json_each(?))",
+            self.conn, params=(json.dumps(ciks),))
+        scores = score_investors(stored)
+        cursor.executemany("UPDATE investors SET data_quality_score = ? WHERE rowid = ?",
+                           zip(scores.tolist(), stored['_rowid'].tolist()))
+    
+    def _vector_index_exists(self) -> bool:
+        return os.path.exists(f"{self.vector_path}.f32")
+    
+    def _vector_rows(self, where: str = '', params=()):
+        """(rowid, profile fields) rows for the similarity index"""
+        cursor = self.conn.execute(
+            f"SELECT rowid, sectors, investment_focus, stage_preference, geography FROM investors {where} "
+            "ORDER BY rowid", params)
+        for row in cursor:
+            yield row[0], {key: row[key] for key in row.keys()[1:]}
+    
+    def _vector_index(self, writable: bool = False):
+        from similarity import VectorIndex
+        
+        if self._vectors is None or (writable and not self._vectors.writable):
+            if not VectorIndex.exists(self.vector_path):
+                raise RuntimeError(f"No similarity index at {self.vector_path}; run build_vector_index() first")
+            self._vectors = VectorIndex(self.vector_path, writable=writable and not self.read_only)
+        return self._vectors
+    
+    def _drop_vector_index(self):
+        from similarity import VectorIndex
+        
+        self._vectors = None
+        VectorIndex.remove(self.vector_path)
+    
+    def build_vector_index(self, dim: Optional[int] = None) -> int:
+        """
+        Build the "similar investors" index from sectors, investment focus,
+        stage preference and geography
+        
+        Returns:
+            Number of investors indexed
+        """
+        from similarity import DEFAULT_DIM, VectorIndex
+        
+        count = self.conn.execute("SELECT COUNT(*) FROM investors").fetchone()[0]
+        with self.metrics.timer('vcdb_load_phase_seconds', phase='vector_index'):
+            self._vectors = VectorIndex.build(self._vector_rows, count, self.vector_path, dim or DEFAULT_DIM)
+        return count
+    
+    def similar_investors(self, investor: str, k: int = 10) -> List[Dict]:
+        """
+        Investors with the most similar profile text
+        
+        Args:
+            investor: CIK or exact (case-insensitive) name
+            k: Number of results
+        
+        Returns:
+            Investor dictionaries with a `similarity` score in [-1, 1],
+            most similar first
+        """
+        self._reopen_if_swapped()
+        lookup = "SELECT rowid, sectors, investment_focus, stage_preference, geography FROM investors WHERE "
+        row = self.conn.execute(lookup + "cik IN (?, ?) LIMIT 1", (investor, normalize_cik(investor))).fetchone()
+        if row is None:
+            row = self.conn.execute(lookup + "name = ? COLLATE NOCASE LIMIT 1", (investor,)).fetchone()
+        if row is None:
+            return []
+        
+        index = self._vector_index()
+        with self.metrics.timer('vcdb_query_seconds', query='similar_investors'):
+            vector = index.vector_for(row[0])
+            if vector is None:
+                vector = index.embed({key: row[key] for key in row.keys()[1:]})
+            hits = index.top_k(vector, k, exclude=[row[0]])[0]
+        
+        return self._rows_by_rowid(hits, 'similarity')
+    
+    def _rows_by_rowid(self, hits: List[Tuple[int, float]], score_field: str) -> List[Dict]:
+        """Investor rows for (rowid, score) hits, in hit order"""
+        if not hits:
+            return []
+        placeholders = ', '.join('?' for _ in hits)
+        rows = {row[0]: dict(row) for row in self.conn.execute(
+            f"SELECT rowid AS _rowid, * FROM investors WHERE rowid IN ({placeholders})", [h[0] for h in hits])}
+        
+        results = []
+        for rowid, score in hits:
+            record = rows.get(rowid)
+            if record is not None:
+                record.pop('_rowid')
+                record[score_field] = score
+                results.append(record)
+        return results
+    
+    def _focus_flags(self, sectors) -> Dict[str, int]:
+        """Sector focus flags from a free-text sectors field"""
+        sectors = str(sectors or '').lower()
+        return {
+            'has_ai_focus': 1 if any(term in sectors for term in ['ai', 'ml', 'machine learning', 'artificial intelligence']) else 0,
+            'has_music_focus': 1 if 'music' in sectors else 0,
+            'has_fintech_focus': 1 if 'fintech' in sectors or 'finance' in sectors else 0,
+        }
     
     def _extract_state(self, address: str) -> Optional[str]:
         """Extract state code from address"""
@@ -146,7 +722,11 @@ class VCDatabase:
                         has_ai_focus: bool = False,
                         has_music_focus: bool = False,
                         has_fintech_focus: bool = False,
-                        limit: int = 100) -> List[Dict]:
+                        near: Optional[Union[Tuple[float, float], str]] = None,
+                        radius_km: Optional[float] = None,
+                        limit: int = 100,
+                        facets: Union[bool, List[str]] = False,
+                        order_by: Optional[str] = None) -> Union[List[Dict], Dict]:
         """
         Search for investors with filters
         
@@ -157,13 +737,72 @@ class VCDatabase:
             has_ai_focus: Filter for AI/ML investors
             has_music_focus: Filter for music tech investors
             has_fintech_focus: Filter for fintech investors
+            near: (lat, lon) or a ZIP code; requires radius_km
+            radius_km: Only investors within this distance of `near`
             limit: Maximum results to return
+            facets: True for every facet in FACETS, or a list of facet names,
+                to also count matches per type, state, focus tag and AUM bucket
+            order_by: 'quality' for highest data_quality_score first (ties
+                most recently loaded first); by default results come in load
+                order, or nearest first with `near`
         
         Returns:
-            List of investor dictionaries
+            List of investor dictionaries; with `near`, nearest first and
+            with a distance_km field. With `facets`, a dict with 'results',
+            'facets' ({facet: {value: count}}) and 'total' matches.
         """
-        query = "SELECT * FROM investors WHERE 1=1"
-        params = []
+        self._reopen_if_swapped()
+        if order_by is not None and order_by not in SEARCH_ORDERS:
+            raise ValueError(f"Unknown order_by: {order_by}; choose from {list(SEARCH_ORDERS)}")
+        query, params = self._search_query(investor_type, sectors, state, has_ai_focus,
+                                           has_music_focus, has_fintech_focus, near, radius_km)
+        base_query, base_params = query, list(params)
+        
+        if order_by is not None:
+            query += f" ORDER BY {SEARCH_ORDERS[order_by]}"
+        elif near is not None:
+            query += " ORDER BY distance_km"
+        else:
+            # Explicit, since the planner may pick a score-ordered index for the filters
+            query += " ORDER BY investors.rowid"
+        query += f" LIMIT {limit}"
+        
+        cursor = self.conn.cursor()
+        self._execute(cursor, 'search_investors', query, params)
+        
+        results = [dict(row) for row in cursor.fetchall()]
+        if not facets:
+            return results
+        
+        facet_counts, total = self._facet_counts(base_query, base_params,
+                                                 list(FACETS) if facets is True else list(facets))
+        return {'results': results, 'facets': facet_counts, 'total': total}
+    
+    def _search_query(self, investor_type, sectors, state, has_ai_focus, has_music_focus,
+                      has_fintech_focus, near, radius_km) -> Tuple[str, list]:
+        """SELECT ... WHERE for search_investors' filters, without ordering or limit"""
+        if near is None:
+            query = "SELECT * FROM investors WHERE 1=1"
+            params = []
+        else:
+            if radius_km is None:
+                raise ValueError("near= requires radius_km")
+            if isinstance(near, str):
+                point = get_geocoder().geocode_zip(near)
+                if point is None:
+                    raise ValueError(f"Unknown ZIP code: {near}")
+                near = point
+            lat, lon = near
+            
+            # R*Tree bounding-box probe, then exact haversine refinement. CROSS JOIN
+            # keeps the R*Tree as the outer loop even when another filter is indexed.
+            min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+            query = ("SELECT investors.*, haversine_km(?, ?, investors.latitude, investors.longitude) AS distance_km "
+                     "FROM investor_geo CROSS JOIN investors ON investors.rowid = investor_geo.id "
+                     "WHERE investor_geo.max_lat >= ? AND investor_geo.min_lat <= ? "
+                     "AND investor_geo.max_lon >= ? AND investor_geo.min_lon <= ? "
+                     "AND distance_km <= ?")
+            params = [lat, lon, min_lat, max_lat, min_lon, max_lon, radius_km]
         
         if investor_type:
             query += " AND type = ?"
@@ -187,13 +826,198 @@ class VCDatabase:
                 query += " AND (sectors LIKE ? OR investment_focus LIKE ?)"
                 params.extend([f'%{sector}%', f'%{sector}%'])
         
-        query += f" LIMIT {limit}"
+        return query, params
+    
+    def _facet_counts(self, base_query: str, params: list, facets: List[str]) -> Tuple[Dict, int]:
+        """
+        Facet counts over everything `base_query` matches, in one grouped pass
+        
+        Groups by the combination of requested facet columns (a few hundred
+        groups at most) and rolls each facet up from those groups.
+        """
+        unknown = [f for f in facets if f not in FACETS]
+        if unknown:
+            raise ValueError(f"Unknown facets: {unknown}; choose from {list(FACETS)}")
+        
+        columns = [column for facet in facets for column in FACETS[facet]]
+        select = ', '.join(f"{_FACET_EXPRESSIONS.get(c, c)} AS {c}" for c in columns)
+        group_sql = (f"SELECT {select}, COUNT(*) FROM ({base_query}) "
+                     f"GROUP BY {', '.join(columns)}")
         
         cursor = self.conn.cursor()
-        cursor.execute(query, params)
+        self._execute(cursor, 'search_facets', group_sql, params)
         
-        results = [dict(row) for row in cursor.fetchall()]
-        return results
+        counts = {facet: {} for facet in facets}
+        total = 0
+        for row in cursor.fetchall():
+            n = row[-1]
+            total += n
+            values = dict(zip(columns, row))
+            for facet in facets:
+                if facet == 'focus':
+                    for tag, flag in FOCUS_TAGS.items():
+                        if values[flag]:
+                            counts[facet][tag] = counts[facet].get(tag, 0) + n
+                else:
+                    value = values[facet]
+                    counts[facet][value] = counts[facet].get(value, 0) + n
+        
+        for facet, values in counts.items():
+            if facet == 'aum_bucket':
+                counts[facet] = {b: values[b] for b in AUM_BUCKETS if b in values}
+            else:
+                counts[facet] = dict(sorted(values.items(), key=lambda item: -item[1]))
+        return counts, total
+    
+    def search_investors_many(self, queries: List[Dict]) -> List[List[Dict]]:
+        """
+        Run a batch of search_investors filter specs together
+        
+        Identical specs run once. The rest are grouped by the equality
+        filters they share (state, type, focus flags); each group is a single
+        scan over its shared filter that evaluates every query's remaining
+        filters at once and stops when all of them are full. Radius, faceted
+        and ordered specs run individually.
+        
+        Args:
+            queries: search_investors keyword arguments, one dict per query
+        
+        Returns:
+            Per query, the same results search_investors would return
+        """
+        self._reopen_if_swapped()
+        unknown = {key for query in queries for key in query} - set(SEARCH_ARGUMENTS)
+        if unknown:
+            raise ValueError(f"Unknown search arguments: {sorted(unknown)}")
+        
+        # Deduplicate identical specs
+        specs = {}
+        for query in queries:
+            specs.setdefault(self._spec_key(query), query)
+        
+        results = {}
+        groups = {}
+        for key, query in specs.items():
+            if query.get('near') is not None or query.get('facets') or query.get('order_by'):
+                results[key] = self.search_investors(**query)
+                continue
+            
+            equalities = self._spec_equalities(query)
+            driver = next((item for item in equalities if item[0] in ('state', 'type')),
+                          equalities[0] if equalities else None)
+            groups.setdefault(driver, []).append(key)
+        
+        rowids = {}
+        for group in groups.values():
+            rowids.update(self._search_group([(key, specs[key]) for key in group]))
+        
+        rows = {}
+        wanted = sorted({rowid for ids in rowids.values() for rowid in ids})
+        if wanted:
+            cursor = self.conn.cursor()
+            self._execute(cursor, 'search_investors_many_rows',
+                          "SELECT rowid AS _rowid, * FROM investors WHERE rowid IN (SELECT value FROM json_each(?))",
+                          (json.dumps(wanted),))
+            for row in cursor.fetchall():
+                record = dict(row)
+                rows[record.pop('_rowid')] = record
+        
+        for key, ids in rowids.items():
+            results[key] = [dict(rows[rowid]) for rowid in ids]
+        
+        batch = []
+        for query in queries:
+            result = results[self._spec_key(query)]
+            batch.append(list(result) if isinstance(result, list) else result)
+        return batch
+    
+    @staticmethod
+    def _spec_key(query: Dict) -> tuple:
+        """Hashable form of a search spec; specs that search the same way share a key"""
+        spec = {'limit': 100, **query}
+        return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in spec.items()
+                            if v is not None and v is not False and v != []))
+    
+    @staticmethod
+    def _spec_equalities(query: Dict) -> List[Tuple[str, object]]:
+        """(column, value) equality filters of a search spec"""
+        equalities = []
+        if query.get('state'):
+            equalities.append(('state', query['state']))
+        if query.get('investor_type'):
+            equalities.append(('type', query['investor_type']))
+        for flag in ('has_ai_focus', 'has_music_focus', 'has_fintech_focus'):
+            if query.get(flag):
+                equalities.append((flag, 1))
+        return equalities
+    
+    def _search_group(self, group: List[Tuple[tuple, Dict]]) -> Dict[tuple, List[int]]:
+        """Matching rowids for queries sharing a driving filter, in one scan"""
+        shared = set(self._spec_equalities(group[0][1]))
+        for _, query in group[1:]:
+            shared &= set(self._spec_equalities(query))
+        shared = sorted(shared)
+        
+        residuals = []
+        residual_params = []
+        for _, query in group:
+            own = sorted(set(self._spec_equalities(query)) - set(shared))
+            conditions = [f"{column} = ?" for column, _ in own]
+            params = [value for _, value in own]
+            for sector in query.get('sectors') or []:
+                conditions.append("(sectors LIKE ? OR investment_focus LIKE ?)")
+                params.extend([f'%{sector}%', f'%{sector}%'])
+            residuals.append(' AND '.join(conditions) or '1')
+            residual_params.append(params)
+        
+        limits = [query.get('limit', 100) for _, query in group]
+        matches = [[] for _ in group]
+        open_queries = [i for i, limit in enumerate(limits) if limit > 0]
+        last_rowid = None
+        
+        # Scan in rowid order, a round at a time; each round's SQL only
+        # looks for queries that still need rows
+        while open_queries:
+            where = [f"{column} = ?" for column, _ in shared]
+            params = [value for _, value in shared]
+            if last_rowid is not None:
+                where.append("rowid > ?")
+                params.append(last_rowid)
+            if all(residuals[i] != '1' for i in open_queries):
+                where.append('(' + ' OR '.join(f'({residuals[i]})' for i in open_queries) + ')')
+                params += [p for i in open_queries for p in residual_params[i]]
+            
+            # Which open queries each row matches, packed into integer
+            # bitmasks (IS 1 maps NULL comparisons to 0)
+            mask_columns = []
+            select_params = []
+            for chunk_start in range(0, len(open_queries), MASK_BITS):
+                chunk = open_queries[chunk_start:chunk_start + MASK_BITS]
+                mask_columns.append(' | '.join(f"((({residuals[i]}) IS 1) << {bit})" for bit, i in enumerate(chunk)))
+                select_params += [p for i in chunk for p in residual_params[i]]
+            sql = (f"SELECT rowid, {', '.join(mask_columns)} FROM investors "
+                   f"WHERE {' AND '.join(where) or '1=1'} ORDER BY rowid LIMIT {SCAN_ROUND_ROWS}")
+            
+            cursor = self.conn.cursor()
+            cursor.row_factory = None  # plain tuples; rows are only scanned here
+            self._execute(cursor, 'search_investors_many', sql, select_params + params)
+            rows = cursor.fetchall()
+            
+            for row in rows:
+                for chunk, mask in enumerate(row[1:]):
+                    while mask:
+                        bit = mask & -mask
+                        mask ^= bit
+                        matches[open_queries[chunk * MASK_BITS + bit.bit_length() - 1]].append(row[0])
+            
+            if len(rows) < SCAN_ROUND_ROWS:
+                break
+            last_rowid = rows[-1][0]
+            open_queries = [i for i in open_queries if len(matches[i]) < limits[i]]
+        
+        # A round can overshoot a query's limit
+        matches = [ids[:limit] for ids, limit in zip(matches, limits)]
+        return {key: ids for (key, _), ids in zip(group, matches)}
     
     def get_family_offices(self, min_aum: Optional[str] = None) -> List[Dict]:
         """Get all family offices"""
@@ -217,30 +1041,31 @@ class VCDatabase:
     
     def get_stats(self) -> Dict:
         """Get database statistics"""
+        self._reopen_if_swapped()
         cursor = self.conn.cursor()
         
         stats = {}
         
         # Total count
-        cursor.execute("SELECT COUNT(*) FROM investors")
+        self._execute(cursor, 'stats_total', "SELECT COUNT(*) FROM investors")
         stats['total_investors'] = cursor.fetchone()[0]
         
         # By type
-        cursor.execute("SELECT type, COUNT(*) FROM investors GROUP BY type")
+        self._execute(cursor, 'stats_by_type', "SELECT type, COUNT(*) FROM investors GROUP BY type")
         stats['by_type'] = {row[0]: row[1] for row in cursor.fetchall()}
         
         # By state
-        cursor.execute("SELECT state, COUNT(*) FROM investors WHERE state IS NOT NULL GROUP BY state ORDER BY COUNT(*) DESC LIMIT 10")
+        self._execute(cursor, 'stats_top_states', "SELECT state, COUNT(*) FROM investors WHERE state IS NOT NULL GROUP BY state ORDER BY COUNT(*) DESC LIMIT 10")
         stats['top_states'] = {row[0]: row[1] for row in cursor.fetchall()}
         
         # Focus areas
-        cursor.execute("SELECT COUNT(*) FROM investors WHERE has_ai_focus = 1")
+        self._execute(cursor, 'stats_ai', "SELECT COUNT(*) FROM investors WHERE has_ai_focus = 1")
         stats['ai_investors'] = cursor.fetchone()[0]
         
-        cursor.execute("SELECT COUNT(*) FROM investors WHERE has_music_focus = 1")
+        self._execute(cursor, 'stats_music', "SELECT COUNT(*) FROM investors WHERE has_music_focus = 1")
         stats['music_investors'] = cursor.fetchone()[0]
         
-        cursor.execute("SELECT COUNT(*) FROM investors WHERE has_fintech_focus = 1")
+        self._execute(cursor, 'stats_fintech', "SELECT COUNT(*) FROM investors WHERE has_fintech_focus = 1")
         stats['fintech_investors'] = cursor.fetchone()[0]
         
         return stats
@@ -252,22 +1077,50 @@ class VCDatabase:
 
 def main():
     """Demo the database system"""
+    parser = argparse.ArgumentParser(description="Load investor CSV data into SQLite and run example queries")
+    parser.add_argument('--db', default='/home/claude/vc_intelligence.db', help="SQLite database path")
+    parser.add_argument('--csv', default='/home/claude/vc_database_sample.csv', help="CSV file to load")
+    parser.add_argument('--snapshot', action='store_true',
+                        help="Load into a new snapshot and swap it in atomically")
+    parser.add_argument('--keep', type=int, default=SNAPSHOTS_KEPT, help="Snapshots to retain (with --snapshot)")
+    parser.add_argument('--rollback', nargs='?', const='', metavar='SNAPSHOT',
+                        help="Point the database back at the previous (or named) snapshot and exit")
+    parser.add_argument('--list-snapshots', action='store_true', help="List retained snapshots and exit")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.rollback is not None or args.list_snapshots:
+        db = VCDatabase(args.db)
+        if args.rollback is not None:
+            db.rollback(args.rollback or None)
+        for snapshot in db.list_snapshots():
+            marker = '→' if snapshot['current'] else ' '
+            print(f"{marker} {snapshot['name']}  {snapshot['size_bytes'] / 1e6:.1f}MB")
+        db.close()
+        return
+    
+    profiler = profiler_from_args(args, __file__)
+    
     print("=" * 70)
     print("🗄️  VC INTELLIGENCE DATABASE MANAGER")
     print("=" * 70)
     print()
     
     # Initialize database
-    db = VCDatabase()
+    db = VCDatabase(args.db, profiler=profiler)
     
     # Load sample data
-    csv_path = '/home/claude/vc_database_sample.csv'
-    db.load_from_csv(csv_path)
+    with profiler.phase('load_from_csv'):
+        if args.snapshot:
+            db.load_snapshot(args.csv, keep=args.keep)
+        else:
+            db.load_from_csv(args.csv)
     
     # Show stats
     print("\n📊 DATABASE STATISTICS")
     print("-" * 70)
-    stats = db.get_stats()
+    with profiler.phase('get_stats'):
+        stats = db.get_stats()
     print(f"Total Investors: {stats['total_investors']}")
     print("\nBy Type:")
     for inv_type, count in stats['by_type'].items():
@@ -285,7 +1138,8 @@ def main():
     
     print("\n1️⃣  Family Offices:")
     print("-" * 70)
-    family_offices = db.get_family_offices()
+    with profiler.phase('query_family_offices'):
+        family_offices = db.get_family_offices()
     for fo in family_offices[:3]:
         print(f"• {fo['name']}")
         print(f"  AUM: {fo['aum_estimate']}")
@@ -294,7 +1148,8 @@ def main():
     
     print("\n2️⃣  AI/ML Focused Investors:")
     print("-" * 70)
-    ai_investors = db.get_ai_investors()
+    with profiler.phase('query_ai_investors'):
+        ai_investors = db.get_ai_investors()
     for inv in ai_investors[:3]:
         print(f"• {inv['name']} ({inv['type']})")
         print(f"  Sectors: {inv['sectors']}")
@@ -302,13 +1157,26 @@ def main():
     
     print("\n3️⃣  California VCs:")
     print("-" * 70)
-    ca_vcs = db.search_investors(investor_type='Venture Capital', state='CA')
+    with profiler.phase('query_ca_vcs'):
+        ca_vcs = db.search_investors(investor_type='Venture Capital', state='CA')
     for vc in ca_vcs[:3]:
         print(f"• {vc['name']}")
         print(f"  Location: {vc['city']}, {vc['state']}")
         print(f"  Notable: {vc['notable_investments'][:100]}...")
         print()
     
+    if ca_vcs:
+        print(f"\n4️⃣  Similar to {ca_vcs[0]['name']}:")
+        print("-" * 70)
+        with profiler.phase('build_vector_index'):
+            db.build_vector_index()
+        with profiler.phase('query_similar'):
+            similar = db.similar_investors(ca_vcs[0]['cik'], k=3)
+        for inv in similar:
+            print(f"• {inv['name']} (similarity {inv['similarity']:.2f})")
+            print(f"  Sectors: {inv['sectors']}")
+            print()
+    
     # Save database info
     print("\n" + "=" * 70)
     print("💾 DATABASE SAVED")
@@ -322,6 +1190,10 @@ def main():
     print("  results = db.search_investors(has_ai_focus=True)")
     
     db.close()
+    
+    if profiler.enabled:
+        profiler.stop()
+        print(f"\n🔬 Profile report: {profiler.write_report()}")
 
 if __name__ == "__main__":
     main()
@@ -4,9 +4,18 @@ Generate sample VC and family office data
 This demonstrates the data structure for when you run the real scraper
 """
 
-import pandas as pd
-from datetime import datetime, timedelta
+import argparse
+import math
+import os
 import random
+import sys
+from datetime import datetime, timedelta
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'scrapers'))
 
 def generate_sample_data():
     """Generate realistic sample investor data"""
@@ -201,8 +210,434 @@ def generate_sample_data():
     
     return df
 
+# ---------------------------------------------------------------------------
+# Synthetic data for load testing
+# ---------------------------------------------------------------------------
+
+# Default share of each investor type in a synthetic dataset
+SYNTHETIC_TYPE_WEIGHTS = {
+    'Venture Capital': 0.30,
+    'Family Office': 0.20,
+    'Investment Company': 0.15,
+    'Asset Management': 0.12,
+    'Private Equity': 0.10,
+    'Hedge Fund': 0.08,
+    'Institutional Investor': 0.05,
+}
+
+# (city, state, zip, weight) - weights roughly follow where advisers cluster
+SYNTHETIC_LOCATIONS = [
+    ('New York', 'NY', '10020', 0.10),
+    ('New York', 'NY', '10111', 0.08),
+    ('San Francisco', 'CA', '94111', 0.08),
+    ('Menlo Park', 'CA', '94025', 0.06),
+    ('Palo Alto', 'CA', '94301', 0.04),
+    ('Los Angeles', 'CA', '90067', 0.04),
+    ('San Diego', 'CA', '92101', 0.01),
+    ('Boston', 'MA', '02116', 0.05),
+    ('Cambridge', 'MA', '02142', 0.02),
+    ('Greenwich', 'CT', '06830', 0.03),
+    ('Stamford', 'CT', '06901', 0.02),
+    ('Chicago', 'IL', '60606', 0.04),
+    ('Austin', 'TX', '78701', 0.03),
+    ('Round Rock', 'TX', '78664', 0.01),
+    ('Dallas', 'TX', '75201', 0.03),
+    ('Houston', 'TX', '77002', 0.02),
+    ('San Antonio', 'TX', '78205', 0.01),
+    ('Miami', 'FL', '33131', 0.03),
+    ('Palm Beach', 'FL', '33480', 0.02),
+    ('Seattle', 'WA', '98101', 0.02),
+    ('Denver', 'CO', '80202', 0.02),
+    ('Boulder', 'CO', '80302', 0.01),
+    ('Atlanta', 'GA', '30309', 0.02),
+    ('Washington', 'DC', '20006', 0.02),
+    ('Philadelphia', 'PA', '19103', 0.02),
+    ('Pittsburgh', 'PA', '15222', 0.01),
+    ('Minneapolis', 'MN', '55402', 0.01),
+    ('Nashville', 'TN', '37203', 0.01),
+    ('Salt Lake City', 'UT', '84111', 0.01),
+    ('Phoenix', 'AZ', '85004', 0.01),
+    ('Charlotte', 'NC', '28202', 0.01),
+    ('Raleigh', 'NC', '27601', 0.01),
+    ('Columbus', 'OH', '43215', 0.01),
+    ('Portland', 'OR', '97204', 0.01),
+    ('Jackson', 'WY', '83001', 0.01),
+    ('Omaha', 'NE', '68102', 0.01),
+    ('Detroit', 'MI', '48226', 0.005),
+    ('St. Louis', 'MO', '63101', 0.005),
+    ('Baltimore', 'MD', '21202', 0.005),
+    ('Wilmington', 'DE', '19801', 0.005),
+    ('Las Vegas', 'NV', '89101', 0.005),
+    ('Princeton', 'NJ', '08540', 0.005),
+]
+
+SYNTHETIC_SECTORS = [
+    'AI/ML', 'Fintech', 'Enterprise Software', 'SaaS', 'Consumer', 'Healthcare',
+    'Biotech', 'Climate', 'Crypto', 'Real Estate', 'Music', 'Entertainment',
+    'Education Tech', 'Cybersecurity', 'Robotics', 'Mobility', 'Insurance',
+    'Banking', 'Media', 'Gaming', 'Agriculture', 'Energy', 'Diversified',
+]
+
+SYNTHETIC_STAGES = [
+    'Pre-Seed', 'Seed', 'Series A', 'Series B', 'Series C', 'Growth',
+    'Late Stage', 'Public Markets',
+]
+
+SYNTHETIC_GEOGRAPHIES = [
+    'United States', 'North America', 'Global', 'Europe', 'Asia',
+    'Silicon Valley Focus', 'Latin America', 'Israel', 'India',
+]
+
+# Name parts; the suffix is chosen per type so classify_investor_type agrees
+_NAME_WORDS = [
+    'Summit', 'Harbor', 'Granite', 'Beacon', 'Cedar', 'Northstar', 'Meridian',
+    'Ironwood', 'Bluebird', 'Redwood', 'Atlas', 'Lighthouse', 'Crescent',
+    'Pinnacle', 'Evergreen', 'Silverline', 'Oakmont', 'Horizon', 'Sterling',
+    'Keystone', 'Juniper', 'Falcon', 'Willow', 'Aspen', 'Sequoia', 'Laurel',
+]
+_TYPE_SUFFIXES = {
+    'Venture Capital': ['Ventures', 'Venture Partners', 'Seed Fund'],
+    'Family Office': ['Family Office', 'Family Trust', 'Estate Partners'],
+    'Investment Company': ['Capital', 'Capital Partners', 'Investment Fund'],
+    'Asset Management': ['Asset Management', 'Wealth Advisory', 'Wealth'],
+    'Private Equity': ['Private Equity', 'Buyout Partners', 'Leveraged Capital'],
+    'Hedge Fund': ['Hedge Partners', 'Alternative Investments', 'Offshore Fund'],
+    'Institutional Investor': ['Institutional', 'Pension Group', 'Endowment'],
+}
+_STREETS = [
+    'Main Street', 'Park Avenue', 'Sand Hill Road', 'Market Street',
+    'Fifth Avenue', 'Congress Avenue', 'Boylston Street', 'Wacker Drive',
+    'Brickell Avenue', 'Peachtree Street', 'Pacific Avenue', 'Madison Avenue',
+]
+_TEXT_WORDS = [
+    'early', 'stage', 'growth', 'technology', 'platform', 'infrastructure',
+    'software', 'data', 'founders', 'portfolio', 'markets', 'global',
+    'consumer', 'enterprise', 'strategic', 'capital', 'impact', 'healthcare',
+    'fintech', 'ai', 'climate', 'music', 'network', 'operators', 'deep',
+    'tech', 'ventures', 'returns', 'long', 'term', 'partnerships', 'scale',
+]
+_PEOPLE = [
+    'Alex Chen', 'Maria Lopez', 'Sam Patel', 'Jordan Lee', 'Taylor Brooks',
+    'Priya Shah', 'Chris Morgan', 'Dana Kim', 'Robin Ellis', 'Jamie Ortiz',
+]
+_TITLES = ['CEO', 'CIO', 'Managing Partner', 'General Partner', 'Principal']
+
+SYNTHETIC_FORMATS = ('csv', 'parquet', 'sqlite')
+
+
+def _weighted_choices(weights: Dict[str, float]) -> Tuple[List[str], List[float]]:
+    """Split a {value: weight} mapping into cumulative weights for random.choices"""
+    values = list(weights.keys())
+    cum = []
+    total = 0.0
+    for value in values:
+        total += weights[value]
+        cum.append(total)
+    return values, cum
+
+
+def _format_aum(aum_millions: float) -> str:
+    """Format an AUM in millions the way the scraped data does ('150M+', '10B+')"""
+    if aum_millions >= 1_000_000:
+        return f"{int(aum_millions // 1_000_000)}T+"
+    if aum_millions >= 1000:
+        return f"{int(aum_millions // 1000)}B+"
+    return f"{max(1, int(aum_millions))}M+"
+
+
+def _words(rng: random.Random, length: int) -> str:
+    """Random lowercase prose of the given word count"""
+    return ' '.join(rng.choice(_TEXT_WORDS) for _ in range(length)).capitalize()
+
+
+def _synthetic_chunk(task: Tuple[int, int, int, dict]) -> pd.DataFrame:
+    """
+    Build one chunk of synthetic investors.
+
+    Every chunk is seeded from (seed, chunk start), so the output only depends
+    on the seed and chunk size - not on how many workers produced it.
+    """
+    start, count, seed, options = task
+    rng = random.Random(seed * 1_000_003 + start)
+
+    types, type_cum = _weighted_choices(options['type_weights'])
+    locations = options['locations']
+    loc_cum = []
+    total = 0.0
+    for loc in locations:
+        total += loc[3]
+        loc_cum.append(total)
+
+    min_sectors, max_sectors = options['sectors_per_investor']
+    min_words, max_words = options['text_words']
+    aum_mu = math.log(options['aum_median_millions'])
+    aum_sigma = options['aum_sigma']
+    missing_rate = options['missing_rate']
+    reference = options['reference_time']
+    max_age = options['max_age_days']
+
+    type_draws = rng.choices(types, cum_weights=type_cum, k=count)
+    loc_draws = rng.choices(locations, cum_weights=loc_cum, k=count)
+
+    rows = []
+    for offset in range(count):
+        i = start + offset
+        inv_type = type_draws[offset]
+        city, state, zip_code, _ = loc_draws[offset]
+        cik = f"{2_000_000 + i:010d}"
+        name = f"{rng.choice(_NAME_WORDS)} {rng.choice(_NAME_WORDS)} {rng.choice(_TYPE_SUFFIXES.get(inv_type, ['Capital']))}"
+        slug = name.lower().replace(' ', '')[:24]
+
+        sectors = rng.sample(SYNTHETIC_SECTORS, rng.randint(min_sectors, max_sectors))
+        stages = sorted(rng.sample(SYNTHETIC_STAGES, rng.randint(1, 3)), key=SYNTHETIC_STAGES.index)
+
+        has_website = rng.random() >= missing_rate
+        has_email = rng.random() >= missing_rate
+        has_street = rng.random() >= missing_rate
+
+        if has_street:
+            address = f"{rng.randint(1, 9999)} {rng.choice(_STREETS)}, {city}, {state} {zip_code}"
+        else:
+            address = f"{city}, {state}"
+
+        scraped_at = reference - timedelta(seconds=rng.randint(0, max_age * 86400))
+
+        rows.append({
+            'cik': cik,
+            'name': name,
+            'type': inv_type,
+            'address': address,
+            'aum_estimate': _format_aum(rng.lognormvariate(aum_mu, aum_sigma)),
+            'investment_focus': _words(rng, rng.randint(min_words, max_words)),
+            'stage_preference': ', '.join(stages),
+            'sectors': ', '.join(sectors),
+            'geography': rng.choice(SYNTHETIC_GEOGRAPHIES),
+            'website': f"{slug}-{i}.com" if has_website else None,
+            'contact_email': f"info@{slug}-{i}.com" if has_email else None,
+            'sec_url': f"https://www.sec.gov/cgi-bin/browse-edgar?CIK={cik}",
+            'notable_investments': _words(rng, rng.randint(min_words, max_words)),
+            'decision_makers': f"{rng.choice(_PEOPLE)} ({rng.choice(_TITLES)})",
+            'scraped_at': scraped_at.isoformat(),
+        })
+
+    return pd.DataFrame(rows)
+
+
+def iter_synthetic_investors(n: int,
+                             seed: int = 42,
+                             chunk_size: int = 100_000,
+                             workers: int = 1,
+                             type_weights: Optional[Dict[str, float]] = None,
+                             state_weights: Optional[Dict[str, float]] = None,
+                             sectors_per_investor: Tuple[int, int] = (1, 4),
+                             aum_median_millions: float = 500.0,
+                             aum_sigma: float = 1.5,
+                             text_words: Tuple[int, int] = (4, 12),
+                             missing_rate: float = 0.2,
+                             reference_time: Optional[datetime] = None,
+                             max_age_days: int = 365) -> Iterator[pd.DataFrame]:
+    """
+    Stream N synthetic investors as DataFrame chunks
+
+    Args:
+        n: Total number of investors to generate
+        seed: Seed for reproducible output
+        chunk_size: Rows per yielded DataFrame
+        workers: Number of processes generating chunks in parallel
+        type_weights: {investor type: weight}, defaults to SYNTHETIC_TYPE_WEIGHTS
+        state_weights: {state code: weight}, rescales SYNTHETIC_LOCATIONS per state
+        sectors_per_investor: (min, max) number of sectors per investor
+        aum_median_millions: Median of the log-normal AUM distribution
+        aum_sigma: Spread of the log-normal AUM distribution
+        text_words: (min, max) word count for free-text fields
+        missing_rate: Probability that website, email or street is missing
+        reference_time: Newest possible scraped_at (fixed by default so
+            output is reproducible)
+        max_age_days: Oldest scraped_at, in days before reference_time
+
+    Yields:
+        DataFrames with the same columns as vc_database_sample.csv
+    """
+    locations = SYNTHETIC_LOCATIONS
+    if state_weights:
+        per_state = {}
+        for loc in SYNTHETIC_LOCATIONS:
+            per_state[loc[1]] = per_state.get(loc[1], 0.0) + loc[3]
+        locations = [
+            (city, state, zip_code, weight / per_state[state] * state_weights[state])
+            for city, state, zip_code, weight in SYNTHETIC_LOCATIONS
+            if state_weights.get(state)
+        ]
+        if not locations:
+            raise ValueError("state_weights does not match any synthetic location")
+
+    options = {
+        'type_weights': type_weights or SYNTHETIC_TYPE_WEIGHTS,
+        'locations': locations,
+        'sectors_per_investor': sectors_per_investor,
+        'aum_median_millions': aum_median_millions,
+        'aum_sigma': aum_sigma,
+        'text_words': text_words,
+        'missing_rate': missing_rate,
+        'reference_time': reference_time or datetime(2026, 1, 1),
+        'max_age_days': max_age_days,
+    }
+
+    tasks = [
+        (start, min(chunk_size, n - start), seed, options)
+        for start in range(0, n, chunk_size)
+    ]
+
+    if workers <= 1:
+        for task in tasks:
+            yield _synthetic_chunk(task)
+        return
+
+    with Pool(workers) as pool:
+        for chunk in pool.imap(_synthetic_chunk, tasks):
+            yield chunk
+
+
+def write_synthetic_investors(n: int, output_file: str, fmt: str = 'csv', **kwargs) -> int:
+    """
+    Generate N synthetic investors and stream them to CSV, Parquet or SQLite
+
+    Extra keyword arguments are passed to iter_synthetic_investors.
+    SQLite output is loaded through VCDatabase, replacing any existing
+    investors, so it has the same schema, derived columns and indexes as a
+    database loaded from CSV.
+
+    Returns:
+        Number of rows written
+    """
+    if fmt not in SYNTHETIC_FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {SYNTHETIC_FORMATS}")
+
+    if fmt == 'sqlite':
+        from vc_db_manager import VCDatabase
+
+        def chunks():
+            generated = 0
+            for chunk in iter_synthetic_investors(n, **kwargs):
+                generated += len(chunk)
+                print(f"   Generated {generated:,}/{n:,}...")
+                yield chunk
+
+        db = VCDatabase(output_file)
+        try:
+            return db.load_frames(chunks())
+        finally:
+            db.close()
+
+    written = 0
+    parquet_writer = None
+
+    try:
+        for chunk in iter_synthetic_investors(n, **kwargs):
+            if fmt == 'csv':
+                chunk.to_csv(output_file, mode='w' if written == 0 else 'a',
+                             header=written == 0, index=False)
+            elif fmt == 'parquet':
+                try:
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                except ImportError:
+                    raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(output_file, table.schema)
+                parquet_writer.write_table(table)
+
+            written += len(chunk)
+            print(f"   Generated {written:,}/{n:,}...")
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    return written
+
+
+def _parse_weights(value: str) -> Dict[str, float]:
+    """Parse 'Family Office=0.5,Venture Capital=0.5' into a dict"""
+    weights = {}
+    for part in value.split(','):
+        key, _, weight = part.partition('=')
+        if not key.strip() or not weight.strip():
+            raise argparse.ArgumentTypeError(f"Expected NAME=WEIGHT, got {part!r}")
+        weights[key.strip()] = float(weight)
+    return weights
+
+
+def _parse_range(value: str) -> Tuple[int, int]:
+    """Parse 'MIN-MAX' into a tuple of ints"""
+    low, _, high = value.partition('-')
+    try:
+        return int(low), int(high or low)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected MIN-MAX, got {value!r}")
+
+
+def synthetic_main(args: argparse.Namespace) -> int:
+    """Generate a large synthetic dataset for load testing"""
+    print("=" * 70)
+    print("🧪 GENERATING SYNTHETIC INVESTOR DATASET")
+    print("=" * 70)
+    print()
+
+    output_file = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        f"vc_synthetic_{args.synthetic}.{'db' if args.format == 'sqlite' else args.format}"
+    )
+
+    written = write_synthetic_investors(
+        args.synthetic,
+        output_file,
+        fmt=args.format,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        type_weights=args.type_weights,
+        state_weights=args.state_weights,
+        sectors_per_investor=args.sectors,
+        aum_median_millions=args.aum_median,
+        aum_sigma=args.aum_sigma,
+        text_words=args.text_words,
+        missing_rate=args.missing_rate,
+    )
+
+    print(f"\n✅ Generated {written:,} synthetic investor records (seed {args.seed})")
+    print(f"💾 Saved to: {output_file}")
+    return written
+
+
 def main():
     """Generate and save sample data"""
+    parser = argparse.ArgumentParser(description="Generate sample or synthetic investor data")
+    parser.add_argument('--synthetic', type=int, metavar='N',
+                        help="Generate N synthetic investors instead of the sample set")
+    parser.add_argument('--output', help="Output file for synthetic data")
+    parser.add_argument('--format', choices=SYNTHETIC_FORMATS, default='csv')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--type-weights', type=_parse_weights,
+                        help="e.g. 'Family Office=0.5,Venture Capital=0.5'")
+    parser.add_argument('--state-weights', type=_parse_weights,
+                        help="e.g. 'CA=0.4,NY=0.3,TX=0.3'")
+    parser.add_argument('--sectors', type=_parse_range, default=(1, 4),
+                        help="Sectors per investor as MIN-MAX")
+    parser.add_argument('--aum-median', type=float, default=500.0,
+                        help="Median AUM in millions")
+    parser.add_argument('--aum-sigma', type=float, default=1.5)
+    parser.add_argument('--text-words', type=_parse_range, default=(4, 12),
+                        help="Words per free-text field as MIN-MAX")
+    parser.add_argument('--missing-rate', type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.synthetic is not None:
+        synthetic_main(args)
+        return None
+
     print("=" * 70)
     print("🎯 GENERATING SAMPLE VC/FAMILY OFFICE DATABASE")
     print("=" * 70)
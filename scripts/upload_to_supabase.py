@@ -5,14 +5,28 @@ Run: python upload_to_supabase.py
 """
 
 import os
-import pandas as pd
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import sys
+import time
+from typing import TYPE_CHECKING
 
-load_dotenv()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib', 'scrapers'))
+from data_quality import score_investors
+from metrics import get_metrics
+from profiling import NullProfiler, add_profile_arguments, profiler_from_args
 
-def get_supabase_client() -> Client:
+# pandas, supabase and dotenv are imported on the code paths that need them
+if TYPE_CHECKING:
+    import pandas as pd
+    from supabase import Client
+
+
+def get_supabase_client() -> 'Client':
     """Create Supabase client"""
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    load_dotenv()
+
     url = os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
     key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
 
@@ -35,17 +49,13 @@ def parse_focus_flags(row: dict) -> dict:
     }
 
 
-def upload_csv_to_supabase(csv_path: str):
-    """Upload CSV data to Supabase investors table"""
-    print(f"Loading data from {csv_path}...")
+def build_records(df: 'pd.DataFrame') -> list:
+    """Convert CSV rows into Supabase investor records"""
+    import pandas as pd
 
-    df = pd.read_csv(csv_path)
-    print(f"Loaded {len(df)} records")
+    if 'data_quality_score' not in df.columns:
+        df = df.assign(data_quality_score=score_investors(df))
 
-    # Get Supabase client
-    supabase = get_supabase_client()
-
-    # Prepare records
     records = []
     for _, row in df.iterrows():
         record = {
@@ -65,6 +75,7 @@ def upload_csv_to_supabase(csv_path: str):
             "notable_investments": row.get("notable_investments", "") if pd.notna(row.get("notable_investments")) else None,
             "decision_makers": row.get("decision_makers", "") if pd.notna(row.get("decision_makers")) else None,
             "sec_url": row.get("sec_url", "") if pd.notna(row.get("sec_url")) else None,
+            "data_quality_score": int(row["data_quality_score"]),
         }
 
         # Add focus flags
@@ -73,39 +84,80 @@ def upload_csv_to_supabase(csv_path: str):
 
         records.append(record)
 
+    return records
+
+
+def upload_csv_to_supabase(csv_path: str, profiler=None):
+    """Upload CSV data to Supabase investors table"""
+    import pandas as pd
+
+    metrics = get_metrics()
+    profiler = profiler or NullProfiler()
+    print(f"Loading data from {csv_path}...")
+
+    with metrics.timer('upload_phase_seconds', phase='read_csv'), profiler.phase('read_csv'):
+        df = pd.read_csv(csv_path)
+    print(f"Loaded {len(df)} records")
+
+    # Get Supabase client
+    supabase = get_supabase_client()
+
+    # Prepare records
+    with metrics.timer('upload_phase_seconds', phase='build_records'), profiler.phase('build_records'):
+        records = build_records(df)
+
     print(f"Uploading {len(records)} records to Supabase...")
 
     # Upload in batches of 100
-    batch_size = 100
-    for i in range(0, len(records), batch_size):
-        batch = records[i:i + batch_size]
-        try:
-            result = supabase.table("investors").upsert(batch, on_conflict="cik").execute()
-            print(f"Uploaded batch {i // batch_size + 1}/{(len(records) + batch_size - 1) // batch_size}")
-        except Exception as e:
-            print(f"Error uploading batch: {e}")
-            # Try inserting one by one to find problematic records
-            for record in batch:
-                try:
-                    supabase.table("investors").insert(record).execute()
-                except Exception as inner_e:
-                    print(f"Failed to insert {record.get('name')}: {inner_e}")
-
+    with profiler.phase('upload'):
+        batch_size = 100
+        for i in range(0, len(records), batch_size):
+            batch = records[i:i + batch_size]
+            start = time.perf_counter()
+            try:
+                result = supabase.table("investors").upsert(batch, on_conflict="cik").execute()
+                metrics.observe('upload_batch_seconds', time.perf_counter() - start, status='ok')
+                metrics.inc('upload_batches_total', status='ok')
+                metrics.inc('upload_records_total', len(batch), status='ok')
+                print(f"Uploaded batch {i // batch_size + 1}/{(len(records) + batch_size - 1) // batch_size}")
+            except Exception as e:
+                metrics.observe('upload_batch_seconds', time.perf_counter() - start, status='error')
+                metrics.inc('upload_batches_total', status='error')
+                print(f"Error uploading batch: {e}")
+                # Try inserting one by one to find problematic records
+                for record in batch:
+                    try:
+                        supabase.table("investors").insert(record).execute()
+                        metrics.inc('upload_records_total', status='retried')
+                    except Exception as inner_e:
+                        metrics.inc('upload_records_total', status='error')
+                        print(f"Failed to insert {record.get('name')}: {inner_e}")
+
+    metrics.flush()
     print("Upload complete!")
 
 
 def main():
-    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Upload investor data from CSV to Supabase")
+    parser.add_argument('csv_file', nargs='?', default="vc_database_sample.csv")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
 
-    csv_path = sys.argv[1] if len(sys.argv) > 1 else "vc_database_sample.csv"
+    csv_path = args.csv_file
 
     if not os.path.exists(csv_path):
         print(f"File not found: {csv_path}")
-        print("Usage: python upload_to_supabase.py <csv_file>")
+        print("Usage: python upload_to_supabase.py <csv_file> [--profile [REPORT]]")
         sys.exit(1)
 
-    upload_csv_to_supabase(csv_path)
+    profiler = profiler_from_args(args, __file__)
+    upload_csv_to_supabase(csv_path, profiler=profiler)
 
+    if profiler.enabled:
+        profiler.stop()
+        print(f"Profile report: {profiler.write_report()}")
 
 if __name__ == "__main__":
     main()
@@ -107,6 +107,7 @@ CREATE INDEX idx_investors_name ON investors(name);
 CREATE INDEX idx_investors_ai_focus ON investors(has_ai_focus) WHERE has_ai_focus = TRUE;
 CREATE INDEX idx_investors_fintech_focus ON investors(has_fintech_focus) WHERE has_fintech_focus = TRUE;
 CREATE INDEX idx_investors_music_focus ON investors(has_music_focus) WHERE has_music_focus = TRUE;
+CREATE INDEX idx_investors_quality ON investors(data_quality_score DESC);
 CREATE INDEX idx_portfolio_investor ON portfolio_companies(investor_id);
 CREATE INDEX idx_contacts_investor ON investor_contacts(investor_id);
 